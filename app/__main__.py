@@ -0,0 +1,65 @@
+import asyncio
+import os
+import shutil
+
+import uvicorn
+
+from app.config.settings import settings
+
+
+def prepare_metrics() -> None:
+    """Share metrics between worker processes through a fresh directory.
+
+    prometheus_client picks its storage when first imported, so this
+    runs before any module that defines metrics is loaded.
+    """
+    if not settings.metrics_enabled or settings.workers <= 1:
+        return
+    shutil.rmtree(settings.metrics_multiproc_dir, ignore_errors=True)
+    os.makedirs(settings.metrics_multiproc_dir)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = settings.metrics_multiproc_dir
+
+
+def prepare_bcrypt() -> None:
+    """Calibrate bcrypt once, so workers agree on the cost.
+
+    Workers hashing with different costs would keep rehashing each
+    other's hashes on login.
+    """
+    if not settings.bcrypt_calibrate:
+        return
+    from app.core.hashing import CALIBRATED_ROUNDS_ENV, calibrate_bcrypt
+
+    calibration = calibrate_bcrypt(
+        settings.bcrypt_target_ms,
+        settings.bcrypt_min_rounds,
+        settings.bcrypt_max_rounds,
+    )
+    os.environ[CALIBRATED_ROUNDS_ENV] = str(calibration.rounds)
+
+
+async def prepare_database() -> None:
+    """Create schema once before workers start, workers find it current."""
+    from app.core.database import database_manager
+
+    await database_manager.ensure_schema()
+    await database_manager.close()
+
+
+def main() -> None:
+    """Run production server with one worker process per core."""
+    prepare_metrics()
+    prepare_bcrypt()
+    asyncio.run(prepare_database())
+
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        log_level="debug" if settings.debug else "info",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,36 @@
 from dataclasses import dataclass
-from os import getenv
+from os import cpu_count, getenv
 from pathlib import Path
+import os
 import secrets
 
+BASE_DIR = Path(__file__).parent.parent.parent
+
+
+def load_secret_key(path: Path) -> str:
+    """Read signing key from file, creating it once if missing.
+
+    The key is written to a temporary file, created owner-only so it is
+    never readable by others, and hard-linked into place, so concurrent
+    workers either create it or read the winner's key.
+    """
+    try:
+        return path.read_text().strip()
+    except FileNotFoundError:
+        pass
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as file:
+        file.write(secrets.token_urlsafe(32))
+    try:
+        os.link(tmp_path, path)
+    except FileExistsError:
+        pass
+    finally:
+        tmp_path.unlink()
+    return path.read_text().strip()
+
 
 @dataclass(frozen=True)
 class Settings:
@@ -11,20 +39,193 @@ class Settings:
     # Database
     database_url: str = getenv(
         "DATABASE_URL",
-        f"sqlite+aiosqlite:///{Path(__file__).parent.parent.parent}/database.db",
+        f"sqlite+aiosqlite:///{BASE_DIR}/database.db",
+    )
+
+    db_read_pool_size: int = int(getenv("DB_READ_POOL_SIZE", "4"))
+    db_pool_timeout: float = float(getenv("DB_POOL_TIMEOUT", "30"))
+    # Open pooled connections and prime statement caches at startup
+    db_warm_up: bool = getenv("DB_WARM_UP", "True").lower() == "true"
+
+    batch_lookup_max_keys: int = int(getenv("BATCH_LOOKUP_MAX_KEYS", "1000"))
+    bulk_import_chunk_size: int = int(getenv("BULK_IMPORT_CHUNK_SIZE", "1000"))
+
+    # Group commit for user writes
+    group_commit_enabled: bool = (
+        getenv("GROUP_COMMIT_ENABLED", "False").lower() == "true"
+    )
+    group_commit_window_ms: float = float(getenv("GROUP_COMMIT_WINDOW_MS", "2"))
+    group_commit_max_batch: int = int(getenv("GROUP_COMMIT_MAX_BATCH", "64"))
+
+    # SQLite tuning, applied to every new connection
+    sqlite_journal_mode: str = getenv("SQLITE_JOURNAL_MODE", "WAL")
+    sqlite_synchronous: str = getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_mmap_size: int = int(getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    sqlite_cache_size: int = int(getenv("SQLITE_CACHE_SIZE", "-65536"))
+    sqlite_temp_store: str = getenv("SQLITE_TEMP_STORE", "MEMORY")
+    sqlite_busy_timeout: int = int(getenv("SQLITE_BUSY_TIMEOUT", "5000"))
+    # Seconds between maintenance runs (wal_checkpoint, optimize, pruning
+    # of change feed tombstones), 0 disables
+    sqlite_maintenance_interval: float = float(
+        getenv("SQLITE_MAINTENANCE_INTERVAL", "3600")
     )
 
     # Server
     host: str = getenv("HOST", "127.0.0.1")
     port: int = int(getenv("PORT", "8000"))
     debug: bool = getenv("DEBUG", "False").lower() == "true"
+    workers: int = int(getenv("WORKERS", str(cpu_count() or 1)))
 
     # Security
-    secret_key: str = getenv("SECRET_KEY", secrets.token_urlsafe(32))
+    secret_key: str = getenv("SECRET_KEY") or load_secret_key(
+        Path(getenv("SECRET_KEY_FILE", f"{BASE_DIR}/.secret_key"))
+    )
 
     # JWT
     jwt_algorithm: str = getenv("JWT_ALGORITHM", "HS256")
     jwt_expire_minutes: int = int(getenv("JWT_EXPIRE_MINUTES", "30"))
+    jwt_refresh_expire_days: int = int(getenv("JWT_REFRESH_EXPIRE_DAYS", "7"))
+    token_cache_size: int = int(getenv("TOKEN_CACHE_SIZE", "10000"))
+    # How soon other workers' revocations take effect
+    token_epoch_refresh_interval: float = float(
+        getenv("TOKEN_EPOCH_REFRESH_INTERVAL", "5")
+    )
+
+    # Authentication
+    principal_cache_size: int = int(getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    # Revocation goes through token epochs, the TTL only bounds how stale
+    # profile fields read by other workers can be
+    principal_cache_ttl: float = float(getenv("PRINCIPAL_CACHE_TTL", "300"))
+
+    # User cache
+    user_cache_enabled: bool = getenv("USER_CACHE_ENABLED", "True").lower() == "true"
+    user_cache_backend: str = getenv("USER_CACHE_BACKEND", "memory")
+    user_cache_size: int = int(getenv("USER_CACHE_SIZE", "10000"))
+    user_cache_ttl: float = float(getenv("USER_CACHE_TTL", "30"))
+    user_cache_redis_url: str = getenv("USER_CACHE_REDIS_URL", "")
+
+    # Username/email existence filter
+    user_filter_enabled: bool = getenv("USER_FILTER_ENABLED", "True").lower() == "true"
+    user_filter_error_rate: float = float(getenv("USER_FILTER_ERROR_RATE", "0.01"))
+    user_filter_rebuild_interval: float = float(
+        getenv("USER_FILTER_REBUILD_INTERVAL", "300")
+    )
+
+    # Search; the in-memory autocomplete index is opt-in (~300 B per user)
+    search_max_limit: int = int(getenv("SEARCH_MAX_LIMIT", "100"))
+    user_autocomplete_enabled: bool = (
+        getenv("USER_AUTOCOMPLETE_ENABLED", "False").lower() == "true"
+    )
+    user_autocomplete_rebuild_interval: float = float(
+        getenv("USER_AUTOCOMPLETE_REBUILD_INTERVAL", "300")
+    )
+
+    # Change feed: changes are served once older than the settle delay, so
+    # writes committed late by other workers are not skipped. A write is
+    # stamped before it waits out the busy timeout and the group-commit
+    # window, the delay covers both plus a second for the write itself
+    change_feed_settle: float = float(
+        getenv(
+            "CHANGE_FEED_SETTLE",
+            str(
+                sqlite_busy_timeout / 1000
+                + (group_commit_window_ms / 1000 if group_commit_enabled else 0)
+                + 1
+            ),
+        )
+    )
+    change_feed_max_limit: int = int(getenv("CHANGE_FEED_MAX_LIMIT", "1000"))
+    # Streams poll the database for other workers' changes and send keep-alives
+    change_feed_poll_interval: float = float(getenv("CHANGE_FEED_POLL_INTERVAL", "2"))
+    change_feed_queue_size: int = int(getenv("CHANGE_FEED_QUEUE_SIZE", "1000"))
+    change_feed_max_subscribers: int = int(
+        getenv("CHANGE_FEED_MAX_SUBSCRIBERS", "1000")
+    )
+    # Seconds deletions are kept for the feed, 0 keeps them forever; older
+    # cursors may have missed pruned deletions and must resync from scratch
+    change_feed_tombstone_retention: float = float(
+        getenv("CHANGE_FEED_TOMBSTONE_RETENTION", str(7 * 24 * 3600))
+    )
+
+    # Metrics
+    metrics_enabled: bool = getenv("METRICS_ENABLED", "True").lower() == "true"
+    metrics_multiproc_dir: str = getenv(
+        "PROMETHEUS_MULTIPROC_DIR", f"{BASE_DIR}/.metrics"
+    )
+
+    # Profiling, triggered by "X-Profile: <token>" or sampling
+    profile_token: str = getenv("PROFILE_TOKEN", "")
+    profile_sample_rate: float = float(getenv("PROFILE_SAMPLE_RATE", "0"))
+    profile_dir: str = getenv("PROFILE_DIR", f"{BASE_DIR}/.profiles")
+    profile_keep: int = int(getenv("PROFILE_KEEP", "50"))
+    slow_query_ms: float = float(getenv("SLOW_QUERY_MS", "100"))
+
+    # Login/registration attempt limits per period, 0 disables a rule
+    rate_limit_enabled: bool = getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    rate_limit_period: float = float(getenv("RATE_LIMIT_PERIOD", "60"))
+    rate_limit_login_per_ip: int = int(getenv("RATE_LIMIT_LOGIN_PER_IP", "30"))
+    rate_limit_login_per_username: int = int(
+        getenv("RATE_LIMIT_LOGIN_PER_USERNAME", "10")
+    )
+    rate_limit_register_per_ip: int = int(getenv("RATE_LIMIT_REGISTER_PER_IP", "10"))
+    rate_limit_backend: str = getenv("RATE_LIMIT_BACKEND", "memory")
+    rate_limit_max_keys: int = int(getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    rate_limit_redis_url: str = getenv("RATE_LIMIT_REDIS_URL", "")
+
+    # Password hashing
+    password_hash_workers: int = int(
+        getenv("PASSWORD_HASH_WORKERS", str(cpu_count() or 1))
+    )
+    password_hash_max_queue: int = int(getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+    password_hash_retry_after: int = int(getenv("PASSWORD_HASH_RETRY_AFTER", "1"))
+    # bcrypt cost; with BCRYPT_CALIBRATE it is measured at startup instead,
+    # aiming for BCRYPT_TARGET_MS per hash within the min/max bounds
+    bcrypt_rounds: int = int(getenv("BCRYPT_ROUNDS", "12"))
+    bcrypt_calibrate: bool = getenv("BCRYPT_CALIBRATE", "False").lower() == "true"
+    bcrypt_target_ms: float = float(getenv("BCRYPT_TARGET_MS", "250"))
+    bcrypt_min_rounds: int = int(getenv("BCRYPT_MIN_ROUNDS", "10"))
+    bcrypt_max_rounds: int = int(getenv("BCRYPT_MAX_ROUNDS", "15"))
+    # Upgrade stored hashes of another cost after a successful login
+    password_rehash_enabled: bool = (
+        getenv("PASSWORD_REHASH_ENABLED", "True").lower() == "true"
+    )
+
+    def __post_init__(self):
+        if self.change_feed_settle < self.change_feed_min_settle:
+            raise ValueError(
+                f"CHANGE_FEED_SETTLE must be at least {self.change_feed_min_settle}"
+                " seconds (SQLITE_BUSY_TIMEOUT plus the group-commit window),"
+                " or changes committed late are skipped by the change feed"
+            )
+        if 0 < self.change_feed_tombstone_retention <= self.change_feed_settle:
+            raise ValueError(
+                "CHANGE_FEED_TOMBSTONE_RETENTION must be longer than"
+                " CHANGE_FEED_SETTLE, or deletions are pruned before the change"
+                " feed serves them"
+            )
+
+    @property
+    def change_feed_min_settle(self) -> float:
+        """Longest a write can take to commit after it was stamped, seconds."""
+        window = self.group_commit_window_ms if self.group_commit_enabled else 0
+        return (self.sqlite_busy_timeout + window) / 1000
+
+    @property
+    def profiling_enabled(self) -> bool:
+        """Whether any request can be profiled."""
+        return bool(self.profile_token) or self.profile_sample_rate > 0
+
+    @property
+    def sqlite_pragmas(self) -> dict[str, str | int]:
+        """SQLite pragmas in the order they are applied."""
+        return {
+            "busy_timeout": self.sqlite_busy_timeout,
+            "journal_mode": self.sqlite_journal_mode,
+            "synchronous": self.sqlite_synchronous,
+            "mmap_size": self.sqlite_mmap_size,
+            "cache_size": self.sqlite_cache_size,
+            "temp_store": self.sqlite_temp_store,
+        }
 
 
 # Singleton instance
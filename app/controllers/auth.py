@@ -1,11 +1,15 @@
+from typing import Optional
+
 from litestar import Controller, post, get, Request
 from litestar.exceptions import HTTPException
 from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED
 
 from app.core.dependencies import get_auth_service
-from app.core.middleware import get_current_user
+from app.core.rate_limit import rate_limiter
 from app.models.schemas.auth import (
+    AvailabilitySchema,
     LoginSchema,
+    RefreshSchema,
     RegisterSchema,
     TokenSchema,
     UserAuthSchema,
@@ -14,37 +18,72 @@ from app.models.schemas.user import UserResponseSchema
 from app.services.auth.protocol import AuthServiceProtocol
 
 
+def client_host(request: Request) -> str:
+    """Get client address of the connection."""
+    return request.client.host if request.client else "unknown"
+
+
 class AuthController(Controller):
     """Auth controller."""
 
     path = "/auth"
 
-    @post("/register", status_code=HTTP_201_CREATED)
+    @post("/register", status_code=HTTP_201_CREATED, exclude_from_auth=True)
     async def register(
-        self, data: RegisterSchema, auth_service: AuthServiceProtocol
+        self, request: Request, data: RegisterSchema, auth_service: AuthServiceProtocol
     ) -> UserResponseSchema:
         """Register new user."""
+        # Before any query or bcrypt work
+        await rate_limiter.hit("register_ip", client_host(request))
         try:
             user = await auth_service.register(data)
             return UserResponseSchema.from_entity(user)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
-    @post("/login", status_code=HTTP_200_OK)
+    @get("/available", status_code=HTTP_200_OK, exclude_from_auth=True)
+    async def check_availability(
+        self,
+        auth_service: AuthServiceProtocol,
+        username: Optional[str] = None,
+        email: Optional[str] = None,
+    ) -> AvailabilitySchema:
+        """Check whether username and email are free for registration."""
+        if username is None and email is None:
+            raise HTTPException(
+                status_code=400, detail="Pass username and/or email to check"
+            )
+        return await auth_service.check_availability(username, email)
+
+    @post("/login", status_code=HTTP_200_OK, exclude_from_auth=True)
     async def login(
-        self, data: LoginSchema, auth_service: AuthServiceProtocol
+        self, request: Request, data: LoginSchema, auth_service: AuthServiceProtocol
     ) -> TokenSchema:
         """Login user."""
+        # Before any query or bcrypt work; the username rule stops
+        # distributed guessing against one account
+        await rate_limiter.hit("login_ip", client_host(request))
+        await rate_limiter.hit("login_username", data.username)
         try:
             token = await auth_service.login(data)
             return token
         except ValueError as e:
             raise HTTPException(status_code=401, detail=str(e))
 
+    @post("/refresh", status_code=HTTP_200_OK, exclude_from_auth=True)
+    async def refresh(
+        self, data: RefreshSchema, auth_service: AuthServiceProtocol
+    ) -> TokenSchema:
+        """Exchange refresh token for new access and refresh tokens."""
+        try:
+            return await auth_service.refresh(data.refresh_token)
+        except ValueError as e:
+            raise HTTPException(status_code=401, detail=str(e))
+
     @get("/me", status_code=HTTP_200_OK)
     async def get_current_user_info(self, request: Request) -> UserAuthSchema:
         """Get current user info."""
-        user = await get_current_user(request)
+        user = request.user
         if not user:
             raise HTTPException(status_code=401, detail="Not authenticated")
         return user
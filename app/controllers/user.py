@@ -1,104 +1,519 @@
-from typing import List
+import asyncio
+from dataclasses import replace
+from datetime import datetime
+from typing import (
+    Annotated,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+)
 
-from litestar import Controller, delete, get, post, put, Request
+import msgspec
+from litestar import Controller, Request, Response, delete, get, post, put
+from litestar.response import ServerSentEvent, Stream
+from litestar.response.sse import ServerSentEventMessage
 from litestar.exceptions import HTTPException
-from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_404_NOT_FOUND
+from litestar.params import Parameter
+from litestar.status_codes import (
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_304_NOT_MODIFIED,
+    HTTP_404_NOT_FOUND,
+    HTTP_410_GONE,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
 
 from app.core.dependencies import get_user_service
-from app.core.middleware import get_current_user
+from app.config.settings import settings
+from app.core.changes import (
+    ChangeHubFullError,
+    ResyncRequiredError,
+    change_hub,
+    check_position,
+)
+from app.core.conditional import (
+    entity_etag,
+    is_conditional,
+    is_not_modified,
+    list_etag,
+    validator_headers,
+)
+from app.core.database import database_manager
+from app.core.export import MEDIA_TYPES, encode_rows
+from app.core.middleware import require_auth
+from app.core.pagination import (
+    cursor_headers,
+    decode_change_cursor,
+    decode_cursor,
+    decode_rank_cursor,
+    encode_change_cursor,
+    encode_rank_cursor,
+    next_page_headers,
+)
+from app.models.entities.base import utcnow
+from app.models.entities.user import User
 from app.models.schemas.user import (
+    BulkImportResponseSchema,
+    BulkUserResultSchema,
+    UserBatchItemSchema,
+    UserChangeSchema,
     UserCreateSchema,
     UserUpdateSchema,
     UserResponseSchema,
+    UserSuggestionSchema,
 )
+from app.repositories.user.implementation import PUBLIC_COLUMNS, UserRepository
+from app.services.user.implementation import UserService
 from app.services.user.protocol import UserServiceProtocol
 
 
+async def stream_users(batch_size: int) -> AsyncIterator[Sequence]:
+    """Stream users in a session owned by the response.
+
+    Request-scoped dependencies are cleaned up before the body is sent,
+    so the export cannot use the injected session.
+    """
+    async with database_manager.async_session_maker() as session:
+        async for rows in UserRepository(session).stream_all(batch_size):
+            yield rows
+
+
+def change_event(
+    change: UserChangeSchema, event_id: Optional[str] = None
+) -> ServerSentEventMessage:
+    """Encode change as a ``change`` event."""
+    return ServerSentEventMessage(
+        data=msgspec.json.encode(change).decode(), event="change", id=event_id
+    )
+
+
+async def stream_changes(
+    after: tuple[datetime, int], page_size: int
+) -> AsyncIterator[ServerSentEventMessage]:
+    """Stream changes after a position until the client disconnects.
+
+    Changes read from the database carry their position as event ID, so
+    a reconnecting EventSource resumes from ``Last-Event-ID``. Changes
+    of this worker are pushed by the hub as soon as they commit, without
+    an ID, and are not repeated when the database read reaches them;
+    other workers' changes arrive with the next poll.
+    """
+    try:
+        queue = change_hub.subscribe()
+    except ChangeHubFullError:
+        return
+    pushed: set[tuple[datetime, int]] = set()
+    try:
+        while True:
+            # Settled changes, in pages, in a session of the response
+            while True:
+                async with database_manager.async_session_maker() as session:
+                    changes, after = await UserService(
+                        UserRepository(session)
+                    ).get_changes(after, limit=page_size)
+                for change in changes:
+                    position = (change.changed_at, change.id)
+                    if position not in pushed:
+                        yield change_event(change, encode_change_cursor(*position))
+                if len(changes) < page_size:
+                    break
+            pushed = {position for position in pushed if position > after}
+
+            try:
+                change = await asyncio.wait_for(
+                    queue.get(), settings.change_feed_poll_interval
+                )
+            except TimeoutError:
+                yield ServerSentEventMessage(comment="keep-alive", data=None)
+                continue
+            batch = [change]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for change in batch:
+                position = (change.changed_at, change.id)
+                if position > after:
+                    pushed.add(position)
+                    yield change_event(change)
+    finally:
+        change_hub.unsubscribe(queue)
+
+
+def decode_import_items(
+    body: bytes, ndjson: bool
+) -> tuple[list[UserCreateSchema], list[int], list[BulkUserResultSchema]]:
+    """Decode JSON array or NDJSON upload.
+
+    Returns valid items, their positions in the upload and results for
+    rows that could not be decoded.
+    """
+    if ndjson:
+        raw_items: list = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                raw_items.append(msgspec.json.decode(line))
+            except msgspec.DecodeError as e:
+                raw_items.append(e)
+    else:
+        raw_items = msgspec.json.decode(body)
+        if not isinstance(raw_items, list):
+            raise ValueError("Expected a JSON array")
+
+    items, positions, invalid = [], [], []
+    for index, raw in enumerate(raw_items):
+        try:
+            if isinstance(raw, Exception):
+                raise raw
+            items.append(msgspec.convert(raw, UserCreateSchema))
+            positions.append(index)
+        except (msgspec.DecodeError, msgspec.ValidationError) as e:
+            invalid.append(BulkUserResultSchema(index, "invalid", detail=str(e)))
+    return items, positions, invalid
+
+
+async def get_user_response(
+    request: Request,
+    user_service: UserServiceProtocol,
+    field: str,
+    value: object,
+    load: Callable[[], Awaitable[Optional[User]]],
+) -> Response[UserResponseSchema]:
+    """Serve single user with validators.
+
+    Conditional requests are answered after a lookup of ``updated_at``
+    only; the entity is loaded when the client's copy is stale.
+    """
+    if is_conditional(request):
+        version = await user_service.get_user_version(field, value)
+        if version is None:
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="User not found")
+        headers = validator_headers(entity_etag(*version), version[1])
+        if is_not_modified(request, headers["ETag"], version[1]):
+            return Response(None, status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+    user = await load()
+    if not user:
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="User not found")
+    headers = validator_headers(entity_etag(user.id, user.updated_at), user.updated_at)
+    return Response(UserResponseSchema.from_entity(user), headers=headers)
+
+
+def split_keys(values: Optional[List[str]]) -> List[str]:
+    """Flatten repeated and comma-separated query values."""
+    return [key for value in values or [] for key in value.split(",") if key]
+
+
 class UserController(Controller):
     """User controller."""
 
     path = "/users"
+    guards = [require_auth]
 
     @post("/", status_code=HTTP_201_CREATED)
     async def create_user(
         self,
         data: UserCreateSchema,
         user_service: UserServiceProtocol,
-        request: Request,
     ) -> UserResponseSchema:
         """Create new user."""
-        # Check if user is authenticated (optional, remove if public registration is needed)
-        current_user = await get_current_user(request)
-        if not current_user:
-            raise HTTPException(status_code=401, detail="Authentication required")
-
         try:
             user = await user_service.create_user(data)
             return UserResponseSchema.from_entity(user)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
+    @post("/bulk", status_code=HTTP_200_OK)
+    async def bulk_create_users(
+        self, request: Request, user_service: UserServiceProtocol
+    ) -> BulkImportResponseSchema:
+        """Create users from a JSON array or NDJSON upload."""
+        ndjson = request.content_type[0] == "application/x-ndjson"
+        try:
+            items, positions, results = decode_import_items(
+                await request.body(), ndjson
+            )
+        except (ValueError, msgspec.DecodeError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        created = await user_service.bulk_create_users(
+            items, chunk_size=settings.bulk_import_chunk_size
+        )
+        results.extend(
+            replace(result, index=positions[result.index]) for result in created
+        )
+        results.sort(key=lambda result: result.index)
+
+        created_count = sum(result.status == "created" for result in results)
+        return BulkImportResponseSchema(
+            created=created_count,
+            failed=len(results) - created_count,
+            results=results,
+        )
+
+    @get("/batch", status_code=HTTP_200_OK)
+    async def get_users_batch(
+        self,
+        user_service: UserServiceProtocol,
+        ids: Optional[List[str]] = None,
+        uuids: Optional[List[str]] = None,
+        usernames: Optional[List[str]] = None,
+    ) -> List[UserBatchItemSchema]:
+        """Get users by IDs, UUIDs or usernames in one query.
+
+        Keys may be repeated or comma-separated; results follow the input
+        order and missing users are marked ``found: false``.
+        """
+        lookups = {
+            name: split_keys(values)
+            for name, values in (
+                ("ids", ids),
+                ("uuids", uuids),
+                ("usernames", usernames),
+            )
+            if values
+        }
+        if len(lookups) != 1:
+            raise HTTPException(
+                status_code=400, detail="Provide exactly one of ids, uuids, usernames"
+            )
+        name, keys = next(iter(lookups.items()))
+        if len(keys) > settings.batch_lookup_max_keys:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.batch_lookup_max_keys} keys per request",
+            )
+
+        if name == "ids":
+            try:
+                user_ids = [int(key) for key in keys]
+            except ValueError:
+                raise HTTPException(status_code=400, detail="ids must be integers")
+            users = await user_service.get_users_by_ids(user_ids)
+        elif name == "uuids":
+            users = await user_service.get_users_by_uuids(keys)
+        else:
+            users = await user_service.get_users_by_usernames(keys)
+
+        return [
+            UserBatchItemSchema(
+                key=key,
+                found=user is not None,
+                user=UserResponseSchema.from_entity(user) if user else None,
+            )
+            for key, user in zip(keys, users)
+        ]
+
     @get("/{user_id:int}", status_code=HTTP_200_OK)
     async def get_user_by_id(
-        self, user_id: int, user_service: UserServiceProtocol, request: Request
-    ) -> UserResponseSchema:
+        self, request: Request, user_id: int, user_service: UserServiceProtocol
+    ) -> Response[UserResponseSchema]:
         """Get user by ID."""
-        # Check authentication
-        current_user = await get_current_user(request)
-        if not current_user:
-            raise HTTPException(status_code=401, detail="Authentication required")
-
-        user = await user_service.get_user_by_id(user_id)
-        if not user:
-            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="User not found")
-        return UserResponseSchema.from_entity(user)
+        return await get_user_response(
+            request,
+            user_service,
+            "id",
+            user_id,
+            lambda: user_service.get_user_by_id(user_id),
+        )
 
     @get("/uuid/{user_uuid:str}", status_code=HTTP_200_OK)
     async def get_user_by_uuid(
-        self, user_uuid: str, user_service: UserServiceProtocol, request: Request
-    ) -> UserResponseSchema:
+        self, request: Request, user_uuid: str, user_service: UserServiceProtocol
+    ) -> Response[UserResponseSchema]:
         """Get user by UUID."""
-        # Check authentication
-        current_user = await get_current_user(request)
-        if not current_user:
-            raise HTTPException(status_code=401, detail="Authentication required")
-
-        user = await user_service.get_user_by_uuid(user_uuid)
-        if not user:
-            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="User not found")
-        return UserResponseSchema.from_entity(user)
+        return await get_user_response(
+            request,
+            user_service,
+            "uuid",
+            user_uuid,
+            lambda: user_service.get_user_by_uuid(user_uuid),
+        )
 
     @get("/username/{username:str}", status_code=HTTP_200_OK)
     async def get_user_by_username(
-        self, username: str, user_service: UserServiceProtocol, request: Request
-    ) -> UserResponseSchema:
+        self, request: Request, username: str, user_service: UserServiceProtocol
+    ) -> Response[UserResponseSchema]:
         """Get user by username."""
-        # Check authentication
-        current_user = await get_current_user(request)
-        if not current_user:
-            raise HTTPException(status_code=401, detail="Authentication required")
-
-        user = await user_service.get_user_by_username(username)
-        if not user:
-            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="User not found")
-        return UserResponseSchema.from_entity(user)
+        return await get_user_response(
+            request,
+            user_service,
+            "username",
+            username,
+            lambda: user_service.get_user_by_username(username),
+        )
 
     @get("/", status_code=HTTP_200_OK)
     async def get_all_users(
         self,
+        request: Request,
         user_service: UserServiceProtocol,
+        skip: Optional[int] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        active: bool = False,
+    ) -> Response[List[UserResponseSchema]]:
+        """Get all users.
+
+        Pages by ``cursor`` (keyset on ID); the next page cursor is returned
+        in ``X-Next-Cursor`` and ``Link``. ``skip`` (offset) is kept for
+        backward compatibility only.
+        """
+        after_id = None
+        if cursor is not None:
+            try:
+                after_id = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        # Column-only rows mapped straight into response schemas
+        users = await user_service.get_users_page(
+            skip=skip or 0, limit=limit, after_id=after_id, active_only=active
+        )
+
+        last_id = users[-1].id if users and len(users) == limit else None
+        headers = next_page_headers(request.url, last_id)
+        etag = list_etag((user.id, user.updated_at) for user in users)
+        if etag is not None:
+            last_modified = max(user.updated_at for user in users)
+            headers.update(validator_headers(etag, last_modified))
+            if is_not_modified(request, etag, last_modified):
+                return Response(
+                    None, status_code=HTTP_304_NOT_MODIFIED, headers=headers
+                )
+
+        return Response(users, headers=headers)
+
+    @get("/search", status_code=HTTP_200_OK)
+    async def search_users(
+        self,
         request: Request,
-        skip: int = 0,
+        user_service: UserServiceProtocol,
+        q: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        active: bool = False,
+    ) -> Response[List[UserResponseSchema]]:
+        """Search users by username/email prefix and full_name words.
+
+        Results are ranked best first and paged by ``cursor``, returned in
+        ``X-Next-Cursor`` and ``Link`` like the user list.
+        """
+        after = None
+        if cursor is not None:
+            try:
+                after = decode_rank_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        users, position = await user_service.search_users(
+            q,
+            limit=max(1, min(limit, settings.search_max_limit)),
+            after=after,
+            active_only=active,
+        )
+        headers = {}
+        if position is not None:
+            headers = cursor_headers(request.url, encode_rank_cursor(*position))
+        return Response(users, headers=headers)
+
+    @get("/autocomplete", status_code=HTTP_200_OK)
+    async def autocomplete_users(
+        self, user_service: UserServiceProtocol, q: str, limit: int = 10
+    ) -> List[UserSuggestionSchema]:
+        """Suggest users whose username or email starts with ``q``."""
+        return await user_service.suggest_users(
+            q, limit=max(1, min(limit, settings.search_max_limit))
+        )
+
+    @get("/changes", status_code=HTTP_200_OK)
+    async def get_changes(
+        self,
+        request: Request,
+        user_service: UserServiceProtocol,
+        since: Optional[str] = None,
         limit: int = 100,
-    ) -> List[UserResponseSchema]:
-        """Get all users."""
-        # Check authentication
-        current_user = await get_current_user(request)
-        if not current_user:
-            raise HTTPException(status_code=401, detail="Authentication required")
+    ) -> Response[List[UserChangeSchema]]:
+        """Get users created, updated or deleted after the ``since`` cursor.
 
-        users = await user_service.get_all_users(skip=skip, limit=limit)
-        return [UserResponseSchema.from_entity(user) for user in users]
+        Without ``since`` the feed starts from the beginning, a full sync.
+        The cursor to poll with next is returned in ``X-Next-Cursor``; a
+        full page means more changes are waiting. A cursor older than the
+        tombstone retention is answered with 410: deletions it has not
+        seen may be gone, the client has to sync from the beginning.
+        """
+        after = None
+        if since is not None:
+            try:
+                after = decode_change_cursor(since)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        try:
+            changes, position = await user_service.get_changes(
+                after, limit=max(1, min(limit, settings.change_feed_max_limit))
+            )
+        except ResyncRequiredError as e:
+            raise HTTPException(status_code=HTTP_410_GONE, detail=str(e))
+        headers = {}
+        if position is not None:
+            headers = cursor_headers(
+                request.url, encode_change_cursor(*position), param="since"
+            )
+        return Response(changes, headers=headers)
+
+    @get("/changes/stream", status_code=HTTP_200_OK)
+    async def stream_user_changes(
+        self, request: Request, since: Optional[str] = None
+    ) -> ServerSentEvent:
+        """Push user changes as Server-Sent Events.
+
+        Starts after ``since`` or ``Last-Event-ID``, else from now; like
+        polling, a position older than the tombstone retention gets 410.
+        """
+        since = request.headers.get("last-event-id") or since
+        after = (utcnow(), 0)
+        if since is not None:
+            try:
+                after = decode_change_cursor(since)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            try:
+                check_position(after)
+            except ResyncRequiredError as e:
+                raise HTTPException(status_code=HTTP_410_GONE, detail=str(e))
+        if change_hub.is_full:
+            raise HTTPException(
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many change streams",
+            )
+        return ServerSentEvent(
+            stream_changes(after, page_size=settings.change_feed_max_limit)
+        )
+
+    @get("/export", status_code=HTTP_200_OK)
+    async def export_users(
+        self,
+        format: Literal["ndjson", "csv"] = "ndjson",
+        gzip: bool = False,
+        # Rows held in memory per fetch
+        batch_size: Annotated[int, Parameter(ge=1, le=10_000)] = 1000,
+    ) -> Stream:
+        """Export all users as NDJSON or CSV with constant memory."""
+        columns = [column.key for column in PUBLIC_COLUMNS]
+        headers = {"Content-Disposition": f'attachment; filename="users.{format}"'}
+        if gzip:
+            headers["Content-Encoding"] = "gzip"
+
+        return Stream(
+            encode_rows(stream_users(batch_size), columns, format, gzip=gzip),
+            media_type=MEDIA_TYPES[format],
+            headers=headers,
+        )
 
     @put("/{user_id:int}", status_code=HTTP_200_OK)
     async def update_user(
@@ -109,13 +524,8 @@ class UserController(Controller):
         request: Request,
     ) -> UserResponseSchema:
         """Update user."""
-        # Check authentication
-        current_user = await get_current_user(request)
-        if not current_user:
-            raise HTTPException(status_code=401, detail="Authentication required")
-
         # Check if user can update (only own profile or admin)
-        if current_user.id != user_id:
+        if request.user.id != user_id:
             raise HTTPException(
                 status_code=403, detail="Not authorized to update this user"
             )
@@ -135,13 +545,8 @@ class UserController(Controller):
         self, user_id: int, user_service: UserServiceProtocol, request: Request
     ) -> dict:
         """Delete user."""
-        # Check authentication
-        current_user = await get_current_user(request)
-        if not current_user:
-            raise HTTPException(status_code=401, detail="Authentication required")
-
         # Check if user can delete (only own profile or admin)
-        if current_user.id != user_id:
+        if request.user.id != user_id:
             raise HTTPException(
                 status_code=403, detail="Not authorized to delete this user"
             )
@@ -1,62 +1,175 @@
-from datetime import datetime, timedelta
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.config.settings import settings
+from app.core.cache import TTLCache
+from app.core.hashing import password_hasher
+from app.core.metrics import BCRYPT_ROUNDS, JWT_CACHE_LOOKUPS, JWT_VERIFY_SECONDS
+from app.core.token_epochs import token_epochs
 from app.models.schemas.auth import TokenDataSchema
 
+# Stored for accounts created without a password; never verifies
+UNUSABLE_PASSWORD_HASH = "!"
+
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+
+JWT_CACHE_HITS = JWT_CACHE_LOOKUPS.labels("hit")
+JWT_CACHE_MISSES = JWT_CACHE_LOOKUPS.labels("miss")
+
 
 class AuthManager:
     """Authentication manager."""
 
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        self.algorithm = "HS256"
-        self.access_token_expire_minutes = 30
+        self.set_bcrypt_rounds(settings.bcrypt_rounds)
+        self.algorithm = settings.jwt_algorithm
+        self.access_token_expire_minutes = settings.jwt_expire_minutes
+        self.refresh_token_expire_days = settings.jwt_refresh_expire_days
+
+        # Verified claims keyed by token digest; the signing key is fixed
+        # for the life of the process
+        self.token_cache: TTLCache[bytes, TokenDataSchema] = TTLCache(
+            maxsize=settings.token_cache_size
+        )
+
+    def set_bcrypt_rounds(self, rounds: int) -> None:
+        """Hash with ``rounds``; hashes of any other cost need an update."""
+        self.bcrypt_rounds = rounds
+        self.pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+        )
+        BCRYPT_ROUNDS.set(rounds)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check whether a stored hash was made with another cost or scheme."""
+        if hashed_password == UNUSABLE_PASSWORD_HASH:
+            return False
+        return self.pwd_context.needs_update(hashed_password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify password."""
+        if hashed_password == UNUSABLE_PASSWORD_HASH:
+            return False
         return self.pwd_context.verify(plain_password, hashed_password)
 
     def get_password_hash(self, password: str) -> str:
         """Get password hash."""
         return self.pwd_context.hash(password)
 
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        """Verify password in the hashing worker pool."""
+        return await password_hasher.run(
+            self.verify_password, plain_password, hashed_password
+        )
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """Get password hash in the hashing worker pool."""
+        return await password_hasher.run(self.get_password_hash, password)
+
+    def _create_token(self, data: dict, token_type: str, expires: timedelta) -> str:
+        to_encode = data.copy()
+        to_encode.update(
+            {"exp": datetime.now(timezone.utc) + expires, "typ": token_type}
+        )
+        if "user_id" in to_encode:
+            # Revoked together once the user's epoch moves on
+            to_encode.setdefault("ep", token_epochs.current(to_encode["user_id"]))
+        return jwt.encode(to_encode, settings.secret_key, algorithm=self.algorithm)
+
     def create_access_token(
         self, data: dict, expires_delta: Optional[timedelta] = None
     ) -> str:
-        """Create access token."""
-        to_encode = data.copy()
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(
-                minutes=self.access_token_expire_minutes
-            )
+        """Create access token bound to the user's current token epoch."""
+        return self._create_token(
+            data,
+            ACCESS_TOKEN,
+            expires_delta or timedelta(minutes=self.access_token_expire_minutes),
+        )
 
-        to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(
-            to_encode, settings.secret_key, algorithm=self.algorithm
+    def create_refresh_token(
+        self, data: dict, expires_delta: Optional[timedelta] = None
+    ) -> str:
+        """Create long-lived refresh token bound to the user's token epoch."""
+        return self._create_token(
+            data,
+            REFRESH_TOKEN,
+            expires_delta or timedelta(days=self.refresh_token_expire_days),
         )
-        return encoded_jwt
 
     def verify_token(self, token: str) -> Optional[TokenDataSchema]:
-        """Verify token."""
+        """Verify access token, revoked tokens are rejected without a query."""
+        started = time.perf_counter()
+        token_data, result = self._verify_token(token)
+        if token_data is not None and token_epochs.is_revoked(
+            token_data.user_id, token_data.epoch
+        ):
+            token_data, result = None, "revoked"
+        JWT_VERIFY_SECONDS.labels(result).observe(time.perf_counter() - started)
+        return token_data
+
+    def verify_refresh_token(self, token: str) -> Optional[TokenDataSchema]:
+        """Verify refresh token, not cached as it is used once per refresh."""
+        token_data, _ = self._decode_token(token, REFRESH_TOKEN)
+        if token_data is None or token_epochs.is_revoked(
+            token_data.user_id, token_data.epoch
+        ):
+            return None
+        return token_data
+
+    def _decode_token(
+        self, token: str, token_type: str
+    ) -> tuple[Optional[TokenDataSchema], float]:
+        """Decode token of ``token_type``, also return its expiry timestamp."""
         try:
             payload = jwt.decode(
                 token, settings.secret_key, algorithms=[self.algorithm]
             )
-            username: str = payload.get("sub")
-            user_id: int = payload.get("user_id")
+        except JWTError:
+            return None, 0.0
 
-            if username is None or user_id is None:
-                return None
+        username: str = payload.get("sub")
+        user_id: int = payload.get("user_id")
+        # Tokens issued before typed tokens are access tokens
+        if (
+            username is None
+            or user_id is None
+            or payload.get("typ", ACCESS_TOKEN) != token_type
+        ):
+            return None, 0.0
+        token_data = TokenDataSchema(
+            username=username, user_id=user_id, epoch=payload.get("ep", 0)
+        )
+        return token_data, payload.get("exp", 0)
 
-            return TokenDataSchema(username=username, user_id=user_id)
-        except JWTError:
-            return None
+    def _verify_token(self, token: str) -> tuple[Optional[TokenDataSchema], str]:
+        """Verify access token signature and claims, also return how."""
+        digest = hashlib.sha256(token.encode()).digest()
+        token_data = self.token_cache.get(digest)
+        if token_data is not None:
+            JWT_CACHE_HITS.inc()
+            return token_data, "cached"
+        JWT_CACHE_MISSES.inc()
+
+        token_data, expires_at = self._decode_token(token, ACCESS_TOKEN)
+        if token_data is None:
+            return None, "invalid"
+
+        expires_in = expires_at - time.time()
+        if expires_in > 0:
+            self.token_cache.set(digest, token_data, ttl=expires_in)
+        return token_data, "verified"
 
 
 # Singleton instance
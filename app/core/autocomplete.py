@@ -0,0 +1,223 @@
+import asyncio
+import bisect
+import logging
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config.settings import settings
+from app.models.entities.user import User
+
+logger = logging.getLogger(__name__)
+
+# Folded key, user ID, username, email
+Entry = tuple[str, int, str, str]
+
+# Username and email of a changed user, None once deleted
+Current = Optional[tuple[str, str]]
+
+
+class PrefixIndex:
+    """Sorted array of entries, prefix lookups by bisection."""
+
+    def __init__(self, entries: list[Entry]):
+        entries.sort()
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entry: Entry) -> None:
+        """Insert entry in order."""
+        bisect.insort(self._entries, entry)
+
+    def remove(self, entry: Entry) -> None:
+        """Delete every copy of entry."""
+        entries = self._entries
+        index = bisect.bisect_left(entries, entry)
+        while index < len(entries) and entries[index] == entry:
+            del entries[index]
+
+    def lookup(
+        self, prefix: str, limit: int, changed: Mapping[int, Current] = {}
+    ) -> list[Entry]:
+        """Get up to ``limit`` entries of distinct users whose key starts with ``prefix``.
+
+        Entries of users in ``changed`` are skipped unless they hold the
+        user's current username and email.
+        """
+        entries = self._entries
+        found: list[Entry] = []
+        seen: set[int] = set()
+        for index in range(bisect.bisect_left(entries, (prefix,)), len(entries)):
+            entry = entries[index]
+            if not entry[0].startswith(prefix) or len(found) == limit:
+                break
+            user_id = entry[1]
+            if user_id in seen or not is_current(entry, changed):
+                continue
+            seen.add(user_id)
+            found.append(entry)
+        return found
+
+
+def is_current(entry: Entry, changed: Mapping[int, Current]) -> bool:
+    """Whether entry holds its user's latest values as far as ``changed`` knows."""
+    user_id = entry[1]
+    return user_id not in changed or changed[user_id] == entry[2:]
+
+
+def index_entries(user_id: int, username: str, email: str) -> tuple[Entry, Entry]:
+    """Entries of one user, keyed by username and by email."""
+    return (
+        (username.casefold(), user_id, username, email),
+        (email.casefold(), user_id, username, email),
+    )
+
+
+@dataclass(frozen=True)
+class UserAutocompleteStats:
+    """Autocomplete index statistics."""
+
+    ready: bool
+    entries: int
+    lookups: int
+    rebuilds: int
+
+
+class UserAutocomplete:
+    """In-memory username/email prefix index of one worker process.
+
+    Suggestions are answered without a query. The index only sees writes
+    made by this process: users it renamed or deleted are hidden right
+    away, changes made by other workers show after the periodic rebuild
+    from a streaming scan. Costs roughly 300 bytes per user; until the
+    first build completes, callers fall back to the full-text index.
+    """
+
+    def __init__(self, rebuild_interval: float = 0, batch_size: int = 5000):
+        self.rebuild_interval = rebuild_interval
+        self.batch_size = batch_size
+        self.lookups = 0
+        self.rebuilds = 0
+        self._index: Optional[PrefixIndex] = None
+        self._pending: Optional[list[Entry]] = None
+        # Users renamed or deleted since the index was built, whose older
+        # entries may still be in it
+        self._changed: dict[int, Current] = {}
+        self._pending_changed: Optional[dict[int, Current]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the initial scan has completed."""
+        return self._index is not None
+
+    def add(self, user_id: int, username: str, email: str) -> None:
+        """Record new user's username and email."""
+        if user_id in self._changed:
+            # ID of a deleted user reused by SQLite
+            self._set_current(user_id, (username, email))
+        self._insert(user_id, username, email)
+
+    def update(self, user_id: int, username: str, email: str) -> None:
+        """Record user's new username and email, hiding the old ones."""
+        self._set_current(user_id, (username, email))
+        self._insert(user_id, username, email)
+
+    def _insert(self, user_id: int, username: str, email: str) -> None:
+        for entry in index_entries(user_id, username, email):
+            if self._index is not None:
+                self._index.add(entry)
+            if self._pending is not None:
+                self._pending.append(entry)
+
+    def remove(self, user_id: int) -> None:
+        """Hide deleted user."""
+        self._set_current(user_id, None)
+
+    def _set_current(self, user_id: int, current: Current) -> None:
+        previous = self._changed.get(user_id)
+        self._changed[user_id] = current
+        if self._pending_changed is not None:
+            self._pending_changed[user_id] = current
+        if previous is not None and previous != current and self._index is not None:
+            # Entries of the last known values can go; older ones, from
+            # before the build, are only skipped on lookup
+            for entry in index_entries(user_id, *previous):
+                self._index.remove(entry)
+
+    def suggest(self, text: str, limit: int) -> Optional[list[Entry]]:
+        """Get users whose username or email starts with ``text``.
+
+        Returns None while the index is not built.
+        """
+        if self._index is None:
+            return None
+        self.lookups += 1
+        return self._index.lookup(text.strip().casefold(), limit, self._changed)
+
+    async def rebuild(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        """Build a new index from a streaming scan and swap it in."""
+        self._pending = []
+        self._pending_changed = {}
+        try:
+            entries: list[Entry] = []
+            async with session_maker() as session:
+                query = select(User.id, User.username, User.email).execution_options(
+                    yield_per=self.batch_size
+                )
+                result = await session.stream(query, bind_arguments={"read_only": True})
+                async for rows in result.partitions():
+                    for user_id, username, email in rows:
+                        entries.extend(index_entries(user_id, username, email))
+
+            # Writes made by this process during the scan, which may have
+            # read rows from before them
+            entries.extend(self._pending)
+            changed = self._pending_changed
+            if changed:
+                entries = [entry for entry in entries if is_current(entry, changed)]
+            self._index = PrefixIndex(entries)
+            self._changed = {}
+            self.rebuilds += 1
+        finally:
+            self._pending = None
+            self._pending_changed = None
+
+    async def _rebuild_loop(self, session_maker: async_sessionmaker[AsyncSession]):
+        while True:
+            try:
+                await self.rebuild(session_maker)
+            except Exception:
+                logger.exception("User autocomplete rebuild failed")
+            if self.rebuild_interval <= 0:
+                return
+            await asyncio.sleep(self.rebuild_interval)
+
+    def start(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        """Build index in the background and rebuild it periodically."""
+        self._task = asyncio.create_task(self._rebuild_loop(session_maker))
+
+    def stop(self) -> None:
+        """Stop background rebuilds."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> UserAutocompleteStats:
+        """Get index statistics."""
+        return UserAutocompleteStats(
+            ready=self._index is not None,
+            entries=len(self._index) if self._index is not None else 0,
+            lookups=self.lookups,
+            rebuilds=self.rebuilds,
+        )
+
+
+# Singleton instance
+user_autocomplete = UserAutocomplete(
+    rebuild_interval=settings.user_autocomplete_rebuild_interval
+)
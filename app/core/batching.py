@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.core.database import DatabaseManager, database_manager
+
+T = TypeVar("T")
+
+WriteOperation = Callable[[AsyncSession], Awaitable[T]]
+
+
+class WriteBatcher:
+    """Group commit for concurrent writes.
+
+    Operations submitted within ``window`` seconds (or until
+    ``max_batch`` are queued) run in one transaction, each inside its
+    own savepoint, so a failing item only fails its own caller.
+    """
+
+    def __init__(self, manager: DatabaseManager, window: float, max_batch: int):
+        self.manager = manager
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self._queue: list[tuple[WriteOperation, asyncio.Future]] = []
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, operation: WriteOperation[T]) -> T:
+        """Queue write operation and wait for its batch to commit."""
+        future = asyncio.get_running_loop().create_future()
+        if self._task is None or self._task.done():
+            self._full = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+        self._queue.append((operation, future))
+        if len(self._queue) >= self.max_batch:
+            self._full.set()
+        return await future
+
+    async def _run(self) -> None:
+        while self._queue:
+            if len(self._queue) < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.window)
+                except TimeoutError:
+                    pass
+            self._full.clear()
+
+            batch = self._queue[: self.max_batch]
+            del self._queue[: self.max_batch]
+            await self._commit(batch)
+
+    async def _commit(self, batch: list[tuple[WriteOperation, asyncio.Future]]) -> None:
+        outcomes: list[tuple[asyncio.Future, Any, Optional[BaseException]]] = []
+        try:
+            async with self.manager.async_session_maker() as session:
+                for operation, future in batch:
+                    try:
+                        async with session.begin_nested():
+                            outcomes.append((future, await operation(session), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+                await session.commit()
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+# Singleton instance
+write_batcher = WriteBatcher(
+    database_manager,
+    window=settings.group_commit_window_ms / 1000,
+    max_batch=settings.group_commit_max_batch,
+)
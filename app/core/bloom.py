@@ -0,0 +1,191 @@
+import asyncio
+import hashlib
+import logging
+import math
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config.settings import settings
+from app.models.entities.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Bloom filter over strings, added items are never reported missing."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(
+            64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing over one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        """Add item."""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+@dataclass(frozen=True)
+class UserFilterStats:
+    """User filter statistics."""
+
+    ready: bool
+    items: int
+    capacity: int
+    size_bytes: int
+    hashes: int
+    checks: int
+    negatives: int
+    rebuilds: int
+
+
+class UserFilter:
+    """Existence filter over usernames and emails of one worker process.
+
+    A miss means the value is definitely not taken and needs no query.
+    The filter only sees writes made by this process and cannot forget
+    deleted or renamed values, so it is rebuilt from a streaming scan
+    periodically; until then other workers' new users may be reported
+    free. Answers are advisory, the unique indexes stay authoritative.
+    """
+
+    def __init__(
+        self,
+        error_rate: float = 0.01,
+        rebuild_interval: float = 0,
+        batch_size: int = 5000,
+    ):
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self.batch_size = batch_size
+        self.checks = 0
+        self.negatives = 0
+        self.rebuilds = 0
+        self._filter: Optional[BloomFilter] = None
+        self._pending: Optional[list[str]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the initial scan has completed."""
+        return self._filter is not None
+
+    def _add(self, key: str) -> None:
+        if self._filter is not None:
+            self._filter.add(key)
+        if self._pending is not None:
+            self._pending.append(key)
+
+    def add(self, username: Optional[str] = None, email: Optional[str] = None) -> None:
+        """Record username and email as taken."""
+        if username is not None:
+            self._add(f"u:{username}")
+        if email is not None:
+            self._add(f"e:{email}")
+
+    def _might_contain(self, key: str) -> bool:
+        if self._filter is None:
+            return True
+        self.checks += 1
+        if key in self._filter:
+            return True
+        self.negatives += 1
+        return False
+
+    def might_contain_username(self, username: str) -> bool:
+        """False only if username is definitely not taken."""
+        return self._might_contain(f"u:{username}")
+
+    def might_contain_email(self, email: str) -> bool:
+        """False only if email is definitely not taken."""
+        return self._might_contain(f"e:{email}")
+
+    async def rebuild(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        """Build a new filter from a streaming scan and swap it in."""
+        self._pending = []
+        try:
+            async with session_maker() as session:
+                count = await session.scalar(
+                    select(func.count(User.id)), bind_arguments={"read_only": True}
+                )
+                # Room to grow until the next rebuild
+                bloom = BloomFilter(max(2 * count, 1024), self.error_rate)
+                query = select(User.username, User.email).execution_options(
+                    yield_per=self.batch_size
+                )
+                result = await session.stream(query, bind_arguments={"read_only": True})
+                async for rows in result.partitions():
+                    for username, email in rows:
+                        bloom.add(f"u:{username}")
+                        bloom.add(f"e:{email}")
+
+            # Writes made by this process during the scan
+            for key in self._pending:
+                bloom.add(key)
+            self._filter = bloom
+            self.rebuilds += 1
+        finally:
+            self._pending = None
+
+    async def _rebuild_loop(self, session_maker: async_sessionmaker[AsyncSession]):
+        while True:
+            try:
+                await self.rebuild(session_maker)
+            except Exception:
+                logger.exception("User filter rebuild failed")
+            if self.rebuild_interval <= 0:
+                return
+            await asyncio.sleep(self.rebuild_interval)
+
+    def start(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        """Build filter in the background and rebuild it periodically."""
+        self._task = asyncio.create_task(self._rebuild_loop(session_maker))
+
+    def stop(self) -> None:
+        """Stop background rebuilds."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> UserFilterStats:
+        """Get filter statistics."""
+        bloom = self._filter
+        return UserFilterStats(
+            ready=bloom is not None,
+            items=bloom.count if bloom else 0,
+            capacity=bloom.capacity if bloom else 0,
+            size_bytes=len(bloom._bits) if bloom else 0,
+            hashes=bloom.hashes if bloom else 0,
+            checks=self.checks,
+            negatives=self.negatives,
+            rebuilds=self.rebuilds,
+        )
+
+
+# Singleton instance
+user_filter = UserFilter(
+    error_rate=settings.user_filter_error_rate,
+    rebuild_interval=settings.user_filter_rebuild_interval,
+)
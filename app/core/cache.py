@@ -0,0 +1,184 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Generic,
+    Hashable,
+    Iterable,
+    Optional,
+    Protocol,
+    TypeVar,
+)
+
+from app.config.settings import settings
+
+if TYPE_CHECKING:
+    from litestar.stores.base import Store
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """In-process LRU cache with per-entry expiry."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[V, Optional[float]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> Optional[V]:
+        """Get value by key."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """Set value, ``ttl`` overrides the cache default."""
+        if self.maxsize <= 0:
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: K) -> None:
+        """Delete value by key."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Delete all values."""
+        self._data.clear()
+
+
+@dataclass(frozen=True)
+class CacheBackendStats:
+    """Cache backend statistics."""
+
+    backend: str
+    entries: Optional[int]
+    evictions: int
+
+
+class CacheBackend(Protocol):
+    """Byte-valued cache backend."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get value by key."""
+        ...
+
+    async def set(self, key: str, value: bytes) -> None:
+        """Set value with the backend TTL."""
+        ...
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete values by keys."""
+        ...
+
+    def stats(self) -> CacheBackendStats:
+        """Get backend statistics."""
+        ...
+
+
+class MemoryCacheBackend:
+    """In-process backend, deletes happen without yielding to other tasks."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.cache: TTLCache[str, bytes] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get value by key."""
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        """Set value with the backend TTL."""
+        self.cache.set(key, value)
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete values by keys."""
+        for key in keys:
+            self.cache.delete(key)
+
+    def stats(self) -> CacheBackendStats:
+        """Get backend statistics."""
+        return CacheBackendStats(
+            backend="memory", entries=len(self.cache), evictions=self.cache.evictions
+        )
+
+
+class StoreCacheBackend:
+    """Backend over a Litestar store shared between workers.
+
+    ``RedisStore`` shares entries between processes and hosts;
+    ``MemoryStore`` is a local stand-in with the same async interface.
+    Size and evictions are managed by the store and not reported.
+    """
+
+    def __init__(self, store: "Store", ttl: Optional[float] = None):
+        self.store = store
+        self.ttl = int(ttl) if ttl else None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get value by key."""
+        return await self.store.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        """Set value with the backend TTL."""
+        await self.store.set(key, value, expires_in=self.ttl)
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete values by keys."""
+        for key in keys:
+            await self.store.delete(key)
+
+    def stats(self) -> CacheBackendStats:
+        """Get backend statistics."""
+        return CacheBackendStats(
+            backend=type(self.store).__name__, entries=None, evictions=0
+        )
+
+
+def create_cache_backend(
+    backend: str, maxsize: int, ttl: Optional[float], redis_url: str = ""
+) -> CacheBackend:
+    """Create cache backend by name: ``memory`` or ``store``."""
+    if backend == "memory":
+        return MemoryCacheBackend(maxsize=maxsize, ttl=ttl)
+    if backend == "store":
+        if redis_url:
+            from litestar.stores.redis import RedisStore
+
+            return StoreCacheBackend(RedisStore.with_client(url=redis_url), ttl=ttl)
+
+        from litestar.stores.memory import MemoryStore
+
+        return StoreCacheBackend(MemoryStore(), ttl=ttl)
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+# Authenticated principals keyed by user id
+principal_cache: TTLCache = TTLCache(
+    maxsize=settings.principal_cache_size, ttl=settings.principal_cache_ttl
+)
@@ -0,0 +1,112 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.config.settings import settings
+from app.core.conditional import to_utc
+from app.models.entities.base import utcnow
+from app.models.entities.user import User
+from app.models.schemas.user import UserChangeSchema, UserResponseSchema
+
+
+class ChangeHubFullError(Exception):
+    """Raised when the hub has no room for another subscriber."""
+
+
+class ResyncRequiredError(Exception):
+    """Raised when a feed position predates the tombstones still kept."""
+
+
+def check_position(after: Optional[tuple[datetime, int]]) -> None:
+    """Reject a position older than the tombstone retention.
+
+    Deletions before it may have been pruned: resuming from it would
+    silently miss them.
+    """
+    retention = settings.change_feed_tombstone_retention
+    if after is None or retention <= 0:
+        return
+    if to_utc(after[0]) < utcnow() - timedelta(seconds=retention):
+        raise ResyncRequiredError(
+            "Cursor is older than the change feed retention, full resync required"
+        )
+
+
+@dataclass(frozen=True)
+class ChangeHubStats:
+    """Change hub statistics."""
+
+    subscribers: int
+    published: int
+    dropped: int
+
+
+class ChangeHub:
+    """In-process fan-out of committed user changes to open streams.
+
+    Best effort: a subscriber whose queue is full misses pushes, and
+    other workers' changes never arrive here. Streams read the database
+    for everything they were not pushed, the hub only makes changes of
+    this worker arrive without waiting for the next poll.
+    """
+
+    def __init__(self, queue_size: int = 1000, max_subscribers: int = 1000):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.published = 0
+        self.dropped = 0
+        self._subscribers: set[asyncio.Queue] = set()
+
+    @property
+    def is_full(self) -> bool:
+        """Whether another subscriber would be refused."""
+        return len(self._subscribers) >= self.max_subscribers
+
+    def subscribe(self) -> asyncio.Queue:
+        """Get a queue receiving changes published from now on."""
+        if self.is_full:
+            raise ChangeHubFullError("Too many change streams")
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stop delivering to ``queue``."""
+        self._subscribers.discard(queue)
+
+    def publish(self, change: UserChangeSchema) -> None:
+        """Push change to every subscriber with room for it."""
+        self.published += 1
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(change)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    def publish_user(self, user: User) -> None:
+        """Publish created or updated user, free without subscribers."""
+        if self._subscribers:
+            self.publish(
+                UserChangeSchema.upserted(UserResponseSchema.from_entity(user))
+            )
+
+    def publish_deleted(self, user_id: int, uuid: str, deleted_at: datetime) -> None:
+        """Publish deleted user, free without subscribers."""
+        if self._subscribers:
+            self.publish(UserChangeSchema.deleted(user_id, uuid, deleted_at))
+
+    def stats(self) -> ChangeHubStats:
+        """Get hub statistics."""
+        return ChangeHubStats(
+            subscribers=len(self._subscribers),
+            published=self.published,
+            dropped=self.dropped,
+        )
+
+
+# Singleton instance
+change_hub = ChangeHub(
+    queue_size=settings.change_feed_queue_size,
+    max_subscribers=settings.change_feed_max_subscribers,
+)
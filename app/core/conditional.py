@@ -0,0 +1,74 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional
+
+from litestar import Request
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_utc(value: datetime) -> datetime:
+    """Get naive UTC timestamp, aware values are converted first."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def entity_etag(entity_id: int, updated_at: datetime) -> str:
+    """Build strong ETag from ID and modification time."""
+    micros = (to_utc(updated_at) - EPOCH) // timedelta(microseconds=1)
+    return f'"{entity_id:x}-{micros:x}"'
+
+
+def list_etag(versions: Iterable[tuple[int, datetime]]) -> Optional[str]:
+    """Build weak ETag for a page from its IDs and latest modification time."""
+    versions = list(versions)
+    if not versions:
+        return None
+    latest = max(to_utc(updated_at) for _, updated_at in versions)
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{len(versions)}:{versions[0][0]}:{versions[-1][0]}".encode())
+    digest.update(latest.isoformat().encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def validator_headers(etag: str, last_modified: datetime) -> dict[str, str]:
+    """Build ``ETag``, ``Last-Modified`` and ``Cache-Control`` headers."""
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(
+            to_utc(last_modified).replace(tzinfo=timezone.utc), usegmt=True
+        ),
+        "Cache-Control": "private, no-cache",
+    }
+
+
+def is_conditional(request: Request) -> bool:
+    """Check whether request carries cache validators."""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(
+    request: Request, etag: Optional[str], last_modified: Optional[datetime]
+) -> bool:
+    """Evaluate ``If-None-Match``, then ``If-Modified-Since`` (RFC 9110)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison, as required for GET
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            since = to_utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one second resolution
+        return to_utc(last_modified).replace(microsecond=0) <= since
+    return False
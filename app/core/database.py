@@ -1,39 +1,299 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
+import hashlib
+import logging
+import os
+from contextlib import AsyncExitStack
+from datetime import timedelta
+from typing import Any, AsyncGenerator, Iterable, Optional
+
+from sqlalchemy import Connection, Dialect, Engine, Executable, delete, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 from app.config.settings import settings
-from app.models.entities.base import Base
+from app.core.metrics import TimedQueuePool, instrument_engine
+from app.core.profiling import watch_engine
+from app.models.entities.base import Base, utcnow
+from app.models.entities.user_search import USERS_FTS_DDL
+
+# Imported to register their tables
+from app.models.entities.token_epoch import TokenEpoch  # noqa: F401
+from app.models.entities.user import User  # noqa: F401
+from app.models.entities.user_tombstone import UserTombstone  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+def sqlite_ddl(dialect: Dialect) -> tuple[str, ...]:
+    """Raw DDL outside the metadata (full-text index), SQLite only."""
+    return USERS_FTS_DDL if dialect.name == "sqlite" else ()
+
+
+def schema_version(dialect: Dialect) -> int:
+    """Fingerprint of the DDL for all tables, indexes and raw DDL.
+
+    Stored in SQLite's ``PRAGMA user_version`` (a signed 32-bit integer)
+    once the schema has been created; any model change alters it.
+    """
+    ddl = [
+        str(statement.compile(dialect=dialect)).strip()
+        for table in Base.metadata.sorted_tables
+        for statement in (
+            CreateTable(table),
+            *(CreateIndex(index) for index in sorted(table.indexes, key=str)),
+        )
+    ]
+    ddl.extend(sqlite_ddl(dialect))
+    digest = hashlib.blake2b("\n".join(ddl).encode(), digest_size=4).digest()
+    # Zero is SQLite's default for a database nobody has stamped
+    return int.from_bytes(digest, "big") & 0x7FFFFFFF or 1
+
+
+class RoutingSession(Session):
+    """Session routing read-only statements to the reader pool.
+
+    Statements executed with ``bind_arguments={"read_only": True}`` go
+    to the reader engine; everything else, including flushes and
+    refreshes, goes to the single writer connection.
+    """
+
+    read_engine: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, *, read_only: bool = False, **kw: Any):
+        if read_only and self.read_engine is not None and not self._flushing:
+            return self.read_engine
+        return super().get_bind(mapper, **kw)
 
 
 class DatabaseManager:
-    """Database connection manager."""
+    """Database connection manager.
+
+    Writes go through one writer connection, reads through a pool of
+    read-only connections. Engines are created lazily in the process
+    that uses them; a worker forked from a process that already had
+    engines drops the inherited pools and opens its own connections.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        pragmas: Optional[dict[str, Any]] = None,
+        maintenance_interval: float = 0,
+        read_pool_size: int = 4,
+        pool_timeout: float = 30,
+        tombstone_retention: float = 0,
+    ):
+        self.database_url = database_url
+        self.pragmas = pragmas or {}
+        self.maintenance_interval = maintenance_interval
+        self.tombstone_retention = tombstone_retention
+        self.read_pool_size = read_pool_size
+        self.pool_timeout = pool_timeout
+        self._engine: Optional[AsyncEngine] = None
+        self._read_engine: Optional[AsyncEngine] = None
+        self._session_maker: Optional[async_sessionmaker[AsyncSession]] = None
+        self._pid: Optional[int] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
 
-    def __init__(self, database_url: str):
+        url = make_url(database_url)
+        self.is_sqlite = url.get_backend_name() == "sqlite"
+        self.is_memory = self.is_sqlite and url.database in (None, "", ":memory:")
+
+    def _create_engine(self, read_only: bool = False) -> AsyncEngine:
         # SQLite specific configuration
         connect_args = {
             "check_same_thread": False,
         }
 
-        self.engine = create_async_engine(
-            database_url,
-            poolclass=StaticPool,
+        name = "reader" if read_only else "writer"
+        if self.is_memory:
+            # Every connection would see its own empty database
+            pool_args = {"poolclass": StaticPool}
+        else:
+            pool_args = {
+                "poolclass": TimedQueuePool.named(name),
+                "pool_size": self.read_pool_size if read_only else 1,
+                "max_overflow": 0,
+                "pool_timeout": self.pool_timeout,
+            }
+
+        engine = create_async_engine(
+            self.database_url,
             connect_args=connect_args,
             echo=settings.debug,
+            **pool_args,
         )
+        if settings.metrics_enabled:
+            instrument_engine(engine.sync_engine, name)
+        if settings.profiling_enabled or settings.slow_query_ms > 0:
+            watch_engine(engine.sync_engine, name, settings.slow_query_ms)
+        if self.is_sqlite and not read_only:
+            # Let SQLAlchemy own BEGIN so SAVEPOINTs nest inside it
+            event.listen(engine.sync_engine, "connect", self._disable_autobegin)
+            event.listen(engine.sync_engine, "begin", self._begin)
+        if self.is_sqlite:
+            pragmas = dict(self.pragmas)
+            if read_only:
+                pragmas["query_only"] = "ON"
+            if pragmas:
+                event.listen(
+                    engine.sync_engine,
+                    "connect",
+                    lambda dbapi_connection, _: self._apply_pragmas(
+                        dbapi_connection, pragmas
+                    ),
+                )
+        return engine
+
+    @staticmethod
+    def _disable_autobegin(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.isolation_level = None
+
+    @staticmethod
+    def _begin(conn: Any) -> None:
+        # Take the write lock up front: a deferred transaction that reads
+        # before writing cannot be upgraded once another worker has
+        # written, and fails with SQLITE_BUSY without waiting out
+        # busy_timeout. Reads go to the reader engine.
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    def _apply_pragmas(self, dbapi_connection: Any, pragmas: dict[str, Any]) -> None:
+        """Apply SQLite tuning profile to a new connection."""
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                if name == "journal_mode" and self.is_memory:
+                    continue
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
 
-        self.async_session_maker = async_sessionmaker(
-            bind=self.engine, class_=AsyncSession, expire_on_commit=False
+    def _ensure_engines(self) -> None:
+        pid = os.getpid()
+        if self._engine is not None and self._pid == pid:
+            return
+
+        for engine in {self._engine, self._read_engine} - {None}:
+            # Inherited across fork: forget parent's connections
+            engine.sync_engine.dispose(close=False)
+
+        self._engine = self._create_engine()
+        self._read_engine = (
+            self._engine if self.is_memory else self._create_engine(read_only=True)
+        )
+
+        class ProcessRoutingSession(RoutingSession):
+            read_engine = self._read_engine.sync_engine
+
+        self._session_maker = async_sessionmaker(
+            bind=self._engine,
+            class_=AsyncSession,
+            sync_session_class=ProcessRoutingSession,
+            expire_on_commit=False,
         )
+        self._pid = pid
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """Get writer engine owned by the current process."""
+        self._ensure_engines()
+        return self._engine
+
+    @property
+    def read_engine(self) -> AsyncEngine:
+        """Get reader engine owned by the current process."""
+        self._ensure_engines()
+        return self._read_engine
+
+    @property
+    def async_session_maker(self) -> async_sessionmaker[AsyncSession]:
+        """Get session factory bound to the current process engines."""
+        self._ensure_engines()
+        return self._session_maker
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        """Get connection pool statistics."""
+        self._ensure_engines()
+        stats = {}
+        for name, engine in (("writer", self._engine), ("reader", self._read_engine)):
+            pool = engine.sync_engine.pool
+            if isinstance(pool, StaticPool):
+                stats[name] = {"size": 1}
+                continue
+            stats[name] = {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        return stats
+
+    @staticmethod
+    def _create_schema(conn: Connection) -> None:
+        Base.metadata.create_all(conn)
+        # create_all skips existing tables, including indexes added later
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        for statement in sqlite_ddl(conn.dialect):
+            conn.exec_driver_sql(statement)
 
     async def create_all(self) -> None:
-        """Create all tables."""
+        """Create all tables and indexes and record the schema version."""
         async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(self._create_schema)
+            if self.is_sqlite:
+                version = schema_version(conn.dialect)
+                await conn.exec_driver_sql(f"PRAGMA user_version={version}")
+
+    async def ensure_schema(self) -> bool:
+        """Create schema unless the stored version is current.
+
+        Skips table reflection and DDL on every boot of an up-to-date
+        database. Returns whether the schema had to be created.
+        """
+        if self.is_sqlite:
+            async with self.engine.connect() as conn:
+                stored = await conn.scalar(text("PRAGMA user_version"))
+                if stored == schema_version(conn.dialect):
+                    return False
+        await self.create_all()
+        return True
+
+    async def warm_up(self, statements: Iterable[Executable] = ()) -> None:
+        """Open every pooled connection and run ``statements`` on each.
+
+        Connections are opened (and pragmas applied) before the first
+        request, and the hot queries are compiled once and land in each
+        connection's prepared statement cache.
+        """
+        statements = list(statements)
+        engines = [(self.engine, 1)]
+        if self.read_engine is not self.engine:
+            engines.append((self.read_engine, self.read_pool_size))
+
+        async with AsyncExitStack() as stack:
+            for engine, size in engines:
+                # Hold connections so the pool hands out a new one each time
+                for _ in range(size):
+                    conn = await stack.enter_async_context(engine.connect())
+                    for statement in statements:
+                        await conn.execute(statement)
+                    await conn.rollback()
 
     async def drop_all(self) -> None:
         """Drop all tables."""
         async with self.engine.begin() as conn:
+            if self.is_sqlite:
+                await conn.exec_driver_sql("DROP TABLE IF EXISTS users_fts")
             await conn.run_sync(Base.metadata.drop_all)
 
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
@@ -41,10 +301,60 @@ class DatabaseManager:
         async with self.async_session_maker() as session:
             yield session
 
+    async def prune_tombstones(self) -> int:
+        """Delete tombstones older than the retention, return how many."""
+        horizon = utcnow() - timedelta(seconds=self.tombstone_retention)
+        async with self.engine.begin() as conn:
+            result = await conn.execute(
+                delete(UserTombstone).where(UserTombstone.deleted_at < horizon)
+            )
+        return result.rowcount
+
+    async def maintain(self) -> None:
+        """Prune expired tombstones, checkpoint WAL, refresh planner statistics."""
+        if self.tombstone_retention > 0:
+            pruned = await self.prune_tombstones()
+            if pruned:
+                logger.info("Pruned %d change feed tombstones", pruned)
+        async with self.engine.connect() as conn:
+            if self.pragmas.get("journal_mode", "").upper() == "WAL":
+                await conn.execute(text("PRAGMA wal_checkpoint(PASSIVE)"))
+            await conn.execute(text("PRAGMA optimize"))
+
+    async def _maintenance_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.maintenance_interval)
+            try:
+                await self.maintain()
+            except Exception:
+                logger.exception("SQLite maintenance failed")
+
+    def start_maintenance(self) -> None:
+        """Start periodic maintenance if configured."""
+        if self.is_sqlite and self.maintenance_interval > 0:
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
     async def close(self) -> None:
-        """Close database connection."""
-        await self.engine.dispose()
+        """Close database connections."""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        if self._engine is not None and self._pid == os.getpid():
+            await self._engine.dispose()
+            if self._read_engine is not self._engine:
+                await self._read_engine.dispose()
+        self._engine = None
+        self._read_engine = None
+        self._session_maker = None
+        self._pid = None
 
 
 # Singleton instance
-database_manager = DatabaseManager(settings.database_url)
+database_manager = DatabaseManager(
+    settings.database_url,
+    pragmas=settings.sqlite_pragmas,
+    maintenance_interval=settings.sqlite_maintenance_interval,
+    read_pool_size=settings.db_read_pool_size,
+    pool_timeout=settings.db_pool_timeout,
+    tombstone_retention=settings.change_feed_tombstone_retention,
+)
@@ -3,10 +3,15 @@ from typing import AsyncGenerator
 from litestar.di import Provide
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.settings import settings
+from app.core.batching import write_batcher
 from app.core.database import database_manager
+from app.repositories.user.cached import CachedUserRepository, user_cache
 from app.repositories.user.implementation import UserRepository
+from app.repositories.user.protocol import UserRepositoryProtocol
 from app.services.user.implementation import UserService
 from app.services.auth.implementation import AuthService
+from app.services.auth.rehash import PasswordRehasher
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
@@ -15,26 +20,43 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+def create_user_repository(session: AsyncSession) -> UserRepositoryProtocol:
+    """Create user repository for a session, cached when enabled."""
+    repository = UserRepository(
+        session, write_batcher=write_batcher if settings.group_commit_enabled else None
+    )
+    if settings.user_cache_enabled:
+        return CachedUserRepository(repository, user_cache)
+    return repository
+
+
 async def get_user_repository(
     session: AsyncSession = Provide(get_db_session),
-) -> UserRepository:
+) -> UserRepositoryProtocol:
     """Get user repository."""
-    return UserRepository(session)
+    return create_user_repository(session)
 
 
 async def get_user_service(
-    user_repository: UserRepository = Provide(get_user_repository),
+    user_repository: UserRepositoryProtocol = Provide(get_user_repository),
 ) -> UserService:
     """Get user service."""
     return UserService(user_repository)
 
 
 async def get_auth_service(
-    user_repository: UserRepository = Provide(get_user_repository),
+    user_repository: UserRepositoryProtocol = Provide(get_user_repository),
 ) -> AuthService:
     """Get auth service."""
-    return AuthService(user_repository)
+    rehash = password_rehasher.schedule if settings.password_rehash_enabled else None
+    return AuthService(user_repository, rehash=rehash)
+
 
+# Singleton instance
+password_rehasher = PasswordRehasher(
+    session_factory=lambda: database_manager.async_session_maker(),
+    repository_factory=create_user_repository,
+)
 
 # Dependency providers
 dependencies = {
@@ -0,0 +1,62 @@
+import csv
+import io
+import zlib
+from typing import AsyncIterator, Iterable, Sequence
+
+import msgspec
+from sqlalchemy import Row
+
+NDJSON = "ndjson"
+CSV = "csv"
+
+MEDIA_TYPES = {
+    NDJSON: "application/x-ndjson",
+    CSV: "text/csv",
+}
+
+
+def encode_ndjson(columns: Sequence[str], rows: Iterable[Row]) -> bytes:
+    """Encode rows as newline-delimited JSON."""
+    encoder = msgspec.json.Encoder()
+    buffer = bytearray()
+    for row in rows:
+        encoder.encode_into(dict(zip(columns, row)), buffer, len(buffer))
+        buffer.extend(b"\n")
+    return bytes(buffer)
+
+
+def encode_csv(rows: Iterable[Row]) -> bytes:
+    """Encode rows as CSV lines."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            value.isoformat() if hasattr(value, "isoformat") else value for value in row
+        )
+    return buffer.getvalue().encode()
+
+
+async def encode_rows(
+    batches: AsyncIterator[Sequence[Row]],
+    columns: Sequence[str],
+    fmt: str,
+    gzip: bool = False,
+) -> AsyncIterator[bytes]:
+    """Encode row batches to NDJSON or CSV chunks, optionally gzipped."""
+    compressor = zlib.compressobj(wbits=31) if gzip else None
+
+    def emit(chunk: bytes) -> bytes:
+        return compressor.compress(chunk) if compressor else chunk
+
+    if fmt == CSV:
+        yield emit(encode_csv([columns]))
+
+    async for rows in batches:
+        chunk = emit(
+            encode_ndjson(columns, rows) if fmt == NDJSON else encode_csv(rows)
+        )
+        if chunk:
+            yield chunk
+
+    if compressor:
+        yield compressor.flush()
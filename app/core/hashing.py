@@ -0,0 +1,232 @@
+import argparse
+import asyncio
+import functools
+import logging
+import statistics
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar
+
+from passlib.hash import bcrypt
+
+from app.config.settings import settings
+from app.core.metrics import (
+    BCRYPT_HASH_SECONDS,
+    PASSWORD_HASH_IN_FLIGHT,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_SECONDS,
+    PASSWORD_HASH_WAIT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Set by "python -m app" so all workers share one calibration
+CALIBRATED_ROUNDS_ENV = "BCRYPT_CALIBRATED_ROUNDS"
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusyError(Exception):
+    """Password hashing queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class PasswordHasherStats:
+    """Password hasher statistics."""
+
+    workers: int
+    max_queue: int
+    in_flight: int
+    queue_depth: int
+    submitted: int
+    completed: int
+    rejected: int
+    wait_seconds_total: float
+    hash_seconds_total: float
+    hash_seconds_max: float
+
+
+class PasswordHasher:
+    """Bounded worker pool for password hashing.
+
+    bcrypt releases the GIL, so a thread pool gives real parallelism
+    without the pickling overhead of a process pool. Jobs beyond
+    ``workers + max_queue`` are rejected with ``PasswordHasherBusyError``.
+    """
+
+    def __init__(self, workers: int, max_queue: int, retry_after: int):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Counters are only touched from the event loop thread.
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._hash_total = 0.0
+        self._hash_max = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    @staticmethod
+    def _timed(func: Callable[..., T], args: tuple) -> tuple[T, float, float]:
+        started = time.perf_counter()
+        result = func(*args)
+        return result, started, time.perf_counter() - started
+
+    def _set_pending(self, delta: int) -> None:
+        self._pending += delta
+        in_flight = min(self._pending, self.workers)
+        PASSWORD_HASH_IN_FLIGHT.set(in_flight)
+        PASSWORD_HASH_QUEUE_DEPTH.set(self._pending - in_flight)
+
+    def _on_done(self, loop: asyncio.AbstractEventLoop, future: Future) -> None:
+        # Runs in the worker thread, or in the loop when cancelled unstarted
+        try:
+            loop.call_soon_threadsafe(self._set_pending, -1)
+        except RuntimeError:
+            # Loop already closed at shutdown, nothing left to account for
+            pass
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run hashing function in the worker pool.
+
+        A job holds its slot until bcrypt finishes, not until the caller
+        stops waiting: a cancelled request leaves its job running in the
+        pool, and the bound must count it.
+        """
+        if self._pending >= self.workers + self.max_queue:
+            self._rejected += 1
+            raise PasswordHasherBusyError(self.retry_after)
+
+        self._set_pending(1)
+        self._submitted += 1
+        submitted_at = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._get_executor().submit(self._timed, func, args)
+        except BaseException:
+            self._set_pending(-1)
+            raise
+        future.add_done_callback(functools.partial(self._on_done, loop))
+        result, started_at, elapsed = await asyncio.wrap_future(future)
+
+        self._completed += 1
+        PASSWORD_HASH_SECONDS.labels(func.__name__).observe(elapsed)
+        PASSWORD_HASH_WAIT_SECONDS.labels(func.__name__).observe(
+            started_at - submitted_at
+        )
+        self._wait_total += started_at - submitted_at
+        self._hash_total += elapsed
+        self._hash_max = max(self._hash_max, elapsed)
+        return result
+
+    def stats(self) -> PasswordHasherStats:
+        """Get hasher statistics."""
+        in_flight = min(self._pending, self.workers)
+        return PasswordHasherStats(
+            workers=self.workers,
+            max_queue=self.max_queue,
+            in_flight=in_flight,
+            queue_depth=self._pending - in_flight,
+            submitted=self._submitted,
+            completed=self._completed,
+            rejected=self._rejected,
+            wait_seconds_total=self._wait_total,
+            hash_seconds_total=self._hash_total,
+            hash_seconds_max=self._hash_max,
+        )
+
+    def shutdown(self) -> None:
+        """Shutdown worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+@dataclass(frozen=True)
+class BcryptCalibration:
+    """Chosen bcrypt cost and its measured hash time on this host."""
+
+    rounds: int
+    hash_ms: float
+    target_ms: float
+
+
+def measure_bcrypt(rounds: int, samples: int = 3) -> float:
+    """Get median seconds to hash one password with ``rounds``."""
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(
+    target_ms: float, min_rounds: int, max_rounds: int
+) -> BcryptCalibration:
+    """Pick the highest cost whose hash time stays within ``target_ms``.
+
+    Each round doubles the work, so the time at ``min_rounds`` is
+    extrapolated and the pick is measured once more. The cost never goes
+    below ``min_rounds``, even on hosts too slow for the target.
+    """
+    base = measure_bcrypt(min_rounds)
+    rounds = min_rounds
+    while rounds < max_rounds and base * 2 ** (rounds + 1 - min_rounds) * 1000 <= (
+        target_ms
+    ):
+        rounds += 1
+    hash_seconds = base if rounds == min_rounds else measure_bcrypt(rounds, samples=1)
+
+    calibration = BcryptCalibration(
+        rounds=rounds, hash_ms=round(hash_seconds * 1000, 1), target_ms=target_ms
+    )
+    BCRYPT_HASH_SECONDS.set(hash_seconds)
+    logger.info(
+        "bcrypt calibrated to %d rounds, %.1f ms per hash (target %.0f ms)",
+        calibration.rounds,
+        calibration.hash_ms,
+        calibration.target_ms,
+    )
+    return calibration
+
+
+def main() -> None:
+    """Calibrate bcrypt on this host and print the setting to use."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--target-ms", type=float, default=settings.bcrypt_target_ms)
+    parser.add_argument("--min-rounds", type=int, default=settings.bcrypt_min_rounds)
+    parser.add_argument("--max-rounds", type=int, default=settings.bcrypt_max_rounds)
+    args = parser.parse_args()
+
+    calibration = calibrate_bcrypt(args.target_ms, args.min_rounds, args.max_rounds)
+    print(f"{calibration.hash_ms} ms per hash at {calibration.rounds} rounds")
+    print(f"BCRYPT_ROUNDS={calibration.rounds}")
+
+
+# Singleton instance
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+    retry_after=settings.password_hash_retry_after,
+)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config.settings import settings
+
+C = TypeVar("C", bound=type)
+
+
+class NullMetric:
+    """Stand-in for a metric while metrics are disabled."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        pass
+
+    def labels(self, *labels: str) -> "NullMetric":
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def observe(self, amount: float) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+
+if settings.metrics_enabled:
+    from prometheus_client import Counter, Gauge, Histogram
+else:
+    # Keep prometheus_client off the import path
+    Counter = Gauge = Histogram = NullMetric
+
+# Sub-millisecond resolution for SQLite statements and pool checkouts
+FAST_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    float("inf"),
+)
+
+DB_STATEMENTS = Counter(
+    "db_statements_total",
+    "SQL statements executed",
+    ["engine", "operation"],
+)
+DB_STATEMENT_SECONDS = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time",
+    ["engine", "operation"],
+    buckets=FAST_BUCKETS,
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Time to check out a connection from the pool",
+    ["pool"],
+    buckets=FAST_BUCKETS,
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Connections the pool keeps open",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt time in the hashing worker",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, float("inf")),
+)
+PASSWORD_HASH_WAIT_SECONDS = Histogram(
+    "password_hash_wait_seconds",
+    "Time queued before a hashing worker picked the job up",
+    ["operation"],
+)
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight",
+    "Hashing jobs running in the worker pool",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Hashing jobs waiting for a free worker",
+    multiprocess_mode="livesum",
+)
+BCRYPT_ROUNDS = Gauge(
+    "bcrypt_rounds",
+    "bcrypt cost new password hashes are created with",
+    multiprocess_mode="max",
+)
+BCRYPT_HASH_SECONDS = Gauge(
+    "bcrypt_calibrated_hash_seconds",
+    "Hash time measured by the last bcrypt calibration",
+    multiprocess_mode="max",
+)
+PASSWORD_REHASHES = Counter(
+    "password_rehashes_total",
+    "Stored hashes upgraded to the current bcrypt cost after login",
+    ["result"],
+)
+JWT_VERIFY_SECONDS = Histogram(
+    "jwt_verify_duration_seconds",
+    "Access token verification time",
+    ["result"],
+    buckets=FAST_BUCKETS,
+)
+USER_CACHE_LOOKUPS = Counter(
+    "user_cache_lookups_total",
+    "Single-user lookups in the user cache",
+    ["result"],
+)
+USER_CACHE_EVICTIONS = Counter(
+    "user_cache_evictions_total",
+    "Entries dropped from a full in-process user cache",
+)
+USER_CACHE_INVALIDATIONS = Counter(
+    "user_cache_invalidations_total",
+    "User cache entries dropped after writes",
+)
+JWT_CACHE_LOOKUPS = Counter(
+    "jwt_cache_lookups_total",
+    "Access token lookups in the verified claims cache",
+    ["result"],
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Attempts rejected by the rate limiter",
+    ["rule"],
+)
+
+# Repository method the current task is running, for SQL attribution
+current_operation: ContextVar[str] = ContextVar("current_operation", default="other")
+
+
+def instrument_repository(cls: C) -> C:
+    """Attribute SQL executed by public coroutine methods to ``Class.method``.
+
+    The outermost call wins, so a method delegating to another one keeps
+    its own label.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+
+        def wrap(method: Callable, operation: str) -> Callable:
+            @functools.wraps(method)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if current_operation.get() != "other":
+                    return await method(*args, **kwargs)
+                token = current_operation.set(operation)
+                try:
+                    return await method(*args, **kwargs)
+                finally:
+                    current_operation.reset(token)
+
+            return wrapper
+
+        setattr(cls, name, wrap(method, f"{cls.__name__}.{name}"))
+    return cls
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Count and time statements executed on ``engine``."""
+    # Label children resolved once per (engine, operation)
+    children: dict[str, tuple[Any, Any]] = {}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        elapsed = time.perf_counter() - context._metrics_started
+        operation = current_operation.get()
+        metrics = children.get(operation)
+        if metrics is None:
+            metrics = children[operation] = (
+                DB_STATEMENTS.labels(name, operation),
+                DB_STATEMENT_SECONDS.labels(name, operation),
+            )
+        metrics[0].inc()
+        metrics[1].observe(elapsed)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording checkout wait, including new connections, and
+    its size and checked-out connections."""
+
+    metrics_name = "default"
+
+    @classmethod
+    def named(cls, name: str) -> type["TimedQueuePool"]:
+        """Get pool class reporting under ``name``."""
+        # Pool loggers are named after the class module; stay under the
+        # "sqlalchemy" logger so pool chatter keeps its WARN default
+        namespace = {
+            "metrics_name": name,
+            "__module__": AsyncAdaptedQueuePool.__module__,
+        }
+        return type(f"{cls.__name__}[{name}]", (cls,), namespace)
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        DB_POOL_SIZE.labels(self.metrics_name).set(self.size())
+
+    def _report_usage(self) -> None:
+        DB_POOL_CHECKED_OUT.labels(self.metrics_name).set(self.checkedout())
+        # Negative while the pool has not opened all its connections yet
+        DB_POOL_OVERFLOW.labels(self.metrics_name).set(max(0, self.overflow()))
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_WAIT_SECONDS.labels(self.metrics_name).observe(
+                time.perf_counter() - started
+            )
+            self._report_usage()
+
+    def _do_return_conn(self, record: Any) -> None:
+        try:
+            super()._do_return_conn(record)
+        finally:
+            self._report_usage()
@@ -1,54 +1,83 @@
 from typing import Optional
 
-from litestar import Request
-from litestar.exceptions import NotAuthorizedException
 from litestar.connection import ASGIConnection
+from litestar.exceptions import NotAuthorizedException
+from litestar.middleware import (
+    AbstractAuthenticationMiddleware,
+    AuthenticationResult,
+    DefineMiddleware,
+)
 
 from app.core.auth import auth_manager
-from app.models.entities.user import User
+from app.core.cache import principal_cache
+from app.core.database import database_manager
 from app.models.schemas.auth import UserAuthSchema
 
 
-async def get_current_user(request: Request) -> Optional[UserAuthSchema]:
-    """Get current user from token."""
-    authorization: str = request.headers.get("Authorization")
-
+def get_bearer_token(authorization: Optional[str]) -> Optional[str]:
+    """Get bearer token from Authorization header."""
     if not authorization:
         return None
 
     try:
         scheme, token = authorization.split()
-        if scheme.lower() != "bearer":
-            return None
     except ValueError:
         return None
 
-    token_data = auth_manager.verify_token(token)
-    if not token_data:
+    if scheme.lower() != "bearer":
         return None
+    return token
 
-    # Get user from database
-    from app.core.dependencies import get_user_service
-    from app.core.database import database_manager
 
-    async with database_manager.async_session_maker() as session:
+async def load_principal(user_id: int) -> Optional[UserAuthSchema]:
+    """Get active user by ID, cached per process."""
+    principal = principal_cache.get(user_id)
+    if principal is None:
         from app.repositories.user.implementation import UserRepository
-        from app.services.user.implementation import UserService
 
-        user_repo = UserRepository(session)
-        user_service = UserService(user_repo)
-
-        user = await user_service.get_user_by_id(token_data.user_id)
-        if not user or not user.is_active:
+        async with database_manager.async_session_maker() as session:
+            user = await UserRepository(session).get_by_id(user_id)
+        if not user:
             return None
 
-        return UserAuthSchema(
+        principal = UserAuthSchema(
             id=user.id,
             username=user.username,
             email=user.email,
             full_name=user.full_name,
             is_active=user.is_active,
         )
+        principal_cache.set(user_id, principal)
+
+    if not principal.is_active:
+        return None
+    return principal
+
+
+class JWTAuthenticationMiddleware(AbstractAuthenticationMiddleware):
+    """Populate ``request.user`` from the bearer token.
+
+    Anonymous requests get ``request.user = None``; handlers and the
+    ``require_auth`` guard decide whether that is acceptable.
+    """
+
+    async def authenticate_request(
+        self, connection: ASGIConnection
+    ) -> AuthenticationResult:
+        """Authenticate request."""
+        token = get_bearer_token(connection.headers.get("Authorization"))
+        if not token:
+            return AuthenticationResult(user=None, auth=None)
+
+        token_data = auth_manager.verify_token(token)
+        if not token_data:
+            return AuthenticationResult(user=None, auth=None)
+
+        user = await load_principal(token_data.user_id)
+        return AuthenticationResult(user=user, auth=token_data if user else None)
+
+
+auth_middleware = DefineMiddleware(JWTAuthenticationMiddleware)
 
 
 def require_auth(connection: ASGIConnection, _: any) -> None:
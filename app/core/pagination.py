@@ -0,0 +1,80 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+from litestar.datastructures import URL
+
+
+def _encode(position: dict) -> str:
+    payload = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def _decode(cursor: str, **types: type | tuple[type, ...]) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+        values = [position[key] for key in types]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+    if not all(map(isinstance, values, types.values())):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode keyset position as an opaque cursor."""
+    return _encode({"id": last_id})
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode cursor into keyset position."""
+    return _decode(cursor, id=int)[0]
+
+
+def encode_rank_cursor(rank: float, last_id: int) -> str:
+    """Encode ``(rank, id)`` keyset position of a ranked result."""
+    return _encode({"rank": rank, "id": last_id})
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    """Decode cursor into ``(rank, id)`` keyset position."""
+    rank, last_id = _decode(cursor, rank=(int, float), id=int)
+    return float(rank), last_id
+
+
+def encode_change_cursor(changed_at: datetime, last_id: int) -> str:
+    """Encode ``(changed_at, id)`` change feed position."""
+    return _encode({"ts": changed_at.isoformat(), "id": last_id})
+
+
+def decode_change_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode cursor into ``(changed_at, id)`` change feed position."""
+    changed_at, last_id = _decode(cursor, ts=str, id=int)
+    try:
+        return datetime.fromisoformat(changed_at), last_id
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def next_page_headers(url: URL, last_id: Optional[int]) -> dict[str, str]:
+    """Build ``X-Next-Cursor`` and ``Link`` headers for the next page."""
+    if last_id is None:
+        return {}
+    return cursor_headers(url, encode_cursor(last_id))
+
+
+def cursor_headers(url: URL, cursor: str, param: str = "cursor") -> dict[str, str]:
+    """Build ``X-Next-Cursor`` and ``Link`` headers for ``cursor``."""
+    query = [
+        (key, value)
+        for key, value in url.query_params.multi_items()
+        if key not in (param, "skip")
+    ]
+    query.append((param, cursor))
+    return {
+        "X-Next-Cursor": cursor,
+        "Link": f'<{url.path}?{urlencode(query)}>; rel="next"',
+    }
@@ -0,0 +1,225 @@
+import asyncio
+import cProfile
+import hmac
+import json
+import logging
+import pstats
+import random
+import time
+import uuid
+from collections.abc import Mapping
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from litestar.datastructures import Headers
+from litestar.middleware import AbstractMiddleware, DefineMiddleware
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy import Engine, event
+
+from app.config.settings import settings
+from app.core.metrics import current_operation
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.slow_query")
+
+PROFILE_HEADER = "x-profile"
+
+
+@dataclass(frozen=True)
+class StatementRecord:
+    """SQL statement issued while serving a request."""
+
+    engine: str
+    operation: str
+    statement: str
+    parameters: Any
+    duration_ms: float
+
+
+@dataclass
+class RequestProfile:
+    """SQL statements and timings of one profiled request."""
+
+    method: str
+    path: str
+    started: float = field(default_factory=time.perf_counter)
+    statements: list[StatementRecord] = field(default_factory=list)
+
+    @property
+    def sql_ms(self) -> float:
+        """Total statement time in milliseconds."""
+        return sum(record.duration_ms for record in self.statements)
+
+
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "current_profile", default=None
+)
+
+
+def redact_parameters(parameters: Any, executemany: bool) -> Any:
+    """Replace bound values by their type names."""
+    if executemany:
+        return f"<{len(parameters)} rows>"
+    if isinstance(parameters, Mapping):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    return [type(value).__name__ for value in parameters or ()]
+
+
+def watch_engine(engine: Engine, name: str, slow_query_ms: float) -> None:
+    """Record statements for profiled requests and log slow ones."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        context._profile_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        duration_ms = (time.perf_counter() - context._profile_started) * 1000
+        profile = current_profile.get()
+        is_slow = 0 < slow_query_ms <= duration_ms
+        if profile is None and not is_slow:
+            return
+
+        record = StatementRecord(
+            engine=name,
+            operation=current_operation.get(),
+            statement=statement,
+            parameters=redact_parameters(parameters, many),
+            duration_ms=round(duration_ms, 3),
+        )
+        if profile is not None:
+            profile.statements.append(record)
+        if is_slow:
+            slow_query_logger.warning(json.dumps(asdict(record)))
+
+
+def summarize_profile(profiler: cProfile.Profile, limit: int = 40) -> list[dict]:
+    """Get functions with the highest cumulative time."""
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "tottime_ms": round(tottime * 1000, 3),
+            "cumtime_ms": round(cumtime * 1000, 3),
+        }
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in rows[:limit]
+    ]
+
+
+class ProfileWriter:
+    """Write profiles to a directory keeping the newest ``keep`` of them."""
+
+    def __init__(self, directory: str, keep: int):
+        self.directory = Path(directory)
+        self.keep = keep
+
+    def write(
+        self, profile_id: str, report: dict, profiler: Optional[cProfile.Profile]
+    ) -> None:
+        """Write JSON report and, if captured, the raw ``.prof`` stats."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(report, indent=2))
+        if profiler is not None:
+            profiler.dump_stats(self.directory / f"{profile_id}.prof")
+        self.rotate()
+
+    def rotate(self) -> None:
+        """Delete profiles beyond the newest ``keep``, IDs sort by time."""
+        reports = sorted(self.directory.glob("*.json"))
+        for path in reports[: max(0, len(reports) - self.keep)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".prof").unlink(missing_ok=True)
+
+
+class ProfilingMiddleware(AbstractMiddleware):
+    """Profile requests carrying ``X-Profile: <token>`` or a random sample.
+
+    The report holds every SQL statement of the request and, when no
+    other request is being profiled at the same time, a cProfile of the
+    event loop thread for the duration of the request; concurrent
+    requests show up in it too. The report ID and SQL totals are sent
+    back in ``X-Profile-Id`` and ``Server-Timing``.
+    """
+
+    scopes = {"http"}
+    exclude = ["/metrics"]
+
+    # Python allows one active profiler per thread
+    _profiler_active = False
+
+    def __init__(self, app: ASGIApp, writer: Optional[ProfileWriter] = None):
+        super().__init__(app)
+        self.writer = writer or ProfileWriter(
+            settings.profile_dir, settings.profile_keep
+        )
+
+    @staticmethod
+    def should_profile(scope: Scope) -> bool:
+        """Check for the privileged header, then the sampling rate."""
+        token = Headers.from_scope(scope).get(PROFILE_HEADER)
+        if token is not None and settings.profile_token:
+            return hmac.compare_digest(token, settings.profile_token)
+        return random.random() < settings.profile_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{datetime.now():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+        profile = RequestProfile(method=scope["method"], path=scope["path"])
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - profile.started) * 1000
+                timing = (
+                    f"app;dur={total_ms:.3f}, sql;dur={profile.sql_ms:.3f};"
+                    f'desc="{len(profile.statements)} statements"'
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-id", profile_id.encode()),
+                    (b"server-timing", timing.encode()),
+                ]
+            await send(message)
+
+        profiler = None
+        if not ProfilingMiddleware._profiler_active:
+            ProfilingMiddleware._profiler_active = True
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        token = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(token)
+            if profiler is not None:
+                profiler.disable()
+                ProfilingMiddleware._profiler_active = False
+
+            report = {
+                "id": profile_id,
+                "method": profile.method,
+                "path": profile.path,
+                "status_code": status_code,
+                "duration_ms": round((time.perf_counter() - profile.started) * 1000, 3),
+                "sql_ms": round(profile.sql_ms, 3),
+                "statements": [asdict(record) for record in profile.statements],
+                "profile": summarize_profile(profiler) if profiler else None,
+            }
+            try:
+                await asyncio.to_thread(self.writer.write, profile_id, report, profiler)
+            except OSError:
+                logger.exception("Could not write profile %s", profile_id)
+
+
+profiling_middleware = DefineMiddleware(ProfilingMiddleware)
@@ -0,0 +1,230 @@
+import math
+import struct
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional, Protocol
+
+from app.config.settings import settings
+from app.core.metrics import RATE_LIMIT_REJECTIONS
+
+if TYPE_CHECKING:
+    from litestar.stores.base import Store
+
+# Theoretical arrival time, stored as one double
+TAT_FORMAT = struct.Struct(">d")
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a client exceeded an attempt limit."""
+
+    def __init__(self, rule: str, retry_after: int):
+        self.rule = rule
+        self.retry_after = retry_after
+        super().__init__("Too many attempts, try again later")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket: ``attempts`` per ``period`` seconds, bursts up to ``attempts``."""
+
+    attempts: int
+    period: float
+
+    @property
+    def interval(self) -> float:
+        """Seconds one attempt takes to refill."""
+        return self.period / self.attempts
+
+
+def advance(tat: Optional[float], now: float, limit: RateLimit) -> tuple[float, float]:
+    """Apply one attempt to a bucket (GCRA form of the token bucket).
+
+    The bucket is a single timestamp, the theoretical arrival time at
+    which it is full again. Returns the new timestamp and the seconds to
+    wait, zero when the attempt is allowed.
+    """
+    new_tat = max(tat or now, now) + limit.interval
+    wait = new_tat - limit.period - now
+    if wait > 0:
+        return tat, wait
+    return new_tat, 0.0
+
+
+class RateLimitBackend(Protocol):
+    """Bucket storage."""
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        """Apply one attempt, get seconds to wait (zero when allowed)."""
+        ...
+
+    def size(self) -> Optional[int]:
+        """Get number of tracked buckets, if known."""
+        ...
+
+
+class MemoryRateLimitBackend:
+    """In-process buckets, one float per key.
+
+    Full buckets carry no information and are swept out once the number
+    of keys crosses ``max_keys``; if everything is still active, the
+    oldest keys are dropped, which errs on the side of allowing.
+    """
+
+    def __init__(
+        self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_keys = max_keys
+        self.clock = clock
+        self.evictions = 0
+        self._buckets: dict[str, float] = {}
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        """Apply one attempt, get seconds to wait (zero when allowed)."""
+        now = self.clock()
+        tat, wait = advance(self._buckets.get(key), now, limit)
+        if not wait:
+            # Re-insert so dict order tracks recency
+            self._buckets.pop(key, None)
+            self._buckets[key] = tat
+            if len(self._buckets) > self.max_keys:
+                self.sweep(now)
+        return wait
+
+    def sweep(self, now: float) -> None:
+        """Drop full buckets, then the least recently used beyond ``max_keys``."""
+        expired = [key for key, tat in self._buckets.items() if tat <= now]
+        for key in expired:
+            del self._buckets[key]
+        excess = len(self._buckets) - self.max_keys * 9 // 10
+        for key in list(self._buckets)[: max(0, excess)]:
+            del self._buckets[key]
+            self.evictions += 1
+
+    def size(self) -> Optional[int]:
+        """Get number of tracked buckets."""
+        return len(self._buckets)
+
+
+class StoreRateLimitBackend:
+    """Buckets in a Litestar store shared between workers.
+
+    ``RedisStore`` shares limits between processes and hosts;
+    ``MemoryStore`` is a local stand-in with the same async interface.
+    Read and write are separate calls, so concurrent attempts on one key
+    from different workers may each be allowed; limits stay approximate.
+    """
+
+    def __init__(self, store: "Store", clock: Callable[[], float] = time.time):
+        self.store = store
+        # Wall clock: buckets are shared by every worker using the store
+        self.clock = clock
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        """Apply one attempt, get seconds to wait (zero when allowed)."""
+        now = self.clock()
+        value = await self.store.get(key)
+        stored = TAT_FORMAT.unpack(value)[0] if value else None
+        tat, wait = advance(stored, now, limit)
+        if not wait:
+            # Full again at ``tat``, the store forgets it then
+            expires_in = max(1, math.ceil(tat - now))
+            await self.store.set(key, TAT_FORMAT.pack(tat), expires_in=expires_in)
+        return wait
+
+    def size(self) -> Optional[int]:
+        """Size is managed by the store and not reported."""
+        return None
+
+
+def create_rate_limit_backend(
+    backend: str, max_keys: int, redis_url: str = ""
+) -> RateLimitBackend:
+    """Create bucket storage by name: ``memory`` or ``store``."""
+    if backend == "memory":
+        return MemoryRateLimitBackend(max_keys=max_keys)
+    if backend == "store":
+        if redis_url:
+            from litestar.stores.redis import RedisStore
+
+            return StoreRateLimitBackend(
+                RedisStore.with_client(url=redis_url, namespace="rate_limit")
+            )
+
+        from litestar.stores.memory import MemoryStore
+
+        return StoreRateLimitBackend(MemoryStore())
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+@dataclass(frozen=True)
+class RateLimiterStats:
+    """Rate limiter statistics."""
+
+    enabled: bool
+    buckets: Optional[int]
+    allowed: int
+    rejected: dict[str, int]
+
+
+class RateLimiter:
+    """Attempt limits per rule and key, checked before any expensive work.
+
+    Rules without a limit (or with zero attempts) always allow.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        rules: dict[str, RateLimit],
+        enabled: bool = True,
+    ):
+        self.backend = backend
+        self.rules = {
+            rule: limit for rule, limit in rules.items() if limit.attempts > 0
+        }
+        self.enabled = enabled
+        self.allowed = 0
+        self.rejected = dict.fromkeys(self.rules, 0)
+
+    async def hit(self, rule: str, key: str) -> None:
+        """Count an attempt, raise ``RateLimitExceededError`` if over the limit."""
+        limit = self.rules.get(rule)
+        if not self.enabled or limit is None:
+            return
+        wait = await self.backend.hit(f"{rule}:{key}", limit)
+        if wait:
+            self.rejected[rule] += 1
+            RATE_LIMIT_REJECTIONS.labels(rule).inc()
+            raise RateLimitExceededError(rule, retry_after=math.ceil(wait))
+        self.allowed += 1
+
+    def stats(self) -> RateLimiterStats:
+        """Get rate limiter statistics."""
+        return RateLimiterStats(
+            enabled=self.enabled,
+            buckets=self.backend.size(),
+            allowed=self.allowed,
+            rejected=dict(self.rejected),
+        )
+
+
+# Singleton instance
+rate_limiter = RateLimiter(
+    backend=create_rate_limit_backend(
+        settings.rate_limit_backend,
+        max_keys=settings.rate_limit_max_keys,
+        redis_url=settings.rate_limit_redis_url,
+    ),
+    rules={
+        "login_ip": RateLimit(
+            settings.rate_limit_login_per_ip, settings.rate_limit_period
+        ),
+        "login_username": RateLimit(
+            settings.rate_limit_login_per_username, settings.rate_limit_period
+        ),
+        "register_ip": RateLimit(
+            settings.rate_limit_register_per_ip, settings.rate_limit_period
+        ),
+    },
+    enabled=settings.rate_limit_enabled,
+)
@@ -0,0 +1,32 @@
+import re
+
+# Runs of letters and digits, split like the FTS5 unicode61 tokenizer
+TOKEN = re.compile(r"[^\W_]+")
+
+# Longer queries are cut, every token is one more index lookup
+MAX_TOKENS = 8
+
+# bm25 weights of username, email and full_name
+RANK_WEIGHTS = (10.0, 4.0, 2.0)
+
+
+def search_tokens(query: str) -> list[str]:
+    """Split a search query into FTS tokens, empty if nothing searchable."""
+    return TOKEN.findall(query.casefold())[:MAX_TOKENS]
+
+
+def search_expression(tokens: list[str]) -> str:
+    """FTS5 query: username/email by prefix, full_name by whole tokens.
+
+    The username/email side is a phrase with the last token as prefix,
+    so ``gef3dx@gm`` matches ``gef3dx@gmail.com`` while typing. Tokens
+    only hold letters and digits, so no quoting is needed.
+    """
+    phrase = " ".join(tokens)
+    words = " AND ".join(f'"{token}"' for token in tokens)
+    return f'{{username email}} : "{phrase}"* OR full_name : ({words})'
+
+
+def suggest_expression(tokens: list[str]) -> str:
+    """FTS5 query: username or email starting with the typed text."""
+    return f'{{username email}} : ^"{" ".join(tokens)}"*'
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql import Insert
+
+from app.config.settings import settings
+from app.models.entities.base import utcnow
+from app.models.entities.token_epoch import TokenEpoch
+
+logger = logging.getLogger(__name__)
+
+# Rows committed slightly out of timestamp order are still picked up
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+def bump_epoch_query(user_id: int) -> Insert:
+    """Build upsert advancing the user's epoch, returning the new one."""
+    return (
+        insert(TokenEpoch)
+        .values(user_id=user_id, epoch=1, updated_at=utcnow())
+        .on_conflict_do_update(
+            index_elements=[TokenEpoch.user_id],
+            set_={"epoch": TokenEpoch.epoch + 1, "updated_at": utcnow()},
+        )
+        .returning(TokenEpoch.epoch)
+    )
+
+
+@dataclass(frozen=True)
+class TokenEpochStats:
+    """Token epoch map statistics."""
+
+    loaded: bool
+    users: int
+    revoked: int
+    refreshes: int
+
+
+class TokenEpochs:
+    """Current token epoch per user, kept in memory.
+
+    Tokens carry the epoch they were issued in; revoking bumps the stored
+    epoch, so checking a token is a dictionary lookup. Only users whose
+    tokens were ever revoked are held. Bumps made by this process apply
+    at once, other workers' bumps after the next periodic refresh.
+    """
+
+    def __init__(self, refresh_interval: float = 0):
+        self.refresh_interval = refresh_interval
+        self.revoked = 0
+        self.refreshes = 0
+        self._epochs: dict[int, int] = {}
+        self._since: Optional[datetime] = None
+        self._loaded = False
+        self._task: Optional[asyncio.Task] = None
+
+    def current(self, user_id: int) -> int:
+        """Get epoch new tokens of the user are issued in."""
+        return self._epochs.get(user_id, 0)
+
+    def is_revoked(self, user_id: int, epoch: int) -> bool:
+        """Check whether a token issued in ``epoch`` has been revoked."""
+        if epoch < self._epochs.get(user_id, 0):
+            self.revoked += 1
+            return True
+        return False
+
+    def advance(self, user_id: int, epoch: int) -> None:
+        """Record a stored epoch, epochs never go back."""
+        if epoch > self._epochs.get(user_id, 0):
+            self._epochs[user_id] = epoch
+
+    async def refresh(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        """Load epochs changed since the last refresh (all on the first)."""
+        query = select(TokenEpoch.user_id, TokenEpoch.epoch, TokenEpoch.updated_at)
+        if self._since is not None:
+            query = query.where(TokenEpoch.updated_at >= self._since - REFRESH_OVERLAP)
+        async with session_maker() as session:
+            result = await session.execute(query, bind_arguments={"read_only": True})
+            for user_id, epoch, updated_at in result:
+                self.advance(user_id, epoch)
+                if self._since is None or updated_at > self._since:
+                    self._since = updated_at
+        self._loaded = True
+        self.refreshes += 1
+
+    async def _refresh_loop(self, session_maker: async_sessionmaker[AsyncSession]):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh(session_maker)
+            except Exception:
+                logger.exception("Token epoch refresh failed")
+
+    async def start(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        """Load all epochs, then refresh periodically in the background."""
+        await self.refresh(session_maker)
+        if self.refresh_interval > 0:
+            self._task = asyncio.create_task(self._refresh_loop(session_maker))
+
+    def stop(self) -> None:
+        """Stop background refreshes."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> TokenEpochStats:
+        """Get token epoch map statistics."""
+        return TokenEpochStats(
+            loaded=self._loaded,
+            users=len(self._epochs),
+            revoked=self.revoked,
+            refreshes=self.refreshes,
+        )
+
+
+# Singleton instance
+token_epochs = TokenEpochs(refresh_interval=settings.token_epoch_refresh_interval)
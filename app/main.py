@@ -1,22 +1,108 @@
-from litestar import Litestar
+import asyncio
+import logging
+import os
+import time
+
+from litestar import Litestar, Request, Response
 from litestar.config.cors import CORSConfig
 from litestar.logging import LoggingConfig
+from litestar.status_codes import (
+    HTTP_429_TOO_MANY_REQUESTS,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
 
 from app.config.settings import settings
 from app.controllers.auth import AuthController
 from app.controllers.user import UserController
+from app.core.auth import auth_manager
+from app.core.autocomplete import user_autocomplete
+from app.core.bloom import user_filter
 from app.core.database import database_manager
-from app.core.dependencies import dependencies
+from app.core.dependencies import dependencies, password_rehasher
+from app.core.hashing import (
+    CALIBRATED_ROUNDS_ENV,
+    PasswordHasherBusyError,
+    calibrate_bcrypt,
+    password_hasher,
+)
+from app.core.middleware import auth_middleware
+from app.core.profiling import profiling_middleware
+from app.core.rate_limit import RateLimitExceededError
+from app.core.token_epochs import token_epochs
+from app.repositories.user.implementation import warm_up_statements
+
+logger = logging.getLogger(__name__)
 
 
 async def on_startup() -> None:
     """Application startup event."""
-    await database_manager.create_all()
+    started = time.perf_counter()
+    if settings.bcrypt_calibrate:
+        # Calibrated once by "python -m app" for all workers, else here
+        rounds = os.environ.get(CALIBRATED_ROUNDS_ENV)
+        if rounds is None:
+            calibration = await asyncio.to_thread(
+                calibrate_bcrypt,
+                settings.bcrypt_target_ms,
+                settings.bcrypt_min_rounds,
+                settings.bcrypt_max_rounds,
+            )
+            rounds = calibration.rounds
+        auth_manager.set_bcrypt_rounds(int(rounds))
+    created = await database_manager.ensure_schema()
+    if settings.db_warm_up:
+        await database_manager.warm_up(warm_up_statements())
+    database_manager.start_maintenance()
+    # Loaded before serving, revocation checks depend on it
+    await token_epochs.start(database_manager.async_session_maker)
+    if settings.user_filter_enabled:
+        user_filter.start(database_manager.async_session_maker)
+    if settings.user_autocomplete_enabled:
+        user_autocomplete.start(database_manager.async_session_maker)
+    logger.info(
+        "Startup in %.1f ms (schema %s, pool warm-up %s, bcrypt %d rounds)",
+        (time.perf_counter() - started) * 1000,
+        "created" if created else "current",
+        "on" if settings.db_warm_up else "off",
+        auth_manager.bcrypt_rounds,
+    )
 
 
 async def on_shutdown() -> None:
     """Application shutdown event."""
+    user_filter.stop()
+    user_autocomplete.stop()
+    token_epochs.stop()
+    password_rehasher.stop()
     await database_manager.close()
+    password_hasher.shutdown()
+    if settings.metrics_enabled and "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        # Drop this worker's live gauges from the aggregated view
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def password_hasher_busy_handler(
+    request: Request, exc: PasswordHasherBusyError
+) -> Response:
+    """Reject request when password hashing queue is full."""
+    return Response(
+        content={"status_code": HTTP_503_SERVICE_UNAVAILABLE, "detail": str(exc)},
+        status_code=HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def rate_limit_exceeded_handler(
+    request: Request, exc: RateLimitExceededError
+) -> Response:
+    """Reject attempt over the limit."""
+    return Response(
+        content={"status_code": HTTP_429_TOO_MANY_REQUESTS, "detail": str(exc)},
+        status_code=HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 
 def create_app() -> Litestar:
@@ -41,11 +127,32 @@ def create_app() -> Litestar:
     # Define dependencies correctly
     dependencies_config = dependencies
 
+    route_handlers = [AuthController, UserController]
+    middleware = [auth_middleware]
+    if settings.profiling_enabled:
+        # Outside authentication so its lookups are part of the profile
+        middleware.insert(0, profiling_middleware)
+    if settings.metrics_enabled:
+        from litestar.plugins.prometheus import PrometheusConfig, PrometheusController
+
+        # Per-route latency and status counts, served with the DB/auth
+        # metrics from app.core.metrics at /metrics
+        prometheus_config = PrometheusConfig(
+            app_name="api", prefix="http", group_path=True, exclude=["/metrics"]
+        )
+        route_handlers.append(PrometheusController)
+        middleware.insert(0, prometheus_config.middleware)
+
     return Litestar(
-        route_handlers=[AuthController, UserController],
+        route_handlers=route_handlers,
         dependencies=dependencies_config,
+        middleware=middleware,
         cors_config=cors_config,
         logging_config=logging_config,
+        exception_handlers={
+            PasswordHasherBusyError: password_hasher_busy_handler,
+            RateLimitExceededError: rate_limit_exceeded_handler,
+        },
         on_startup=[on_startup],
         on_shutdown=[on_shutdown],
         debug=settings.debug,
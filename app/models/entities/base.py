@@ -1,6 +1,13 @@
+from datetime import datetime, timezone
+
 from sqlalchemy.orm import DeclarativeBase
 
 
+def utcnow() -> datetime:
+    """Get naive UTC timestamp with microseconds, as SQLite stores it."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Base(DeclarativeBase):
     """Base model class."""
 
@@ -0,0 +1,25 @@
+import datetime
+
+from sqlalchemy import DateTime, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.entities.base import Base, utcnow
+
+
+class TokenEpoch(Base):
+    """Token epoch of a user, tokens issued for an older epoch are revoked.
+
+    Users whose tokens were never revoked have no row and epoch 0. Rows
+    outlive their user, so tokens of a deleted user stay revoked.
+    """
+
+    __tablename__ = "token_epochs"
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    epoch: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Workers poll for rows changed since their last refresh
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, nullable=False, index=True
+    )
@@ -2,15 +2,26 @@ import datetime
 from typing import Optional
 from uuid import uuid4
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Boolean, DateTime, Integer, String, func
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, func
 
-from app.models.entities.base import Base
+from app.models.entities.base import Base, utcnow
+
+
+def created_at_of(context) -> datetime.datetime:
+    """Default ``updated_at`` to the row's ``created_at``."""
+    return context.get_current_parameters()["created_at"]
 
 
 class User(Base):
     """User entity."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination over active users
+        Index("ix_users_is_active_id", "is_active", "id"),
+        # Change feed reads rows after an (updated_at, id) position
+        Index("ix_users_updated_at_id", "updated_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -36,13 +47,20 @@ class User(Base):
 
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
+    # Set in Python with microseconds, CURRENT_TIMESTAMP only has seconds
+    # and updated_at is the version behind ETags; equal on insert, which
+    # tells creations from updates in the change feed
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=utcnow,
+        server_default=func.now(),
+        nullable=False,
     )
 
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=created_at_of,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=utcnow,
         nullable=False,
     )
@@ -0,0 +1,35 @@
+from sqlalchemy import Integer, String, column, table
+
+# FTS5 index over users, an external content table: the text lives in
+# ``users`` only and triggers keep the index in step with every write,
+# including bulk inserts that bypass the ORM.
+users_fts = table(
+    "users_fts",
+    # Hidden column named after the table, the left side of MATCH
+    column("users_fts", String),
+    column("rowid", Integer),
+    column("username", String),
+    column("email", String),
+    column("full_name", String),
+)
+
+# Not known to SQLAlchemy metadata, created alongside it on SQLite
+USERS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5("
+    "username, email, full_name, content='users', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS users_fts_insert AFTER INSERT ON users BEGIN "
+    "INSERT INTO users_fts(rowid, username, email, full_name) "
+    "VALUES (new.id, new.username, new.email, new.full_name); END",
+    "CREATE TRIGGER IF NOT EXISTS users_fts_delete AFTER DELETE ON users BEGIN "
+    "INSERT INTO users_fts(users_fts, rowid, username, email, full_name) "
+    "VALUES ('delete', old.id, old.username, old.email, old.full_name); END",
+    "CREATE TRIGGER IF NOT EXISTS users_fts_update "
+    "AFTER UPDATE OF username, email, full_name ON users BEGIN "
+    "INSERT INTO users_fts(users_fts, rowid, username, email, full_name) "
+    "VALUES ('delete', old.id, old.username, old.email, old.full_name); "
+    "INSERT INTO users_fts(rowid, username, email, full_name) "
+    "VALUES (new.id, new.username, new.email, new.full_name); END",
+    # Index rows that existed before the table; runs only with schema changes
+    "INSERT INTO users_fts(users_fts) VALUES ('rebuild')",
+)
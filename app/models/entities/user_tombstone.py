@@ -0,0 +1,24 @@
+import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.entities.base import Base, utcnow
+
+
+class UserTombstone(Base):
+    """Deleted user, kept so the change feed can report the deletion."""
+
+    __tablename__ = "user_tombstones"
+    __table_args__ = (
+        # Change feed reads deletions after a (deleted_at, id) position
+        Index("ix_user_tombstones_deleted_at_user_id", "deleted_at", "user_id"),
+    )
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    uuid: Mapped[str] = mapped_column(String(36), nullable=False)
+
+    deleted_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, nullable=False
+    )
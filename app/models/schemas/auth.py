@@ -26,6 +26,22 @@ class TokenSchema:
 
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RefreshSchema:
+    """Refresh token schema."""
+
+    refresh_token: str
+
+
+@dataclass(frozen=True)
+class AvailabilitySchema:
+    """Username/email availability schema, unset when not requested."""
+
+    username: Optional[bool] = None
+    email: Optional[bool] = None
 
 
 @dataclass(frozen=True)
@@ -34,6 +50,7 @@ class TokenDataSchema:
 
     username: Optional[str] = None
     user_id: Optional[int] = None
+    epoch: int = 0
 
 
 @dataclass(frozen=True)
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Sequence
 
 from app.models.entities.user import User
 
@@ -24,9 +24,9 @@ class UserUpdateSchema:
     is_active: Optional[bool] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UserResponseSchema:
-    """User response schema."""
+    """User response schema, fields follow ``PUBLIC_COLUMNS`` order."""
 
     id: int
     uuid: str
@@ -50,3 +50,73 @@ class UserResponseSchema:
             created_at=user.created_at,
             updated_at=user.updated_at,
         )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "UserResponseSchema":
+        """Create schema from a ``PUBLIC_COLUMNS`` row."""
+        return cls(*row)
+
+
+@dataclass(frozen=True)
+class BulkUserResultSchema:
+    """Bulk import result for one input row."""
+
+    index: int
+    status: str
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class BulkImportResponseSchema:
+    """Bulk import report."""
+
+    created: int
+    failed: int
+    results: List[BulkUserResultSchema]
+
+
+@dataclass(frozen=True)
+class UserBatchItemSchema:
+    """Batch lookup result for one requested key."""
+
+    key: str
+    found: bool
+    user: Optional[UserResponseSchema] = None
+
+
+@dataclass(frozen=True, slots=True)
+class UserSuggestionSchema:
+    """Autocomplete suggestion."""
+
+    id: int
+    username: str
+    email: str
+
+
+@dataclass(frozen=True, slots=True)
+class UserChangeSchema:
+    """Change feed entry: ``created``, ``updated`` or ``deleted``.
+
+    Carries the current state of the user, not a diff; ``user`` is None
+    for deletions.
+    """
+
+    op: str
+    id: int
+    uuid: str
+    changed_at: datetime
+    user: Optional[UserResponseSchema] = None
+
+    @classmethod
+    def upserted(cls, user: UserResponseSchema) -> "UserChangeSchema":
+        """Create entry for a created or updated user."""
+        op = "created" if user.created_at == user.updated_at else "updated"
+        return cls(op, user.id, user.uuid, user.updated_at, user)
+
+    @classmethod
+    def deleted(
+        cls, user_id: int, uuid: str, deleted_at: datetime
+    ) -> "UserChangeSchema":
+        """Create deletion entry."""
+        return cls("deleted", user_id, uuid, deleted_at)
@@ -19,8 +19,10 @@ class BaseRepositoryProtocol(Protocol):
         """Get entity by UUID."""
         ...
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[User]:
-        """Get all entities."""
+    async def get_all(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[User]:
+        """Get all entities, after ``after_id`` if given (keyset) else from ``skip``."""
         ...
 
     async def update(self, entity_id: int, **kwargs) -> Optional[User]:
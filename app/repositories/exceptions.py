@@ -0,0 +1,25 @@
+from typing import Any, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+
+class DuplicateUserError(Exception):
+    """Unique constraint violation on a user column."""
+
+    def __init__(self, field: str, value: Any):
+        super().__init__(f"User with {field} '{value}' already exists")
+        self.field = field
+        self.value = value
+
+
+def map_integrity_error(
+    error: IntegrityError, values: dict[str, Any]
+) -> Optional[DuplicateUserError]:
+    """Map SQLite ``UNIQUE constraint failed: users.<column>`` to a user error."""
+    message = str(error.orig)
+    if "UNIQUE" not in message:
+        return None
+    for field in ("username", "email", "uuid"):
+        if f"users.{field}" in message:
+            return DuplicateUserError(field, values.get(field))
+    return None
@@ -0,0 +1,338 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import AsyncIterator, Collection, List, Optional, Sequence
+
+import msgspec
+from sqlalchemy import Row
+
+from app.config.settings import settings
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.metrics import (
+    USER_CACHE_EVICTIONS,
+    USER_CACHE_INVALIDATIONS,
+    USER_CACHE_LOOKUPS,
+)
+from app.models.entities.user import User
+from app.repositories.user.protocol import UserRepositoryProtocol
+
+# Lookup columns, every cached entry is reachable under each of them
+KEY_FIELDS = ("id", "uuid", "username", "email")
+
+USER_CACHE_HITS = USER_CACHE_LOOKUPS.labels("hit")
+USER_CACHE_MISSES = USER_CACHE_LOOKUPS.labels("miss")
+
+
+@dataclass(frozen=True)
+class UserCacheEntry:
+    """Cached user columns."""
+
+    id: int
+    uuid: str
+    username: str
+    email: str
+    password_hash: str
+    full_name: Optional[str]
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_entity(cls, user: User) -> "UserCacheEntry":
+        """Create entry from entity."""
+        return cls(
+            id=user.id,
+            uuid=user.uuid,
+            username=user.username,
+            email=user.email,
+            password_hash=user.password_hash,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    def to_entity(self) -> User:
+        """Create detached entity from entry."""
+        return User(**asdict(self))
+
+
+@dataclass(frozen=True)
+class UserCacheStats:
+    """User cache statistics."""
+
+    backend: str
+    entries: Optional[int]
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+
+def cache_key(field: str, value: object) -> str:
+    """Get cache key for a lookup column value."""
+    return f"user:{field}:{value}"
+
+
+class UserCache:
+    """User entries indexed by id, uuid, username and email.
+
+    The entry is stored once under its id; the other keys map to the id
+    and are checked against the entry on read, so a stale alias left
+    behind by a rename is a miss rather than a wrong user.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Backend evictions already counted in the metric
+        self._evictions = 0
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder(UserCacheEntry)
+
+    async def get(self, field: str, value: object) -> Optional[User]:
+        """Get cached user by lookup column."""
+        key = cache_key(field, value)
+        if field == "id":
+            data = await self.backend.get(key)
+        else:
+            entity_id = await self.backend.get(key)
+            data = entity_id and await self.backend.get(cache_key("id", int(entity_id)))
+
+        if data is not None:
+            entry = self._decoder.decode(data)
+            if getattr(entry, field) == value:
+                self.hits += 1
+                USER_CACHE_HITS.inc()
+                return entry.to_entity()
+            await self.backend.delete_many([key])
+
+        self.misses += 1
+        USER_CACHE_MISSES.inc()
+        return None
+
+    async def set(self, user: User, version: int) -> None:
+        """Cache user unless an invalidation happened since ``version``."""
+        if version != self.version:
+            return
+        entry = UserCacheEntry.from_entity(user)
+        entity_id = str(entry.id).encode()
+        await self.backend.set(cache_key("id", entry.id), self._encoder.encode(entry))
+        for field in KEY_FIELDS[1:]:
+            await self.backend.set(cache_key(field, getattr(entry, field)), entity_id)
+
+        evictions = self.backend.stats().evictions
+        if evictions > self._evictions:
+            USER_CACHE_EVICTIONS.inc(evictions - self._evictions)
+            self._evictions = evictions
+
+    async def invalidate(self, entity_id: int, *users: Optional[User]) -> None:
+        """Drop entry and the aliases of its known old and new versions."""
+        self.version += 1
+        self.invalidations += 1
+        USER_CACHE_INVALIDATIONS.inc()
+        key = cache_key("id", entity_id)
+        keys = [key]
+        data = await self.backend.get(key)
+        if data is not None:
+            users = (*users, self._decoder.decode(data))
+        for user in users:
+            if user is not None:
+                keys.extend(
+                    cache_key(field, getattr(user, field)) for field in KEY_FIELDS[1:]
+                )
+        await self.backend.delete_many(keys)
+
+    def stats(self) -> UserCacheStats:
+        """Get cache statistics."""
+        backend = self.backend.stats()
+        return UserCacheStats(
+            backend=backend.backend,
+            entries=backend.entries,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=backend.evictions,
+            invalidations=self.invalidations,
+        )
+
+
+class CachedUserRepository(UserRepositoryProtocol):
+    """Read-through cache in front of a user repository.
+
+    Single-user lookups are served from the cache; writes go to the
+    wrapped repository and then invalidate the user's entry. Other
+    workers see changes after the cache TTL unless the backend is
+    shared between them.
+    """
+
+    def __init__(self, repository: UserRepositoryProtocol, cache: UserCache):
+        self.repository = repository
+        self.cache = cache
+
+    async def _get(self, field: str, value: object, load) -> Optional[User]:
+        user = await self.cache.get(field, value)
+        if user is not None:
+            return user
+
+        version = self.cache.version
+        user = await load(value)
+        if user is not None:
+            await self.cache.set(user, version)
+        return user
+
+    async def create(self, **kwargs) -> User:
+        """Create new user."""
+        return await self.repository.create(**kwargs)
+
+    async def get_by_id(self, entity_id: int) -> Optional[User]:
+        """Get user by ID."""
+        return await self._get("id", entity_id, self.repository.get_by_id)
+
+    async def get_by_uuid(self, entity_uuid: str) -> Optional[User]:
+        """Get user by UUID."""
+        return await self._get("uuid", entity_uuid, self.repository.get_by_uuid)
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        """Get user by username."""
+        return await self._get("username", username, self.repository.get_by_username)
+
+    async def get_credentials(self, username: str) -> Optional[User]:
+        """Get user by username from the database.
+
+        A cached entry's password hash and active flag can be stale for
+        up to the TTL after another worker changed them; logging in with
+        them would let a deactivated user or an old password through.
+        """
+        return await self.repository.get_credentials(username)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Get user by email."""
+        return await self._get("email", email, self.repository.get_by_email)
+
+    async def get_version(
+        self, field: str, value: object
+    ) -> Optional[tuple[int, datetime]]:
+        """Get ``(id, updated_at)``, from the cached entry when present."""
+        user = await self.cache.get(field, value)
+        if user is not None:
+            return user.id, user.updated_at
+        return await self.repository.get_version(field, value)
+
+    async def get_by_ids(self, ids: Collection[int]) -> List[User]:
+        """Get users by IDs."""
+        return await self.repository.get_by_ids(ids)
+
+    async def get_by_uuids(self, uuids: Collection[str]) -> List[User]:
+        """Get users by UUIDs."""
+        return await self.repository.get_by_uuids(uuids)
+
+    async def get_by_usernames(self, usernames: Collection[str]) -> List[User]:
+        """Get users by usernames."""
+        return await self.repository.get_by_usernames(usernames)
+
+    async def get_all(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[User]:
+        """Get all users."""
+        return await self.repository.get_all(skip, limit, after_id)
+
+    async def get_active_users(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[User]:
+        """Get active users."""
+        return await self.repository.get_active_users(skip, limit, after_id)
+
+    async def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        active_only: bool = False,
+    ) -> Sequence[Row]:
+        """Get page of public user columns as rows."""
+        return await self.repository.get_page(skip, limit, after_id, active_only)
+
+    async def update(self, entity_id: int, **kwargs) -> Optional[User]:
+        """Update user and invalidate its cache entry."""
+        user = None
+        try:
+            user = await self.repository.update(entity_id, **kwargs)
+            return user
+        finally:
+            # Also on failure, the outcome of a failed commit is unknown
+            await self.cache.invalidate(entity_id, user)
+
+    async def delete(self, entity_id: int) -> bool:
+        """Delete user and invalidate its cache entry."""
+        try:
+            return await self.repository.delete(entity_id)
+        finally:
+            await self.cache.invalidate(entity_id)
+
+    async def rehash_password(
+        self, entity_id: int, old_hash: str, new_hash: str
+    ) -> bool:
+        """Replace password hash and invalidate the cached entry."""
+        try:
+            return await self.repository.rehash_password(entity_id, old_hash, new_hash)
+        finally:
+            await self.cache.invalidate(entity_id)
+
+    async def search(
+        self,
+        tokens: List[str],
+        limit: int = 20,
+        after: Optional[tuple[float, int]] = None,
+        active_only: bool = False,
+    ) -> Sequence[Row]:
+        """Search users, results are not cached."""
+        return await self.repository.search(tokens, limit, after, active_only)
+
+    async def suggest(self, tokens: List[str], limit: int = 10) -> Sequence[Row]:
+        """Suggest users, results are not cached."""
+        return await self.repository.suggest(tokens, limit)
+
+    async def get_updated_since(
+        self,
+        after: Optional[tuple[datetime, int]],
+        until: datetime,
+        limit: int = 100,
+    ) -> Sequence[Row]:
+        """Get users changed after a position, not cached."""
+        return await self.repository.get_updated_since(after, until, limit)
+
+    async def get_deleted_since(
+        self,
+        after: Optional[tuple[datetime, int]],
+        until: datetime,
+        limit: int = 100,
+    ) -> Sequence[Row]:
+        """Get users deleted after a position, not cached."""
+        return await self.repository.get_deleted_since(after, until, limit)
+
+    def stream_all(self, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """Stream public user columns in batches."""
+        return self.repository.stream_all(batch_size)
+
+    async def find_existing(
+        self, usernames: Collection[str], emails: Collection[str]
+    ) -> tuple[set[str], set[str]]:
+        """Get which of the usernames and emails are already taken."""
+        return await self.repository.find_existing(usernames, emails)
+
+    async def create_many(self, rows: List[dict]) -> List[int]:
+        """Create users in bulk, return IDs in input order."""
+        return await self.repository.create_many(rows)
+
+
+# Singleton instance
+user_cache = UserCache(
+    create_cache_backend(
+        settings.user_cache_backend,
+        maxsize=settings.user_cache_size,
+        ttl=settings.user_cache_ttl,
+        redis_url=settings.user_cache_redis_url,
+    )
+)
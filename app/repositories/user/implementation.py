@@ -1,74 +1,466 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Collection, List, Optional, Sequence, TypeVar
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import (
+    Row,
+    Select,
+    and_,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import Insert
 
+from app.core.autocomplete import user_autocomplete
+from app.core.batching import WriteBatcher, WriteOperation
+from app.core.bloom import user_filter
+from app.core.metrics import instrument_repository
+from app.core.cache import principal_cache
+from app.core.changes import change_hub
+from app.core.search import RANK_WEIGHTS, search_expression, suggest_expression
+from app.core.token_epochs import bump_epoch_query, token_epochs
+from app.models.entities.base import utcnow
 from app.models.entities.user import User
+from app.models.entities.user_search import users_fts
+from app.models.entities.user_tombstone import UserTombstone
+from app.repositories.exceptions import map_integrity_error
+from app.repositories.user.loader import BatchLoader
 from app.repositories.user.protocol import UserRepositoryProtocol
 
+T = TypeVar("T")
 
+# Route SELECTs to the reader pool
+READ_ONLY = {"read_only": True}
+
+# Values per IN (...) query, well below SQLite's bound parameter limit
+IN_CHUNK_SIZE = 500
+
+# Columns exposed by the API, without password_hash
+PUBLIC_COLUMNS = (
+    User.id,
+    User.uuid,
+    User.username,
+    User.email,
+    User.full_name,
+    User.is_active,
+    User.created_at,
+    User.updated_at,
+)
+
+# Columns a single-user version lookup can filter on
+VERSION_LOOKUPS = {"id": User.id, "uuid": User.uuid, "username": User.username}
+
+
+def paginate(
+    query: Select, skip: int, limit: int, after_id: Optional[int] = None
+) -> Select:
+    """Order by ID and page by keyset when ``after_id`` is given, else by offset."""
+    query = query.order_by(User.id).limit(limit)
+    if after_id is not None:
+        return query.where(User.id > after_id)
+    return query.offset(skip)
+
+
+# bm25 of the current full-text match, lower is better
+FTS_RANK = func.bm25(literal_column("users_fts"), *RANK_WEIGHTS)
+
+
+def match_users(expression: str, *columns) -> Select:
+    """Select columns of users matching an FTS5 expression, best first."""
+    return (
+        select(*columns)
+        .select_from(users_fts)
+        .join(User, User.id == users_fts.c.rowid)
+        .where(users_fts.c.users_fts.op("MATCH")(expression))
+        .order_by(FTS_RANK, User.id)
+    )
+
+
+def tombstone_query(user_id: int, uuid: str) -> Insert:
+    """Build upsert recording the user's deletion, returning its time."""
+    deleted_at = utcnow()
+    return (
+        sqlite_insert(UserTombstone)
+        .values(user_id=user_id, uuid=uuid, deleted_at=deleted_at)
+        .on_conflict_do_update(
+            index_elements=[UserTombstone.user_id],
+            set_={"uuid": uuid, "deleted_at": deleted_at},
+        )
+        .returning(UserTombstone.deleted_at)
+    )
+
+
+def warm_up_statements() -> List[Select]:
+    """Hot read queries of the repository, with placeholder values."""
+    return [
+        select(User).where(User.id.in_([0])),
+        select(User).where(User.uuid == ""),
+        select(User).where(User.username == ""),
+        select(User).where(User.email == ""),
+        *(
+            select(User.id, User.updated_at).where(column == value)
+            for column, value in zip(VERSION_LOOKUPS.values(), (0, "", ""))
+        ),
+        paginate(select(*PUBLIC_COLUMNS), 0, 100),
+        paginate(select(*PUBLIC_COLUMNS), 0, 100, after_id=0),
+    ]
+
+
+@instrument_repository
 class UserRepository(UserRepositoryProtocol):
     """User repository implementation."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self, session: AsyncSession, write_batcher: Optional[WriteBatcher] = None
+    ):
         self.session = session
+        self.write_batcher = write_batcher
+        self._id_loader = BatchLoader(self._fetch_by_ids)
+
+    async def _write(self, operation: WriteOperation[T], values: dict) -> T:
+        """Run write in its own transaction (or batch) and commit it.
+
+        Unique violations surface as ``DuplicateUserError``; the unique
+        indexes are the only uniqueness check, there is no pre-SELECT.
+        """
+        try:
+            if self.write_batcher is not None:
+                return await self.write_batcher.submit(operation)
+            result = await operation(self.session)
+            await self.session.commit()
+            return result
+        except IntegrityError as e:
+            if self.write_batcher is None:
+                await self.session.rollback()
+            if duplicate := map_integrity_error(e, values):
+                raise duplicate from e
+            raise
 
     async def create(self, **kwargs) -> User:
-        """Create new user."""
-        user = User(**kwargs)
-        self.session.add(user)
-        await self.session.commit()
-        await self.session.refresh(user)
+        """Create new user with a single INSERT ... RETURNING."""
+
+        async def operation(session: AsyncSession) -> User:
+            return await session.scalar(insert(User).values(**kwargs).returning(User))
+
+        user = await self._write(operation, kwargs)
+        user_filter.add(user.username, user.email)
+        user_autocomplete.add(user.id, user.username, user.email)
+        change_hub.publish_user(user)
         return user
 
     async def get_by_id(self, entity_id: int) -> Optional[User]:
-        """Get user by ID."""
-        query = select(User).where(User.id == entity_id)
-        result = await self.session.execute(query)
-        return result.scalar_one_or_none()
+        """Get user by ID, concurrent calls share one query."""
+        return await self._id_loader.load(entity_id)
+
+    async def _fetch_by_ids(self, ids: List[int]) -> List[tuple[int, User]]:
+        return [(user.id, user) for user in await self.get_by_ids(ids)]
+
+    async def _get_many(
+        self, column: InstrumentedAttribute, values: Collection
+    ) -> List[User]:
+        values = list(dict.fromkeys(values))
+        users: List[User] = []
+        for start in range(0, len(values), IN_CHUNK_SIZE):
+            query = select(User).where(
+                column.in_(values[start : start + IN_CHUNK_SIZE])
+            )
+            result = await self.session.execute(query, bind_arguments=READ_ONLY)
+            users.extend(result.scalars())
+        return users
+
+    async def get_by_ids(self, ids: Collection[int]) -> List[User]:
+        """Get users by IDs, in no particular order."""
+        return await self._get_many(User.id, ids)
+
+    async def get_by_uuids(self, uuids: Collection[str]) -> List[User]:
+        """Get users by UUIDs, in no particular order."""
+        return await self._get_many(User.uuid, uuids)
+
+    async def get_by_usernames(self, usernames: Collection[str]) -> List[User]:
+        """Get users by usernames, in no particular order."""
+        return await self._get_many(User.username, usernames)
 
     async def get_by_uuid(self, entity_uuid: str) -> Optional[User]:
         """Get user by UUID."""
         query = select(User).where(User.uuid == entity_uuid)
-        result = await self.session.execute(query)
+        result = await self.session.execute(query, bind_arguments=READ_ONLY)
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[User]:
+    async def get_all(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[User]:
         """Get all users."""
-        query = select(User).offset(skip).limit(limit)
-        result = await self.session.execute(query)
+        query = paginate(select(User), skip, limit, after_id)
+        result = await self.session.execute(query, bind_arguments=READ_ONLY)
         return list(result.scalars().all())
 
     async def update(self, entity_id: int, **kwargs) -> Optional[User]:
-        """Update user."""
+        """Update user with a single UPDATE ... RETURNING.
+
+        Deactivation and password changes revoke the user's tokens in the
+        same transaction.
+        """
         query = (
             update(User).where(User.id == entity_id).values(**kwargs).returning(User)
         )
-        result = await self.session.execute(query)
-        await self.session.commit()
-        return result.scalar_one_or_none()
+        revoke = kwargs.get("is_active") is False or "password_hash" in kwargs
+
+        async def operation(
+            session: AsyncSession,
+        ) -> tuple[Optional[User], Optional[int]]:
+            result = await session.execute(query)
+            user = result.scalar_one_or_none()
+            epoch = None
+            if user is not None and revoke:
+                epoch = await session.scalar(bump_epoch_query(entity_id))
+            return user, epoch
+
+        user, epoch = await self._write(operation, kwargs)
+        principal_cache.delete(entity_id)
+        if epoch is not None:
+            token_epochs.advance(entity_id, epoch)
+        user_filter.add(kwargs.get("username"), kwargs.get("email"))
+        if user is not None and ("username" in kwargs or "email" in kwargs):
+            user_autocomplete.update(user.id, user.username, user.email)
+        if user is not None:
+            change_hub.publish_user(user)
+        return user
 
     async def delete(self, entity_id: int) -> bool:
-        """Delete user."""
-        query = delete(User).where(User.id == entity_id)
-        result = await self.session.execute(query)
-        await self.session.commit()
-        return result.rowcount > 0
+        """Delete user, its tokens revoked in the same transaction.
+
+        A tombstone is left for the change feed.
+        """
+        query = delete(User).where(User.id == entity_id).returning(User.uuid)
+
+        async def operation(
+            session: AsyncSession,
+        ) -> Optional[tuple[str, datetime, int]]:
+            uuid = await session.scalar(query)
+            if uuid is None:
+                return None
+            deleted_at = await session.scalar(tombstone_query(entity_id, uuid))
+            epoch = await session.scalar(bump_epoch_query(entity_id))
+            return uuid, deleted_at, epoch
+
+        deleted = await self._write(operation, {})
+        principal_cache.delete(entity_id)
+        if deleted is None:
+            return False
+        uuid, deleted_at, epoch = deleted
+        token_epochs.advance(entity_id, epoch)
+        user_autocomplete.remove(entity_id)
+        change_hub.publish_deleted(entity_id, uuid, deleted_at)
+        return True
+
+    async def rehash_password(
+        self, entity_id: int, old_hash: str, new_hash: str
+    ) -> bool:
+        """Replace password hash if unchanged, keeping tokens and version.
+
+        Same password with another cost: no token revocation, and
+        ``updated_at`` (the ETag version) is kept.
+        """
+        query = (
+            update(User)
+            .where(User.id == entity_id, User.password_hash == old_hash)
+            .values(password_hash=new_hash, updated_at=User.updated_at)
+        )
+
+        async def operation(session: AsyncSession) -> int:
+            result = await session.execute(query)
+            return result.rowcount
+
+        return await self._write(operation, {}) > 0
+
+    async def get_version(
+        self, field: str, value: object
+    ) -> Optional[tuple[int, datetime]]:
+        """Get ``(id, updated_at)`` by id, uuid or username without the entity."""
+        column = VERSION_LOOKUPS[field]
+        query = select(User.id, User.updated_at).where(column == value)
+        result = await self.session.execute(query, bind_arguments=READ_ONLY)
+        return result.tuples().one_or_none()
 
     async def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
         query = select(User).where(User.username == username)
-        result = await self.session.execute(query)
+        result = await self.session.execute(query, bind_arguments=READ_ONLY)
         return result.scalar_one_or_none()
 
+    async def get_credentials(self, username: str) -> Optional[User]:
+        """Get user by username for authentication."""
+        return await self.get_by_username(username)
+
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
         query = select(User).where(User.email == email)
-        result = await self.session.execute(query)
+        result = await self.session.execute(query, bind_arguments=READ_ONLY)
         return result.scalar_one_or_none()
 
-    async def get_active_users(self, skip: int = 0, limit: int = 100) -> List[User]:
+    async def get_active_users(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[User]:
         """Get active users."""
-        query = select(User).where(User.is_active == True).offset(skip).limit(limit)
-        result = await self.session.execute(query)
+        query = paginate(
+            select(User).where(User.is_active == True), skip, limit, after_id
+        )
+        result = await self.session.execute(query, bind_arguments=READ_ONLY)
         return list(result.scalars().all())
+
+    async def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        active_only: bool = False,
+    ) -> Sequence[Row]:
+        """Get page of public user columns as rows, without ORM entities."""
+        query = select(*PUBLIC_COLUMNS)
+        if active_only:
+            query = query.where(User.is_active == True)
+        query = paginate(query, skip, limit, after_id)
+        result = await self.session.execute(query, bind_arguments=READ_ONLY)
+        return result.all()
+
+    async def search(
+        self,
+        tokens: List[str],
+        limit: int = 20,
+        after: Optional[tuple[float, int]] = None,
+        active_only: bool = False,
+    ) -> Sequence[Row]:
+        """Get public user columns plus bm25 rank of full-text matches.
+
+        Pages by keyset on ``(rank, id)``; the whole match set is ranked
+        for every page, so short queries over many users cost the most.
+        """
+        query = match_users(search_expression(tokens), *PUBLIC_COLUMNS, FTS_RANK).limit(
+            limit
+        )
+        if active_only:
+            query = query.where(User.is_active == True)
+        if after is not None:
+            rank, last_id = after
+            query = query.where(
+                or_(FTS_RANK > rank, and_(FTS_RANK == rank, User.id > last_id))
+            )
+        result = await self.session.execute(query, bind_arguments=READ_ONLY)
+        return result.all()
+
+    async def suggest(self, tokens: List[str], limit: int = 10) -> Sequence[Row]:
+        """Get ``(id, username, email)`` of users starting with tokens, best first."""
+        query = match_users(
+            suggest_expression(tokens), User.id, User.username, User.email
+        ).limit(limit)
+        result = await self.session.execute(query, bind_arguments=READ_ONLY)
+        return result.all()
+
+    async def get_updated_since(
+        self,
+        after: Optional[tuple[datetime, int]],
+        until: datetime,
+        limit: int = 100,
+    ) -> Sequence[Row]:
+        """Get public columns of users changed after a position, oldest first.
+
+        ``after`` is an ``(updated_at, id)`` position, ``until`` the
+        latest ``updated_at`` to include.
+        """
+        query = (
+            select(*PUBLIC_COLUMNS)
+            .where(User.updated_at <= until)
+            .order_by(User.updated_at, User.id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(tuple_(User.updated_at, User.id) > tuple_(*after))
+        result = await self.session.execute(query, bind_arguments=READ_ONLY)
+        return result.all()
+
+    async def get_deleted_since(
+        self,
+        after: Optional[tuple[datetime, int]],
+        until: datetime,
+        limit: int = 100,
+    ) -> Sequence[Row]:
+        """Get ``(id, uuid, deleted_at)`` of users deleted after a position."""
+        query = (
+            select(UserTombstone.user_id, UserTombstone.uuid, UserTombstone.deleted_at)
+            .where(UserTombstone.deleted_at <= until)
+            .order_by(UserTombstone.deleted_at, UserTombstone.user_id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(
+                tuple_(UserTombstone.deleted_at, UserTombstone.user_id) > tuple_(*after)
+            )
+        result = await self.session.execute(query, bind_arguments=READ_ONLY)
+        return result.all()
+
+    async def stream_all(self, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """Stream public user columns in batches with a server-side cursor."""
+        query = (
+            select(*PUBLIC_COLUMNS)
+            .order_by(User.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(query, bind_arguments=READ_ONLY)
+        async for rows in result.partitions():
+            yield rows
+
+    async def find_existing(
+        self, usernames: Collection[str], emails: Collection[str]
+    ) -> tuple[set[str], set[str]]:
+        """Get which of the usernames and emails are already taken."""
+        taken_usernames: set[str] = set()
+        taken_emails: set[str] = set()
+        for column, values, taken in (
+            (User.username, list(usernames), taken_usernames),
+            (User.email, list(emails), taken_emails),
+        ):
+            for start in range(0, len(values), IN_CHUNK_SIZE):
+                query = select(column).where(
+                    column.in_(values[start : start + IN_CHUNK_SIZE])
+                )
+                result = await self.session.execute(query, bind_arguments=READ_ONLY)
+                taken.update(result.scalars())
+        return taken_usernames, taken_emails
+
+    async def create_many(self, rows: List[dict]) -> List[int]:
+        """Create users with one executemany, return IDs in input order."""
+        if not rows:
+            return []
+        # RETURNING with guaranteed row order degrades to one statement per
+        # row on SQLite, so IDs are looked up by username inside the same
+        # transaction instead.
+        usernames = [row["username"] for row in rows]
+        try:
+            await self.session.execute(insert(User), rows)
+            ids_by_username = {}
+            for start in range(0, len(usernames), IN_CHUNK_SIZE):
+                query = select(User.username, User.id).where(
+                    User.username.in_(usernames[start : start + IN_CHUNK_SIZE])
+                )
+                ids_by_username.update(
+                    (await self.session.execute(query)).tuples().all()
+                )
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            raise ValueError("Conflicts with a concurrently created user")
+        for row in rows:
+            user_filter.add(row["username"], row["email"])
+            user_autocomplete.add(
+                ids_by_username[row["username"]], row["username"], row["email"]
+            )
+        return [ids_by_username[username] for username in usernames]
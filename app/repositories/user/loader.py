@@ -0,0 +1,48 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """Coalesce concurrent loads issued in one event-loop tick into one fetch.
+
+    ``fetch`` receives the unique keys and returns ``(key, value)`` pairs;
+    keys missing from the result resolve to ``None``.
+    """
+
+    def __init__(self, fetch: Callable[[List[K]], Awaitable[List[tuple[K, V]]]]):
+        self._fetch = fetch
+        self._pending: dict[K, asyncio.Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        """Load value by key."""
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = loop.create_future()
+            self._pending[key] = future
+        return await future
+
+    def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._resolve(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: dict[K, asyncio.Future]) -> None:
+        try:
+            values = dict(await self._fetch(list(batch)))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(values.get(key))
@@ -1,4 +1,15 @@
-from typing import Protocol, runtime_checkable, Optional, List
+from datetime import datetime
+from typing import (
+    AsyncIterator,
+    Collection,
+    Protocol,
+    runtime_checkable,
+    Optional,
+    List,
+    Sequence,
+)
+
+from sqlalchemy import Row
 
 from app.models.entities.user import User
 from app.repositories.base import BaseRepositoryProtocol
@@ -8,14 +19,100 @@ from app.repositories.base import BaseRepositoryProtocol
 class UserRepositoryProtocol(BaseRepositoryProtocol, Protocol):
     """User repository protocol."""
 
+    async def get_by_ids(self, ids: Collection[int]) -> List[User]:
+        """Get users by IDs."""
+        ...
+
+    async def get_by_uuids(self, uuids: Collection[str]) -> List[User]:
+        """Get users by UUIDs."""
+        ...
+
+    async def get_by_usernames(self, usernames: Collection[str]) -> List[User]:
+        """Get users by usernames."""
+        ...
+
+    async def get_version(
+        self, field: str, value: object
+    ) -> Optional[tuple[int, datetime]]:
+        """Get ``(id, updated_at)`` by id, uuid or username."""
+        ...
+
     async def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
         ...
 
+    async def get_credentials(self, username: str) -> Optional[User]:
+        """Get user by username for authentication, never from a cache."""
+        ...
+
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
         ...
 
-    async def get_active_users(self, skip: int = 0, limit: int = 100) -> List[User]:
+    async def get_active_users(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[User]:
         """Get active users."""
         ...
+
+    async def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        active_only: bool = False,
+    ) -> Sequence[Row]:
+        """Get page of public user columns as rows."""
+        ...
+
+    async def search(
+        self,
+        tokens: List[str],
+        limit: int = 20,
+        after: Optional[tuple[float, int]] = None,
+        active_only: bool = False,
+    ) -> Sequence[Row]:
+        """Get ranked public user columns matching tokens, rank last."""
+        ...
+
+    async def suggest(self, tokens: List[str], limit: int = 10) -> Sequence[Row]:
+        """Get ``(id, username, email)`` of users starting with tokens."""
+        ...
+
+    async def get_updated_since(
+        self,
+        after: Optional[tuple[datetime, int]],
+        until: datetime,
+        limit: int = 100,
+    ) -> Sequence[Row]:
+        """Get public columns of users changed after a position, oldest first."""
+        ...
+
+    async def get_deleted_since(
+        self,
+        after: Optional[tuple[datetime, int]],
+        until: datetime,
+        limit: int = 100,
+    ) -> Sequence[Row]:
+        """Get ``(id, uuid, deleted_at)`` of users deleted after a position."""
+        ...
+
+    def stream_all(self, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """Stream public user columns in batches."""
+        ...
+
+    async def find_existing(
+        self, usernames: Collection[str], emails: Collection[str]
+    ) -> tuple[set[str], set[str]]:
+        """Get which of the usernames and emails are already taken."""
+        ...
+
+    async def rehash_password(
+        self, entity_id: int, old_hash: str, new_hash: str
+    ) -> bool:
+        """Replace password hash if unchanged, keeping tokens and version."""
+        ...
+
+    async def create_many(self, rows: List[dict]) -> List[int]:
+        """Create users in bulk, return IDs in input order."""
+        ...
@@ -1,8 +1,15 @@
-from typing import Optional
+from typing import Callable, Optional
 
 from app.core.auth import auth_manager
 from app.models.entities.user import User
-from app.models.schemas.auth import LoginSchema, RegisterSchema, TokenSchema
+from app.core.bloom import user_filter
+from app.models.schemas.auth import (
+    AvailabilitySchema,
+    LoginSchema,
+    RegisterSchema,
+    TokenSchema,
+)
+from app.repositories.exceptions import DuplicateUserError
 from app.repositories.user.protocol import UserRepositoryProtocol
 from app.services.auth.protocol import AuthServiceProtocol
 
@@ -10,52 +17,112 @@ from app.services.auth.protocol import AuthServiceProtocol
 class AuthService(AuthServiceProtocol):
     """Auth service implementation."""
 
-    def __init__(self, user_repository: UserRepositoryProtocol):
+    def __init__(
+        self,
+        user_repository: UserRepositoryProtocol,
+        rehash: Optional[Callable[[int, str, str], None]] = None,
+    ):
         self.user_repository = user_repository
+        # Schedules a stored hash upgrade after the response
+        self.rehash = rehash
 
     async def register(self, data: RegisterSchema) -> User:
         """Register new user."""
-        # Check if user already exists
-        existing_user = await self.user_repository.get_by_username(data.username)
-        if existing_user:
-            raise ValueError(f"User with username '{data.username}' already exists")
-
-        existing_email = await self.user_repository.get_by_email(data.email)
-        if existing_email:
-            raise ValueError(f"User with email '{data.email}' already exists")
+        # Reject likely duplicates before the expensive hash; a filter miss
+        # means the insert is expected to succeed and needs no extra query
+        if user_filter.ready and (
+            user_filter.might_contain_username(data.username)
+            or user_filter.might_contain_email(data.email)
+        ):
+            availability = await self.check_availability(data.username, data.email)
+            if not availability.username:
+                raise ValueError(f"User with username '{data.username}' already exists")
+            if not availability.email:
+                raise ValueError(f"User with email '{data.email}' already exists")
 
         # Hash password
-        hashed_password = auth_manager.get_password_hash(data.password)
-
-        # Create user
-        return await self.user_repository.create(
-            username=data.username,
-            email=data.email,
-            password_hash=hashed_password,
-            full_name=data.full_name,
+        hashed_password = await auth_manager.get_password_hash_async(data.password)
+
+        # Create user, the unique indexes reject existing username/email
+        try:
+            return await self.user_repository.create(
+                username=data.username,
+                email=data.email,
+                password_hash=hashed_password,
+                full_name=data.full_name,
+            )
+        except DuplicateUserError as e:
+            raise ValueError(str(e))
+
+    async def check_availability(
+        self, username: Optional[str] = None, email: Optional[str] = None
+    ) -> AvailabilitySchema:
+        """Check whether username and email are free, filter misses skip the DB."""
+        maybe_username = username is not None and user_filter.might_contain_username(
+            username
+        )
+        maybe_email = email is not None and user_filter.might_contain_email(email)
+        taken_usernames: set[str] = set()
+        taken_emails: set[str] = set()
+        if maybe_username or maybe_email:
+            taken_usernames, taken_emails = await self.user_repository.find_existing(
+                [username] if maybe_username else [],
+                [email] if maybe_email else [],
+            )
+        return AvailabilitySchema(
+            username=None if username is None else username not in taken_usernames,
+            email=None if email is None else email not in taken_emails,
         )
 
     async def login(self, data: LoginSchema) -> TokenSchema:
         """Login user."""
-        # Get user by username
-        user = await self.user_repository.get_by_username(data.username)
+        # Current password hash and active flag, never a cached copy
+        user = await self.user_repository.get_credentials(data.username)
         if not user:
             raise ValueError("Invalid username or password")
 
         # Verify password
-        if not auth_manager.verify_password(data.password, user.password_hash):
+        if not await auth_manager.verify_password_async(
+            data.password, user.password_hash
+        ):
             raise ValueError("Invalid username or password")
 
         # Check if user is active
         if not user.is_active:
             raise ValueError("User account is disabled")
 
-        # Create access token
-        access_token = auth_manager.create_access_token(
-            data={"sub": user.username, "user_id": user.id}
+        # Hash made with another cost: upgrade it off the response path
+        if self.rehash is not None and auth_manager.needs_rehash(user.password_hash):
+            self.rehash(user.id, data.password, user.password_hash)
+
+        # Create access and refresh tokens
+        claims = {"sub": user.username, "user_id": user.id}
+        return TokenSchema(
+            access_token=auth_manager.create_access_token(data=claims),
+            refresh_token=auth_manager.create_refresh_token(data=claims),
         )
 
-        return TokenSchema(access_token=access_token)
+    async def refresh(self, refresh_token: str) -> TokenSchema:
+        """Issue new tokens for a valid refresh token, without a query.
+
+        Deactivation, deletion and password changes revoke refresh tokens
+        through the token epoch, so no user lookup is needed. New tokens
+        keep the refresh token's epoch, not the one this worker knows, so
+        whatever revokes the refresh token revokes them too.
+        """
+        token_data = auth_manager.verify_refresh_token(refresh_token)
+        if not token_data:
+            raise ValueError("Invalid refresh token")
+
+        claims = {
+            "sub": token_data.username,
+            "user_id": token_data.user_id,
+            "ep": token_data.epoch,
+        }
+        return TokenSchema(
+            access_token=auth_manager.create_access_token(data=claims),
+            refresh_token=auth_manager.create_refresh_token(data=claims),
+        )
 
     async def get_current_user(self, token: str) -> Optional[User]:
         """Get current user from token."""
@@ -1,7 +1,12 @@
 from typing import Optional, Protocol, runtime_checkable
 
 from app.models.entities.user import User
-from app.models.schemas.auth import LoginSchema, RegisterSchema, TokenSchema
+from app.models.schemas.auth import (
+    AvailabilitySchema,
+    LoginSchema,
+    RegisterSchema,
+    TokenSchema,
+)
 
 
 @runtime_checkable
@@ -12,10 +17,20 @@ class AuthServiceProtocol(Protocol):
         """Register new user."""
         ...
 
+    async def check_availability(
+        self, username: Optional[str] = None, email: Optional[str] = None
+    ) -> AvailabilitySchema:
+        """Check whether username and email are free."""
+        ...
+
     async def login(self, data: LoginSchema) -> TokenSchema:
         """Login user."""
         ...
 
+    async def refresh(self, refresh_token: str) -> TokenSchema:
+        """Issue new tokens for a refresh token."""
+        ...
+
     async def get_current_user(self, token: str) -> Optional[User]:
         """Get current user from token."""
         ...
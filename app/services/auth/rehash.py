@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import auth_manager
+from app.core.hashing import PasswordHasherBusyError
+from app.core.metrics import PASSWORD_REHASHES
+from app.repositories.user.protocol import UserRepositoryProtocol
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PasswordRehasherStats:
+    """Password rehasher statistics."""
+
+    pending: int
+    updated: int
+    skipped: int
+    failed: int
+
+
+class PasswordRehasher:
+    """Upgrade stored hashes to the current cost after the response.
+
+    The new hash and its write run in a background task with their own
+    session, so the login that found the outdated hash is not delayed.
+    A hash changed in the meantime (a real password change) is left
+    alone; a busy hashing pool skips the upgrade until the next login.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        repository_factory: Callable[[AsyncSession], UserRepositoryProtocol],
+    ):
+        self.session_factory = session_factory
+        self.repository_factory = repository_factory
+        self.updated = 0
+        self.skipped = 0
+        self.failed = 0
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    def schedule(self, user_id: int, password: str, old_hash: str) -> None:
+        """Rehash in the background, at most once at a time per user."""
+        if user_id in self._tasks:
+            return
+        task = asyncio.create_task(self._rehash(user_id, password, old_hash))
+        self._tasks[user_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(user_id, None))
+
+    def _count(self, result: str) -> None:
+        setattr(self, result, getattr(self, result) + 1)
+        PASSWORD_REHASHES.labels(result).inc()
+
+    async def _rehash(self, user_id: int, password: str, old_hash: str) -> None:
+        try:
+            new_hash = await auth_manager.get_password_hash_async(password)
+            async with self.session_factory() as session:
+                updated = await self.repository_factory(session).rehash_password(
+                    user_id, old_hash, new_hash
+                )
+            self._count("updated" if updated else "skipped")
+        except PasswordHasherBusyError:
+            self._count("skipped")
+        except Exception:
+            self._count("failed")
+            logger.exception("Password rehash failed for user %s", user_id)
+
+    def stop(self) -> None:
+        """Cancel pending rehashes, they are retried on the next login."""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
+
+    def stats(self) -> PasswordRehasherStats:
+        """Get rehasher statistics."""
+        return PasswordRehasherStats(
+            pending=len(self._tasks),
+            updated=self.updated,
+            skipped=self.skipped,
+            failed=self.failed,
+        )
@@ -1,11 +1,40 @@
+from datetime import datetime, timedelta
 from typing import List, Optional
 
+from app.config.settings import settings
+from app.core.auth import UNUSABLE_PASSWORD_HASH
+from app.core.autocomplete import user_autocomplete
+from app.core.changes import check_position
+from app.core.search import search_tokens
+from app.models.entities.base import utcnow
 from app.models.entities.user import User
-from app.models.schemas.user import UserCreateSchema, UserUpdateSchema
+from app.repositories.exceptions import DuplicateUserError
+from app.models.schemas.user import (
+    BulkUserResultSchema,
+    UserChangeSchema,
+    UserCreateSchema,
+    UserResponseSchema,
+    UserSuggestionSchema,
+    UserUpdateSchema,
+)
 from app.repositories.user.protocol import UserRepositoryProtocol
 from app.services.user.protocol import UserServiceProtocol
 
 
+def validate_user_fields(data: UserCreateSchema) -> Optional[str]:
+    """Get validation error for column constraints the database does not check."""
+    columns = User.__table__.c
+    for name in ("username", "email", "full_name"):
+        value = getattr(data, name)
+        if value is None and columns[name].nullable:
+            continue
+        if not isinstance(value, str) or not value:
+            return f"Field '{name}' is required"
+        if len(value) > columns[name].type.length:
+            return f"Field '{name}' is longer than {columns[name].type.length}"
+    return None
+
+
 class UserService(UserServiceProtocol):
     """User service implementation."""
 
@@ -14,18 +43,78 @@ class UserService(UserServiceProtocol):
 
     async def create_user(self, data: UserCreateSchema) -> User:
         """Create new user."""
-        # Check if user already exists
-        existing_user = await self.user_repository.get_by_username(data.username)
-        if existing_user:
-            raise ValueError(f"User with username '{data.username}' already exists")
+        try:
+            return await self.user_repository.create(
+                username=data.username,
+                email=data.email,
+                full_name=data.full_name,
+                password_hash=UNUSABLE_PASSWORD_HASH,
+            )
+        except DuplicateUserError as e:
+            raise ValueError(str(e))
 
-        existing_email = await self.user_repository.get_by_email(data.email)
-        if existing_email:
-            raise ValueError(f"User with email '{data.email}' already exists")
+    async def bulk_create_users(
+        self, items: List[UserCreateSchema], chunk_size: int = 1000
+    ) -> List[BulkUserResultSchema]:
+        """Create users in bulk, one result per item in input order.
 
-        return await self.user_repository.create(
-            username=data.username, email=data.email, full_name=data.full_name
-        )
+        Uniqueness is checked per chunk with one IN query per column and
+        survivors are inserted with one multi-row insert.
+        """
+        results: List[Optional[BulkUserResultSchema]] = [None] * len(items)
+
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start : start + chunk_size]
+            taken_usernames, taken_emails = await self.user_repository.find_existing(
+                {item.username for item in chunk if isinstance(item.username, str)},
+                {item.email for item in chunk if isinstance(item.email, str)},
+            )
+
+            rows, row_indexes = [], []
+            for index, item in enumerate(chunk, start):
+                if error := validate_user_fields(item):
+                    results[index] = BulkUserResultSchema(
+                        index, "invalid", detail=error
+                    )
+                elif item.username in taken_usernames:
+                    results[index] = BulkUserResultSchema(
+                        index,
+                        "conflict",
+                        detail=f"User with username '{item.username}' already exists",
+                    )
+                elif item.email in taken_emails:
+                    results[index] = BulkUserResultSchema(
+                        index,
+                        "conflict",
+                        detail=f"User with email '{item.email}' already exists",
+                    )
+                else:
+                    # Later duplicates within the upload conflict with this row
+                    taken_usernames.add(item.username)
+                    taken_emails.add(item.email)
+                    rows.append(
+                        {
+                            "username": item.username,
+                            "email": item.email,
+                            "full_name": item.full_name,
+                            "password_hash": UNUSABLE_PASSWORD_HASH,
+                        }
+                    )
+                    row_indexes.append(index)
+
+            try:
+                ids = await self.user_repository.create_many(rows)
+            except ValueError as e:
+                for index in row_indexes:
+                    results[index] = BulkUserResultSchema(
+                        index, "conflict", detail=str(e)
+                    )
+                continue
+
+            for index, user_id in zip(row_indexes, ids):
+                results[index] = BulkUserResultSchema(index, "created", id=user_id)
+
+        return results
 
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID."""
@@ -39,9 +128,123 @@ class UserService(UserServiceProtocol):
         """Get user by username."""
         return await self.user_repository.get_by_username(username)
 
-    async def get_all_users(self, skip: int = 0, limit: int = 100) -> List[User]:
+    async def get_user_version(
+        self, field: str, value: object
+    ) -> Optional[tuple[int, datetime]]:
+        """Get user ``(id, updated_at)`` by id, uuid or username."""
+        return await self.user_repository.get_version(field, value)
+
+    async def get_users_by_ids(self, ids: List[int]) -> List[Optional[User]]:
+        """Get users by IDs, aligned with input (None if missing)."""
+        users = {user.id: user for user in await self.user_repository.get_by_ids(ids)}
+        return [users.get(user_id) for user_id in ids]
+
+    async def get_users_by_uuids(self, uuids: List[str]) -> List[Optional[User]]:
+        """Get users by UUIDs, aligned with input (None if missing)."""
+        users = {
+            user.uuid: user for user in await self.user_repository.get_by_uuids(uuids)
+        }
+        return [users.get(user_uuid) for user_uuid in uuids]
+
+    async def get_users_by_usernames(
+        self, usernames: List[str]
+    ) -> List[Optional[User]]:
+        """Get users by usernames, aligned with input (None if missing)."""
+        users = {
+            user.username: user
+            for user in await self.user_repository.get_by_usernames(usernames)
+        }
+        return [users.get(username) for username in usernames]
+
+    async def get_all_users(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[User]:
         """Get all users."""
-        return await self.user_repository.get_all(skip=skip, limit=limit)
+        return await self.user_repository.get_all(
+            skip=skip, limit=limit, after_id=after_id
+        )
+
+    async def get_active_users(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[User]:
+        """Get active users."""
+        return await self.user_repository.get_active_users(
+            skip=skip, limit=limit, after_id=after_id
+        )
+
+    async def get_users_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        active_only: bool = False,
+    ) -> List[UserResponseSchema]:
+        """Get page of users as response schemas, without ORM entities."""
+        rows = await self.user_repository.get_page(
+            skip=skip, limit=limit, after_id=after_id, active_only=active_only
+        )
+        return [UserResponseSchema.from_row(row) for row in rows]
+
+    async def search_users(
+        self,
+        query: str,
+        limit: int = 20,
+        after: Optional[tuple[float, int]] = None,
+        active_only: bool = False,
+    ) -> tuple[List[UserResponseSchema], Optional[tuple[float, int]]]:
+        """Search users by username/email prefix and full_name tokens.
+
+        Returns the page and the ``(rank, id)`` position of its last user
+        when more results may follow.
+        """
+        tokens = search_tokens(query)
+        if not tokens:
+            return [], None
+        rows = await self.user_repository.search(
+            tokens, limit=limit, after=after, active_only=active_only
+        )
+        position = (rows[-1][-1], rows[-1][0]) if rows and len(rows) == limit else None
+        return [UserResponseSchema.from_row(row[:-1]) for row in rows], position
+
+    async def suggest_users(
+        self, text: str, limit: int = 10
+    ) -> List[UserSuggestionSchema]:
+        """Suggest users from the in-memory index, else the full-text index."""
+        entries = user_autocomplete.suggest(text, limit)
+        if entries is not None:
+            return [UserSuggestionSchema(*entry[1:]) for entry in entries]
+        tokens = search_tokens(text)
+        if not tokens:
+            return []
+        rows = await self.user_repository.suggest(tokens, limit=limit)
+        return [UserSuggestionSchema(*row) for row in rows]
+
+    async def get_changes(
+        self, after: Optional[tuple[datetime, int]] = None, limit: int = 100
+    ) -> tuple[List[UserChangeSchema], Optional[tuple[datetime, int]]]:
+        """Get creations, updates and deletions after a position, oldest first.
+
+        Each user appears once, in its current state. Changes younger than
+        the settle delay are held back: another worker may still commit
+        a write stamped earlier, which a client past it would never see.
+        Returns the changes and the position of the last one (``after``
+        when there are none). Raises ``ResyncRequiredError`` for a position
+        older than the tombstone retention.
+        """
+        check_position(after)
+        until = utcnow() - timedelta(seconds=settings.change_feed_settle)
+        updated = await self.user_repository.get_updated_since(after, until, limit)
+        deleted = await self.user_repository.get_deleted_since(after, until, limit)
+        changes = [
+            UserChangeSchema.upserted(UserResponseSchema.from_row(row))
+            for row in updated
+        ]
+        changes.extend(UserChangeSchema.deleted(*row) for row in deleted)
+        changes.sort(key=lambda change: (change.changed_at, change.id))
+        del changes[limit:]
+        if changes:
+            after = (changes[-1].changed_at, changes[-1].id)
+        return changes, after
 
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
@@ -52,17 +255,9 @@ class UserService(UserServiceProtocol):
         update_data = {}
 
         if data.username is not None:
-            # Check if username is taken by another user
-            existing_user = await self.user_repository.get_by_username(data.username)
-            if existing_user and existing_user.id != user_id:
-                raise ValueError(f"Username '{data.username}' is already taken")
             update_data["username"] = data.username
 
         if data.email is not None:
-            # Check if email is taken by another user
-            existing_user = await self.user_repository.get_by_email(data.email)
-            if existing_user and existing_user.id != user_id:
-                raise ValueError(f"Email '{data.email}' is already taken")
             update_data["email"] = data.email
 
         if data.full_name is not None:
@@ -74,7 +269,10 @@ class UserService(UserServiceProtocol):
         if not update_data:
             return await self.user_repository.get_by_id(user_id)
 
-        return await self.user_repository.update(user_id, **update_data)
+        try:
+            return await self.user_repository.update(user_id, **update_data)
+        except DuplicateUserError as e:
+            raise ValueError(f"{e.field.capitalize()} '{e.value}' is already taken")
 
     async def delete_user(self, user_id: int) -> bool:
         """Delete user."""
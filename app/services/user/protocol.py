@@ -1,7 +1,15 @@
+from datetime import datetime
 from typing import List, Optional, Protocol, runtime_checkable
 
 from app.models.entities.user import User
-from app.models.schemas.user import UserCreateSchema, UserUpdateSchema
+from app.models.schemas.user import (
+    BulkUserResultSchema,
+    UserChangeSchema,
+    UserCreateSchema,
+    UserResponseSchema,
+    UserSuggestionSchema,
+    UserUpdateSchema,
+)
 
 
 @runtime_checkable
@@ -12,6 +20,12 @@ class UserServiceProtocol(Protocol):
         """Create new user."""
         ...
 
+    async def bulk_create_users(
+        self, items: List[UserCreateSchema], chunk_size: int = 1000
+    ) -> List[BulkUserResultSchema]:
+        """Create users in bulk."""
+        ...
+
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID."""
         ...
@@ -24,14 +38,74 @@ class UserServiceProtocol(Protocol):
         """Get user by username."""
         ...
 
+    async def get_user_version(
+        self, field: str, value: object
+    ) -> Optional[tuple[int, datetime]]:
+        """Get user ``(id, updated_at)`` by id, uuid or username."""
+        ...
+
+    async def get_users_by_ids(self, ids: List[int]) -> List[Optional[User]]:
+        """Get users by IDs, aligned with input."""
+        ...
+
+    async def get_users_by_uuids(self, uuids: List[str]) -> List[Optional[User]]:
+        """Get users by UUIDs, aligned with input."""
+        ...
+
+    async def get_users_by_usernames(
+        self, usernames: List[str]
+    ) -> List[Optional[User]]:
+        """Get users by usernames, aligned with input."""
+        ...
+
+    async def get_users_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        active_only: bool = False,
+    ) -> List[UserResponseSchema]:
+        """Get page of users as response schemas, without ORM entities."""
+        ...
+
+    async def search_users(
+        self,
+        query: str,
+        limit: int = 20,
+        after: Optional[tuple[float, int]] = None,
+        active_only: bool = False,
+    ) -> tuple[List[UserResponseSchema], Optional[tuple[float, int]]]:
+        """Search users, get page and position after its last user."""
+        ...
+
+    async def suggest_users(
+        self, text: str, limit: int = 10
+    ) -> List[UserSuggestionSchema]:
+        """Suggest users whose username or email starts with text."""
+        ...
+
+    async def get_changes(
+        self, after: Optional[tuple[datetime, int]] = None, limit: int = 100
+    ) -> tuple[List[UserChangeSchema], Optional[tuple[datetime, int]]]:
+        """Get changes after a position and the position of the last one."""
+        ...
+
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
         ...
 
-    async def get_all_users(self, skip: int = 0, limit: int = 100) -> List[User]:
+    async def get_all_users(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[User]:
         """Get all users."""
         ...
 
+    async def get_active_users(
+        self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[User]:
+        """Get active users."""
+        ...
+
     async def update_user(self, user_id: int, data: UserUpdateSchema) -> Optional[User]:
         """Update user."""
         ...
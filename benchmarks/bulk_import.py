@@ -0,0 +1,64 @@
+"""Bulk import throughput through UserService.bulk_create_users.
+
+python -m benchmarks.bulk_import --users 50000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from app.config.settings import settings
+from app.core.database import DatabaseManager
+from app.models.schemas.user import UserCreateSchema
+from app.repositories.user.implementation import UserRepository
+from app.services.user.implementation import UserService
+from benchmarks.common import copy_database, print_table, save_results
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    database = copy_database()
+    manager = DatabaseManager(
+        f"sqlite+aiosqlite:///{database}", pragmas=settings.sqlite_pragmas
+    )
+    await manager.create_all()
+
+    prefix = uuid.uuid4().hex[:8]
+    items = [
+        UserCreateSchema(username=f"{prefix}_{i}", email=f"{prefix}_{i}@bench.local")
+        for i in range(args.users)
+    ]
+    async with manager.async_session_maker() as session:
+        started = time.perf_counter()
+        results = await UserService(UserRepository(session)).bulk_create_users(
+            items, chunk_size=args.chunk_size
+        )
+        elapsed = time.perf_counter() - started
+    await manager.close()
+
+    return [
+        {
+            "users": args.users,
+            "chunk_size": args.chunk_size,
+            "created": sum(result.status == "created" for result in results),
+            "rows_per_s": round(args.users / elapsed, 1),
+        }
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.bulk_import_chunk_size
+    )
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    save_results(args.output, "bulk_import", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+import httpx
+
+BASE_DIR = Path(__file__).parent.parent
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Get percentile of sorted values."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int = 0) -> dict:
+    """Summarize request latencies in milliseconds."""
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def print_table(rows: list[dict]) -> None:
+    """Print results as aligned columns."""
+    if not rows:
+        return
+    columns = list(rows[0])
+    widths = [
+        max(len(str(c)), *(len(str(r.get(c, ""))) for r in rows)) for c in columns
+    ]
+    print("  ".join(str(c).ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row.get(c, "")).ljust(w) for c, w in zip(columns, widths)))
+
+
+def save_results(path: Optional[str], name: str, results: list[dict]) -> None:
+    """Save results as JSON for comparison between runs."""
+    if not path:
+        return
+    commit = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    Path(path).write_text(
+        json.dumps(
+            {
+                "benchmark": name,
+                "commit": commit,
+                "timestamp": time.time(),
+                "python": sys.version.split()[0],
+                "cpu_count": os.cpu_count(),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+def copy_database(source: Path = BASE_DIR / "database.db") -> Path:
+    """Copy database into a temporary directory, the original stays untouched."""
+    target = Path(tempfile.mkdtemp(prefix="bench-")) / "database.db"
+    if source.exists():
+        shutil.copyfile(source, target)
+    return target
+
+
+def free_port() -> int:
+    """Get free TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(
+    database: Path, port: int, workers: int, **env: str
+) -> subprocess.Popen:
+    """Start production server in a subprocess and wait until it accepts requests."""
+    process_env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite+aiosqlite:///{database}",
+        "SECRET_KEY_FILE": str(database.with_name(".secret_key")),
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "WORKERS": str(workers),
+        **env,
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app"],
+        cwd=BASE_DIR,
+        env=process_env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/auth/me", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Server did not start")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    """Stop server subprocess."""
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+# One request: method, path, JSON body and extra headers
+RequestSpec = tuple[str, str, Optional[Any], Optional[dict]]
+
+
+class RequestPlan(Protocol):
+    """Builds the ``n``-th request of client process ``worker``.
+
+    Plans are pickled into client processes, so they must be plain
+    module-level classes.
+    """
+
+    def build(self, worker: int, n: int) -> RequestSpec: ...
+
+
+@dataclass(frozen=True)
+class GetPlan:
+    """Same GET request every time."""
+
+    path: str
+    headers: Optional[dict] = None
+
+    def build(self, worker: int, n: int) -> RequestSpec:
+        return "GET", self.path, None, self.headers
+
+
+async def drive(
+    client: Any, plan: RequestPlan, duration: float, concurrency: int, worker: int = 0
+) -> tuple[list[float], int]:
+    """Send requests from ``plan`` with ``concurrency`` loops until ``duration``.
+
+    ``client`` is an ``httpx.AsyncClient`` or Litestar ``AsyncTestClient``;
+    returns latencies of successful requests and the error count.
+    """
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    counter = itertools.count()
+
+    async def loop() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            method, path, body, headers = plan.build(worker, next(counter))
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    method, path, json=body, headers=headers
+                )
+                if response.status_code >= 400:
+                    errors += 1
+                    continue
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return latencies, errors
+
+
+async def _load_worker(
+    base_url: str, plan: RequestPlan, duration: float, concurrency: int, worker: int
+) -> tuple[list[float], int]:
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        return await drive(client, plan, duration, concurrency, worker)
+
+
+def _run_load_worker(
+    base_url: str, plan: RequestPlan, duration: float, concurrency: int, worker: int
+):
+    return asyncio.run(_load_worker(base_url, plan, duration, concurrency, worker))
+
+
+def run_plan(
+    base_url: str,
+    plan: RequestPlan,
+    duration: float,
+    concurrency: int,
+    processes: int = 1,
+) -> dict:
+    """Drive requests from ``plan`` at a server from several client processes."""
+    per_process = max(1, concurrency // processes)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(
+                _run_load_worker, base_url, plan, duration, per_process, worker
+            )
+            for worker in range(processes)
+        ]
+        outcomes = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for result, _ in outcomes for latency in result]
+    errors = sum(error for _, error in outcomes)
+    return summarize(latencies, elapsed, errors)
+
+
+def run_load(
+    url: str,
+    headers: dict,
+    duration: float,
+    concurrency: int,
+    processes: int = 1,
+) -> dict:
+    """Drive GET requests at ``url`` from several client processes."""
+    parts = httpx.URL(url)
+    base_url = f"{parts.scheme}://{parts.netloc.decode()}"
+    return run_plan(
+        base_url,
+        GetPlan(parts.raw_path.decode(), headers),
+        duration,
+        concurrency,
+        processes,
+    )
+
+
+def login(
+    base_url: str, username: str = "bench", password: str = "bench-password"
+) -> dict:
+    """Register (if needed) and log in benchmark user, return auth headers."""
+    httpx.post(
+        f"{base_url}/auth/register",
+        json={
+            "username": username,
+            "email": f"{username}@bench.local",
+            "password": password,
+        },
+        timeout=30,
+    )
+    response = httpx.post(
+        f"{base_url}/auth/login",
+        json={"username": username, "password": password},
+        timeout=30,
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,74 @@
+"""Compare two saved benchmark results, e.g. before and after a commit.
+
+python -m benchmarks.compare before.json after.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from benchmarks.common import print_table
+
+# Lower is better for latencies and per-op costs, higher for throughput
+HIGHER_IS_BETTER = {"rps", "requests"}
+# Changes below this are reported without a verdict
+NOISE_PCT = 5.0
+
+
+def row_key(row: dict) -> tuple:
+    """Identify a result row by its non-numeric fields and sizes."""
+    return tuple(
+        (name, value)
+        for name, value in row.items()
+        if isinstance(value, str) or name in {"users", "workers", "page_size"}
+    )
+
+
+def compare(before: dict, after: dict) -> list[dict]:
+    """Relative change of every shared metric of matching rows."""
+    baseline = {row_key(row): row for row in before["results"]}
+    rows = []
+    for row in after["results"]:
+        key = row_key(row)
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        label = " ".join(str(value) for _, value in key)
+        for metric, value in row.items():
+            old = previous.get(metric)
+            if (metric, value) in key or not isinstance(value, (int, float)):
+                continue
+            if not isinstance(old, (int, float)) or not old:
+                continue
+            change = (value - old) / old * 100
+            better = change > 0 if metric in HIGHER_IS_BETTER else change < 0
+            verdict = ""
+            if abs(change) >= NOISE_PCT:
+                verdict = "better" if better else "worse"
+            rows.append(
+                {
+                    "case": label,
+                    "metric": metric,
+                    "before": old,
+                    "after": value,
+                    "change": f"{change:+.1f}%",
+                    "verdict": verdict,
+                }
+            )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("before", type=Path)
+    parser.add_argument("after", type=Path)
+    args = parser.parse_args()
+
+    before = json.loads(args.before.read_text())
+    after = json.loads(args.after.read_text())
+    print(f"{before['benchmark']}: {before['commit']} -> {after['commit']}")
+    print_table(compare(before, after))
+
+
+if __name__ == "__main__":
+    main()
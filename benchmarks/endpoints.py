@@ -0,0 +1,343 @@
+"""Latency and throughput of every API route on a seeded database.
+
+python -m benchmarks.endpoints --users 100k --mode asgi --duration 5
+python -m benchmarks.endpoints --users 1m --mode server --workers 2 \\
+    --routes get_by_id login --output endpoints.json
+
+``asgi`` drives the application in-process through Litestar's test
+client, ``server`` starts the production runner and drives it over HTTP
+from separate client processes. Seeded users in the lower half of the
+ID range are read and updated; deletes consume the upper half, so no
+route invalidates another one's data. Login and registration limits
+are disabled, the benchmark measures the work behind them.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+from jose import jwt
+
+from app.core.pagination import encode_cursor
+from benchmarks.common import (
+    RequestSpec,
+    drive,
+    free_port,
+    print_table,
+    run_plan,
+    save_results,
+    start_server,
+    stop_server,
+    summarize,
+)
+from benchmarks.seed import (
+    BENCH_PASSWORD,
+    SIZES,
+    parse_size,
+    seed_username,
+    seed_uuid,
+    seeded_copy,
+)
+
+SECRET_KEY = "benchmark-secret-key"
+BULK_SIZE = 100
+BATCH_SIZE = 50
+
+
+def mint_token(secret_key: str, index: int, token_type: str = "access") -> str:
+    """Mint token for seeded user ``index`` like the login route."""
+    expire = datetime.now(timezone.utc) + timedelta(hours=1)
+    return jwt.encode(
+        {
+            "sub": seed_username(index),
+            "user_id": index,
+            "exp": expire,
+            "typ": token_type,
+        },
+        secret_key,
+        algorithm="HS256",
+    )
+
+
+@dataclass(frozen=True)
+class EndpointPlan:
+    """Requests for one route, spread over the seeded users."""
+
+    route: str
+    users: int
+    run: str
+    secret_key: str = SECRET_KEY
+    processes: int = 1
+
+    @property
+    def half(self) -> int:
+        return max(1, self.users // 2)
+
+    def reader(self, worker: int, n: int) -> int:
+        """Pick a seeded user from the lower half, scattered over the index."""
+        return (n * 7919 + worker * 104729) % self.half + 1
+
+    def name(self, worker: int, n: int) -> str:
+        """Get a username no other request of any route or run uses."""
+        return f"{self.route}-{self.run}-{worker}-{n}"
+
+    def auth(self, index: int = 1) -> dict:
+        return {"Authorization": f"Bearer {mint_token(self.secret_key, index)}"}
+
+    def build(self, worker: int, n: int) -> RequestSpec:
+        return ROUTES[self.route](self, worker, n)
+
+
+def register(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    name = plan.name(worker, n)
+    body = {"username": name, "email": f"{name}@bench.local", "password": "x" * 12}
+    return "POST", "/auth/register", body, None
+
+
+def login(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    body = {
+        "username": seed_username(plan.reader(worker, n)),
+        "password": BENCH_PASSWORD,
+    }
+    return "POST", "/auth/login", body, None
+
+
+def refresh(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    token = mint_token(plan.secret_key, plan.reader(worker, n), "refresh")
+    return "POST", "/auth/refresh", {"refresh_token": token}, None
+
+
+def me(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    return "GET", "/auth/me", None, plan.auth()
+
+
+def available(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    # Alternate taken and free usernames
+    username = seed_username(plan.reader(worker, n)) if n % 2 else plan.name(worker, n)
+    return "GET", f"/auth/available?username={username}", None, None
+
+
+def get_by_id(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    return "GET", f"/users/{plan.reader(worker, n)}", None, plan.auth()
+
+
+def get_by_uuid(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    return "GET", f"/users/uuid/{seed_uuid(plan.reader(worker, n))}", None, plan.auth()
+
+
+def get_by_username(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    path = f"/users/username/{seed_username(plan.reader(worker, n))}"
+    return "GET", path, None, plan.auth()
+
+
+def list_offset(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    skip = plan.reader(worker, n) // 100 * 100
+    return "GET", f"/users?skip={skip}&limit=100", None, plan.auth()
+
+
+def list_cursor(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    cursor = encode_cursor(plan.reader(worker, n))
+    return "GET", f"/users?cursor={cursor}&limit=100", None, plan.auth()
+
+
+def batch(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    start = plan.reader(worker, n)
+    ids = ",".join(str((start + i) % plan.half + 1) for i in range(BATCH_SIZE))
+    return "GET", f"/users/batch?ids={ids}", None, plan.auth()
+
+
+def export(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    return "GET", "/users/export", None, plan.auth()
+
+
+def search(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    # Username prefix shared by about ten seeded users
+    query = seed_username(plan.reader(worker, n))[:-1]
+    return "GET", f"/users/search?q={query}", None, plan.auth()
+
+
+def autocomplete(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    query = seed_username(plan.reader(worker, n))[:-1]
+    return "GET", f"/users/autocomplete?q={query}", None, plan.auth()
+
+
+def changes(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    # Full sync: seeded rows share one timestamp, the first page
+    return "GET", "/users/changes?limit=100", None, plan.auth()
+
+
+def create_user(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    name = plan.name(worker, n)
+    return (
+        "POST",
+        "/users",
+        {"username": name, "email": f"{name}@bench.local"},
+        plan.auth(),
+    )
+
+
+def update_self(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    index = plan.reader(worker, n)
+    body = {"full_name": f"Bench User {index} {n}"}
+    return "PUT", f"/users/{index}", body, plan.auth(index)
+
+
+def bulk(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    names = [plan.name(worker, n * BULK_SIZE + i) for i in range(BULK_SIZE)]
+    body = [{"username": name, "email": f"{name}@bench.local"} for name in names]
+    return "POST", "/users/bulk", body, plan.auth()
+
+
+def delete_self(plan: EndpointPlan, worker: int, n: int) -> RequestSpec:
+    # Every request deletes a different upper-half user with its own token
+    index = plan.half + 1 + worker + n * plan.processes
+    return "DELETE", f"/users/{index}", None, plan.auth(index)
+
+
+# Reads first; writes never touch the rows reads rely on
+ROUTES: dict[str, Callable[[EndpointPlan, int, int], RequestSpec]] = {
+    "me": me,
+    "available": available,
+    "get_by_id": get_by_id,
+    "get_by_uuid": get_by_uuid,
+    "get_by_username": get_by_username,
+    "list_offset": list_offset,
+    "list_cursor": list_cursor,
+    "batch": batch,
+    "export": export,
+    "search": search,
+    "autocomplete": autocomplete,
+    "changes": changes,
+    "login": login,
+    "refresh": refresh,
+    "register": register,
+    "create_user": create_user,
+    "update_self": update_self,
+    "bulk": bulk,
+    "delete_self": delete_self,
+}
+
+
+async def run_asgi(
+    plans: list[EndpointPlan], duration: float, concurrency: int
+) -> list[dict]:
+    from litestar.testing import AsyncTestClient
+
+    from app.core.bloom import user_filter
+    from app.main import app
+
+    results = []
+    async with AsyncTestClient(app) as client:
+        # Startup scan for the existence filter is not measured
+        deadline = time.monotonic() + 60
+        while not user_filter.ready and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        for plan in plans:
+            started = time.perf_counter()
+            latencies, errors = await drive(client, plan, duration, concurrency)
+            summary = summarize(latencies, time.perf_counter() - started, errors)
+            results.append({"route": plan.route, **summary})
+    return results
+
+
+def _run_asgi(plans: list[EndpointPlan], duration: float, concurrency: int):
+    return asyncio.run(run_asgi(plans, duration, concurrency))
+
+
+def run_in_process(
+    database: Path, plans: list[EndpointPlan], args: argparse.Namespace
+) -> list[dict]:
+    """Run the application in a fresh interpreter.
+
+    Settings are read at import time, so the seeded database and the
+    signing key must be in the environment before the app is imported.
+    """
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{database}"
+    os.environ["SECRET_KEY"] = SECRET_KEY
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(
+            _run_asgi, plans, args.duration, args.concurrency
+        ).result()
+
+
+def run_server(
+    database: Path, plans: list[EndpointPlan], args: argparse.Namespace
+) -> list[dict]:
+    port = free_port()
+    server = start_server(
+        database,
+        port,
+        args.workers,
+        SECRET_KEY=SECRET_KEY,
+        RATE_LIMIT_ENABLED="false",
+    )
+    try:
+        # Give the existence filter time for its startup scan
+        time.sleep(args.warmup)
+        base_url = f"http://127.0.0.1:{port}"
+        return [
+            {
+                "route": plan.route,
+                **run_plan(
+                    base_url,
+                    replace(plan, processes=args.client_processes),
+                    args.duration,
+                    args.concurrency,
+                    args.client_processes,
+                ),
+            }
+            for plan in plans
+        ]
+    finally:
+        stop_server(server)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    cpus = os.cpu_count() or 1
+    parser.add_argument("--users", type=parse_size, default=SIZES["10k"])
+    parser.add_argument("--mode", choices=["asgi", "server"], default="asgi")
+    parser.add_argument(
+        "--routes", nargs="+", choices=list(ROUTES), default=list(ROUTES)
+    )
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--client-processes", type=int, default=max(1, cpus // 2))
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    database = seeded_copy(args.users)
+    run = uuid.uuid4().hex[:6]
+    plans = [
+        EndpointPlan(route=route, users=args.users, run=run)
+        for route in ROUTES
+        if route in args.routes
+    ]
+    if args.mode == "asgi":
+        results = run_in_process(database, plans, args)
+    else:
+        results = run_server(database, plans, args)
+
+    for row in results:
+        row.update(mode=args.mode, users=args.users)
+    print_table(results)
+    save_results(args.output, "endpoints", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Sustained user inserts per second with and without group commit.
+
+python -m benchmarks.group_commit --users 5000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Optional
+
+from app.config.settings import settings
+from app.core.batching import WriteBatcher
+from app.core.database import DatabaseManager
+from app.repositories.user.implementation import UserRepository
+from benchmarks.common import copy_database, print_table, save_results
+
+PASSWORD_HASH = "$2b$12$KIXQJQn1b6dE8JtC6Yc3QOeR0Yc5h9aU6Jc1c9aQq1u7o9mC2y6lW"
+
+
+async def run_mode(name: str, users: int, concurrency: int, batched: bool) -> dict:
+    database = copy_database()
+    manager = DatabaseManager(
+        f"sqlite+aiosqlite:///{database}", pragmas=settings.sqlite_pragmas
+    )
+    await manager.create_all()
+    batcher: Optional[WriteBatcher] = None
+    if batched:
+        batcher = WriteBatcher(
+            manager,
+            window=settings.group_commit_window_ms / 1000,
+            max_batch=settings.group_commit_max_batch,
+        )
+
+    errors = 0
+
+    async def writer(count: int) -> None:
+        nonlocal errors
+        for _ in range(count):
+            suffix = uuid.uuid4().hex[:12]
+            async with manager.async_session_maker() as session:
+                try:
+                    await UserRepository(session, write_batcher=batcher).create(
+                        username=f"bench_{suffix}",
+                        email=f"{suffix}@bench.local",
+                        password_hash=PASSWORD_HASH,
+                    )
+                except Exception:
+                    errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(users // concurrency) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await manager.close()
+    return {
+        "mode": name,
+        "inserts_per_s": round(users / elapsed, 1),
+        "errors": errors,
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    return [
+        await run_mode("commit per write", args.users, args.concurrency, False),
+        await run_mode("group commit", args.users, args.concurrency, True),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    save_results(args.output, "group_commit", results)
+
+
+if __name__ == "__main__":
+    main()
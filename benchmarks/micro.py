@@ -0,0 +1,129 @@
+"""Micro-benchmarks of hot paths: tokens, schema mapping, repository queries.
+
+python -m benchmarks.micro --users 100k --number 2000 --output micro.json
+"""
+
+import argparse
+import asyncio
+import time
+import timeit
+from typing import Awaitable, Callable
+
+from app.config.settings import settings
+from app.core.auth import auth_manager
+from app.core.database import DatabaseManager
+from app.models.schemas.user import UserResponseSchema
+from app.repositories.user.implementation import UserRepository
+from benchmarks.common import print_table, save_results
+from benchmarks.seed import SIZES, parse_size, seed_username, seeded_copy
+
+
+def measure(name: str, func: Callable[[], object], number: int) -> dict:
+    """Best of three ``timeit`` repeats, per call."""
+    best = min(timeit.repeat(func, number=number, repeat=3))
+    return {"benchmark": name, "us_per_op": round(best / number * 1e6, 3)}
+
+
+async def measure_async(
+    name: str, func: Callable[[int], Awaitable[object]], number: int
+) -> dict:
+    """Best of three repeats of an async call, per call."""
+    await func(0)
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for i in range(number):
+            await func(i)
+        best = min(best, time.perf_counter() - started)
+    return {"benchmark": name, "us_per_op": round(best / number * 1e6, 3)}
+
+
+def token_benchmarks(number: int) -> list[dict]:
+    claims = {"sub": seed_username(1), "user_id": 1}
+    token = auth_manager.create_access_token(data=claims)
+
+    def verify_uncached() -> None:
+        auth_manager.token_cache.clear()
+        auth_manager.verify_token(token)
+
+    return [
+        measure(
+            "create_access_token",
+            lambda: auth_manager.create_access_token(data=claims),
+            number,
+        ),
+        measure("verify_token_uncached", verify_uncached, number),
+        measure(
+            "verify_token_cached", lambda: auth_manager.verify_token(token), number
+        ),
+    ]
+
+
+async def repository_benchmarks(users: int, number: int) -> list[dict]:
+    # Seeding runs its own event loop
+    database = await asyncio.to_thread(seeded_copy, users)
+    manager = DatabaseManager(
+        f"sqlite+aiosqlite:///{database}", pragmas=settings.sqlite_pragmas
+    )
+    half = max(1, users // 2)
+
+    def pick(i: int) -> int:
+        return i * 7919 % half + 1
+
+    async with manager.async_session_maker() as session:
+        repository = UserRepository(session)
+        user = await repository.get_by_id(1)
+        row = (await repository.get_page(limit=1))[0]
+
+        results = [
+            measure(
+                "from_entity", lambda: UserResponseSchema.from_entity(user), number
+            ),
+            measure("from_row", lambda: UserResponseSchema.from_row(row), number),
+        ]
+        # Fresh identity map per call, as in a request
+        for name, query in (
+            ("get_by_id", lambda i: repository.get_by_id(pick(i))),
+            (
+                "get_by_username",
+                lambda i: repository.get_by_username(seed_username(pick(i))),
+            ),
+            (
+                "get_by_ids_50",
+                lambda i: repository.get_by_ids([pick(i + k) for k in range(50)]),
+            ),
+            (
+                "get_page_100",
+                lambda i: repository.get_page(limit=100, after_id=pick(i)),
+            ),
+        ):
+
+            async def call(i: int, query=query) -> object:
+                result = await query(i)
+                session.expunge_all()
+                return result
+
+            results.append(await measure_async(name, call, number))
+
+    await manager.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=parse_size, default=SIZES["10k"])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = token_benchmarks(args.number)
+    results += asyncio.run(repository_benchmarks(args.users, args.number))
+    for row in results:
+        row["users"] = args.users
+
+    print_table(results)
+    save_results(args.output, "micro", results)
+
+
+if __name__ == "__main__":
+    main()
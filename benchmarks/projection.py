@@ -0,0 +1,98 @@
+"""Per-row cost of list pages: ORM entities vs column-only rows.
+
+python -m benchmarks.projection --page-sizes 100 1000 --rounds 50
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+
+import msgspec
+
+from app.config.settings import settings
+from app.core.database import DatabaseManager
+from app.models.schemas.user import UserResponseSchema
+from app.repositories.user.implementation import UserRepository
+from benchmarks.common import copy_database, print_table, save_results
+
+
+async def orm_page(repository: UserRepository, limit: int) -> bytes:
+    users = await repository.get_all(limit=limit)
+    return msgspec.json.encode([UserResponseSchema.from_entity(u) for u in users])
+
+
+async def rows_page(repository: UserRepository, limit: int) -> bytes:
+    rows = await repository.get_page(limit=limit)
+    return msgspec.json.encode([UserResponseSchema.from_row(row) for row in rows])
+
+
+async def measure(manager: DatabaseManager, page, limit: int, rounds: int) -> dict:
+    async with manager.async_session_maker() as session:
+        await page(UserRepository(session), limit)
+
+    started = time.process_time()
+    for _ in range(rounds):
+        async with manager.async_session_maker() as session:
+            await page(UserRepository(session), limit)
+    cpu = time.process_time() - started
+
+    tracemalloc.start()
+    async with manager.async_session_maker() as session:
+        await page(UserRepository(session), limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "path": page.__name__,
+        "page_size": limit,
+        "cpu_us_per_row": round(cpu / rounds / limit * 1e6, 2),
+        "peak_bytes_per_row": peak // limit,
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    database = copy_database()
+    manager = DatabaseManager(
+        f"sqlite+aiosqlite:///{database}", pragmas=settings.sqlite_pragmas
+    )
+    await manager.create_all()
+
+    prefix = uuid.uuid4().hex[:8]
+    async with manager.async_session_maker() as session:
+        await UserRepository(session).create_many(
+            [
+                {
+                    "username": f"{prefix}_{i}",
+                    "email": f"{prefix}_{i}@bench.local",
+                    "password_hash": "!",
+                    "full_name": f"Bench User {i}",
+                }
+                for i in range(max(args.page_sizes))
+            ]
+        )
+
+    results = [
+        await measure(manager, page, limit, args.rounds)
+        for limit in args.page_sizes
+        for page in (orm_page, rows_page)
+    ]
+    await manager.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    save_results(args.output, "projection", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Concurrent read throughput by reader pool size.
+
+python -m benchmarks.read_pool --pool-sizes 1 4 8 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+
+from app.config.settings import settings
+from app.core.database import DatabaseManager
+from app.models.entities.user import User
+from app.repositories.user.implementation import UserRepository
+from benchmarks.common import copy_database, print_table, save_results
+
+
+async def run_pool(pool_size: int, concurrency: int, reads: int) -> dict:
+    database = copy_database()
+    manager = DatabaseManager(
+        f"sqlite+aiosqlite:///{database}",
+        pragmas=settings.sqlite_pragmas,
+        read_pool_size=pool_size,
+    )
+    await manager.create_all()
+    async with manager.async_session_maker() as session:
+        ids = list((await session.scalars(select(User.id))).all()) or [1]
+
+    async def reader(count: int) -> None:
+        for index in range(count):
+            async with manager.async_session_maker() as session:
+                await UserRepository(session).get_by_id(ids[index % len(ids)])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(reader(reads // concurrency) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await manager.close()
+    return {
+        "pool_size": pool_size,
+        "concurrency": concurrency,
+        "reads_per_s": round(reads / elapsed, 1),
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    return [
+        await run_pool(pool_size, args.concurrency, args.reads)
+        for pool_size in args.pool_sizes
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--reads", type=int, default=20000)
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    save_results(args.output, "read_pool", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Search latency: full-text index against a ``LIKE '%q%'`` scan.
+
+python -m benchmarks.search --users 1m --samples 20 --output search.json
+
+Queries range from a single user to every user (``bench`` is in every
+seeded full name), and one that matches nobody. ``like`` is the scan a
+client-side filter would be replaced with; ``search`` and ``suggest``
+use the FTS5 index, ``memory`` the in-memory autocomplete index.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import or_, select
+
+from app.config.settings import settings
+from app.core.autocomplete import UserAutocomplete
+from app.core.database import DatabaseManager
+from app.core.search import search_tokens
+from app.models.entities.user import User
+from app.repositories.user.implementation import PUBLIC_COLUMNS, UserRepository
+from benchmarks.common import percentile, print_table, save_results
+from benchmarks.seed import SIZES, parse_size, seed_email, seed_username, seeded_copy
+
+LIMIT = 20
+
+
+def queries(users: int) -> dict[str, str]:
+    """Benchmark queries by name, picked to exist at the given size."""
+    middle = users // 2
+    return {
+        "one user": seed_username(middle),
+        "username prefix": seed_username(middle)[:-2],
+        "email prefix": seed_email(middle)[:-4],
+        "every user": "bench",
+        "no match": "nobody",
+    }
+
+
+def like_query(text: str):
+    """Substring scan over the searchable columns."""
+    pattern = f"%{text}%"
+    return (
+        select(*PUBLIC_COLUMNS)
+        .where(
+            or_(
+                User.username.like(pattern),
+                User.email.like(pattern),
+                User.full_name.like(pattern),
+            )
+        )
+        .order_by(User.id)
+        .limit(LIMIT)
+    )
+
+
+async def timed(call: Callable[[], Awaitable[list]], samples: int) -> dict:
+    """Latency percentiles of ``samples`` calls after one warm-up call."""
+    matches = len(await call())
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "matches": matches,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+    }
+
+
+async def run(users: int, samples: int, memory: bool) -> list[dict]:
+    # Seeding runs its own event loop
+    database = await asyncio.to_thread(seeded_copy, users)
+    manager = DatabaseManager(
+        f"sqlite+aiosqlite:///{database}", pragmas=settings.sqlite_pragmas
+    )
+    await manager.ensure_schema()
+
+    autocomplete = UserAutocomplete()
+    build_s = None
+    if memory:
+        started = time.perf_counter()
+        await autocomplete.rebuild(manager.async_session_maker)
+        build_s = round(time.perf_counter() - started, 2)
+
+    results = []
+    async with manager.async_session_maker() as session:
+        repository = UserRepository(session)
+
+        async def like(text: str) -> list:
+            return (await session.execute(like_query(text))).all()
+
+        async def search(text: str) -> list:
+            return list(await repository.search(search_tokens(text), limit=LIMIT))
+
+        async def suggest(text: str) -> list:
+            return list(await repository.suggest(search_tokens(text), limit=LIMIT))
+
+        async def in_memory(text: str) -> list:
+            return autocomplete.suggest(text, LIMIT)
+
+        methods = {"like": like, "search": search, "suggest": suggest}
+        if memory:
+            methods["memory"] = in_memory
+
+        for name, text in queries(users).items():
+            for method, call in methods.items():
+                row = {"query": name, "method": method, "users": users}
+                row.update(await timed(lambda: call(text), samples))
+                results.append(row)
+
+    await manager.close()
+    if build_s is not None:
+        stats = autocomplete.stats()
+        print(f"Memory index: {stats.entries} entries built in {build_s}s")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=parse_size, default=SIZES["100k"])
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the in-memory index"
+    )
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.users, args.samples, memory=not args.no_memory))
+    print_table(results)
+    save_results(args.output, "search", results)
+
+
+if __name__ == "__main__":
+    main()
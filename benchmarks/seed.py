@@ -0,0 +1,118 @@
+"""Seed a SQLite database with deterministic benchmark users.
+
+python -m benchmarks.seed --users 100000 --database /tmp/bench.db
+
+User ``i`` (1-based) has id ``i``, username ``user<i>``, email
+``user<i>@bench.local``, a UUID derived from ``i`` and the password
+``BENCH_PASSWORD``. The bcrypt hash is computed once and shared by all
+rows, so seeding 1M users takes seconds rather than days.
+"""
+
+import argparse
+import asyncio
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy.dialects import sqlite
+
+from app.core.auth import auth_manager
+from app.core.database import DatabaseManager, schema_version
+
+BENCH_PASSWORD = "bench-password"
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+
+def seed_username(index: int) -> str:
+    """Get username of seeded user ``index``."""
+    return f"user{index}"
+
+
+def seed_email(index: int) -> str:
+    """Get email of seeded user ``index``."""
+    return f"user{index}@bench.local"
+
+
+def seed_uuid(index: int) -> str:
+    """Get UUID of seeded user ``index``."""
+    return f"00000000-0000-4000-8000-{index:012d}"
+
+
+def parse_size(value: str) -> int:
+    """Parse ``10k``/``100k``/``1m`` or a plain number."""
+    return SIZES.get(value.lower()) or int(value)
+
+
+async def create_schema(database: Path) -> None:
+    manager = DatabaseManager(f"sqlite+aiosqlite:///{database}")
+    await manager.create_all()
+    await manager.close()
+
+
+def seed_database(database: Path, users: int, batch_size: int = 50_000) -> Path:
+    """Create schema and insert ``users`` users with one shared hash."""
+    database.unlink(missing_ok=True)
+    asyncio.run(create_schema(database))
+    password_hash = auth_manager.get_password_hash(BENCH_PASSWORD)
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+    connection = sqlite3.connect(database)
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=OFF")
+        for start in range(1, users + 1, batch_size):
+            stop = min(start + batch_size, users + 1)
+            connection.executemany(
+                "INSERT INTO users (id, uuid, username, email, password_hash,"
+                " full_name, is_active, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?)",
+                (
+                    (
+                        index,
+                        seed_uuid(index),
+                        seed_username(index),
+                        seed_email(index),
+                        password_hash,
+                        f"Bench User {index}",
+                        now,
+                        now,
+                    )
+                    for index in range(start, stop)
+                ),
+            )
+            connection.commit()
+        connection.execute("PRAGMA optimize")
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        connection.close()
+    return database
+
+
+def seeded_copy(users: int) -> Path:
+    """Copy of a seeded database, the template is built once per size and schema."""
+    version = schema_version(sqlite.dialect())
+    template = Path(tempfile.gettempdir()) / f"bench-seed-{users}-{version}.db"
+    if not template.exists():
+        seed_database(template, users)
+    target = Path(tempfile.mkdtemp(prefix="bench-")) / "database.db"
+    shutil.copyfile(template, target)
+    return target
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=parse_size, default=SIZES["10k"])
+    parser.add_argument("--database", type=Path, required=True)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    seed_database(args.database, args.users)
+    elapsed = time.perf_counter() - started
+    print(f"Seeded {args.users} users in {elapsed:.1f}s ({args.users / elapsed:.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
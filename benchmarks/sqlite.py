@@ -0,0 +1,76 @@
+"""SQLite write/read throughput with and without the tuning profile.
+
+python -m benchmarks.sqlite --writes 2000 --reads 20000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from app.config.settings import settings
+from app.core.database import DatabaseManager
+from app.repositories.user.implementation import UserRepository
+from benchmarks.common import copy_database, print_table, save_results
+
+# Stock SQLite behaviour: rollback journal with fsync on every commit
+DEFAULT_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL"}
+PASSWORD_HASH = "$2b$12$KIXQJQn1b6dE8JtC6Yc3QOeR0Yc5h9aU6Jc1c9aQq1u7o9mC2y6lW"
+
+
+async def run_profile(name: str, pragmas: dict, writes: int, reads: int) -> dict:
+    database = copy_database()
+    manager = DatabaseManager(f"sqlite+aiosqlite:///{database}", pragmas=pragmas)
+    await manager.create_all()
+
+    started = time.perf_counter()
+    ids = []
+    for _ in range(writes):
+        async with manager.async_session_maker() as session:
+            name_suffix = uuid.uuid4().hex[:12]
+            user = await UserRepository(session).create(
+                username=f"bench_{name_suffix}",
+                email=f"{name_suffix}@bench.local",
+                password_hash=PASSWORD_HASH,
+            )
+            ids.append(user.id)
+    write_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    async with manager.async_session_maker() as session:
+        repository = UserRepository(session)
+        for _ in range(reads):
+            await repository.get_by_id(random.choice(ids))
+            session.expunge_all()
+    read_elapsed = time.perf_counter() - started
+
+    await manager.close()
+    return {
+        "profile": name,
+        "writes_per_s": round(writes / write_elapsed, 1),
+        "reads_per_s": round(reads / read_elapsed, 1),
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    return [
+        await run_profile("default", DEFAULT_PRAGMAS, args.writes, args.reads),
+        await run_profile("tuned", settings.sqlite_pragmas, args.writes, args.reads),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=20000)
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    save_results(args.output, "sqlite", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Cold start: import time of the app and time to first response.
+
+python -m benchmarks.startup --runs 5 --output startup.json
+
+Every run starts a fresh interpreter. ``fresh`` boots on an empty
+database file, so the schema is created; ``current`` boots on a database
+a previous run already prepared.
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import (
+    BASE_DIR,
+    copy_database,
+    free_port,
+    print_table,
+    save_results,
+    stop_server,
+)
+
+IMPORT_SCRIPT = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def environment(database: Path, **env: str) -> dict:
+    return {
+        **os.environ,
+        "DATABASE_URL": f"sqlite+aiosqlite:///{database}",
+        "SECRET_KEY": "startup",
+        "PYTHONPATH": str(BASE_DIR),
+        **env,
+    }
+
+
+def import_time(database: Path, **env: str) -> float:
+    """Seconds to import ``app.main`` in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=BASE_DIR,
+        env=environment(database, **env),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output.split()[-1])
+
+
+def first_response_time(database: Path, **env: str) -> float:
+    """Seconds from process start to the first answered request."""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/auth/available?username=startup"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app"],
+        cwd=BASE_DIR,
+        env=environment(database, HOST="127.0.0.1", PORT=str(port), WORKERS="1", **env),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        # Cheap connect probes, the server shares the CPU with this loop
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            except OSError:
+                time.sleep(0.005)
+                continue
+            if httpx.get(url, timeout=10).status_code < 500:
+                return time.perf_counter() - started
+        raise RuntimeError("Server did not start")
+    finally:
+        stop_server(process)
+
+
+def measure(scenario: str, runs: int, fresh: bool, **env: str) -> dict:
+    imports, responses = [], []
+    database = copy_database(Path("/nonexistent"))
+    for _ in range(runs):
+        if fresh:
+            database.unlink(missing_ok=True)
+        imports.append(import_time(database, **env))
+        if fresh:
+            database.unlink(missing_ok=True)
+        responses.append(first_response_time(database, **env))
+    return {
+        "scenario": scenario,
+        "import_ms": round(statistics.median(imports) * 1000, 1),
+        "first_response_ms": round(statistics.median(responses) * 1000, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = [
+        measure("fresh", args.runs, fresh=True),
+        measure("current", args.runs, fresh=False),
+        measure("current, no metrics", args.runs, fresh=False, METRICS_ENABLED="false"),
+    ]
+    print_table(results)
+    save_results(args.output, "startup", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""SQL statements per endpoint, fails when a budget is exceeded.
+
+python -m benchmarks.statements
+
+Runs on a copy of the project database; tests/test_statements.py runs
+the same requests on every test run.
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+
+from benchmarks.common import copy_database, print_table, save_results
+
+# Statements per request, BEGIN/COMMIT/ROLLBACK and PRAGMAs not counted
+BUDGETS = {
+    "register": 1,
+    # Username/email lookups, the filter reports a likely duplicate
+    "register_duplicate": 2,
+    "login": 1,
+    # Revocation is checked against token epochs in memory
+    "refresh": 0,
+    "create_user": 1,
+    "update_user": 1,
+    "update_user_duplicate": 1,
+    # Full-text index; autocomplete needs none once the memory index is on
+    "search": 1,
+    "autocomplete": 1,
+    # Updated users and tombstones
+    "changes": 2,
+}
+
+IGNORED_PREFIXES = ("BEGIN", "COMMIT", "ROLLBACK", "PRAGMA", "SAVEPOINT", "RELEASE")
+
+
+class StatementCounter:
+    """Collect statements executed on any engine while active."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(IGNORED_PREFIXES):
+            self.statements.append(statement)
+
+    def __enter__(self) -> "StatementCounter":
+        from sqlalchemy import Engine, event
+
+        event.listen(Engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        from sqlalchemy import Engine, event
+
+        event.remove(Engine, "before_cursor_execute", self._count)
+
+
+def measure(client) -> list[dict]:
+    """Count statements of each budgeted request through a started test client."""
+    from app.core.bloom import user_filter
+
+    # Startup scan for the existence filter is not part of the budget
+    deadline = time.monotonic() + 10
+    while not user_filter.ready and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    prefix = uuid.uuid4().hex[:8]
+    password = "statements-password"
+    headers: dict[str, str] = {}
+    rows = []
+    counter = StatementCounter()
+
+    def request(name: str, method: str, url: str, **kwargs) -> dict:
+        counter.statements.clear()
+        response = client.request(method, url, headers=headers, **kwargs)
+        rows.append(
+            {
+                "endpoint": name,
+                "status": response.status_code,
+                "statements": len(counter.statements),
+                "budget": BUDGETS[name],
+            }
+        )
+        return response.json()
+
+    with counter:
+        register = {
+            "username": f"{prefix}_owner",
+            "email": f"{prefix}_owner@bench.local",
+            "password": password,
+        }
+        owner = request("register", "POST", "/auth/register", json=register)
+        request("register_duplicate", "POST", "/auth/register", json=register)
+        token = request(
+            "login",
+            "POST",
+            "/auth/login",
+            json={"username": register["username"], "password": password},
+        )
+        request(
+            "refresh",
+            "POST",
+            "/auth/refresh",
+            json={"refresh_token": token["refresh_token"]},
+        )
+        headers["Authorization"] = f"Bearer {token['access_token']}"
+        # Warm principal cache, auth lookups are not part of the budget
+        client.get("/auth/me", headers=headers)
+
+        request(
+            "create_user",
+            "POST",
+            "/users",
+            json={
+                "username": f"{prefix}_other",
+                "email": f"{prefix}_other@bench.local",
+            },
+        )
+        request(
+            "update_user",
+            "PUT",
+            f"/users/{owner['id']}",
+            json={"full_name": "Statements"},
+        )
+        client.get("/auth/me", headers=headers)
+        request(
+            "update_user_duplicate",
+            "PUT",
+            f"/users/{owner['id']}",
+            json={"username": f"{prefix}_other"},
+        )
+        client.get("/auth/me", headers=headers)
+        request("search", "GET", f"/users/search?q={prefix}")
+        request("autocomplete", "GET", f"/users/autocomplete?q={prefix}")
+        request("changes", "GET", "/users/changes")
+    return rows
+
+
+def run() -> list[dict]:
+    database = copy_database()
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{database}"
+    os.environ.setdefault("SECRET_KEY", "statements")
+
+    from litestar.testing import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        return measure(client)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = run()
+    print_table(results)
+    save_results(args.output, "statements", results)
+    if any(row["statements"] > row["budget"] for row in results):
+        sys.exit("Statement budget exceeded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Throughput of the production runner by worker count.
+
+python -m benchmarks.workers --workers 1 2 4 --duration 10
+"""
+
+import argparse
+import os
+
+import httpx
+
+from benchmarks.common import (
+    copy_database,
+    free_port,
+    login,
+    print_table,
+    run_load,
+    save_results,
+    start_server,
+    stop_server,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    cpus = os.cpu_count() or 1
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, cpus}))
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--client-processes", type=int, default=max(1, cpus // 2))
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    database = copy_database()
+    results = []
+    for workers in args.workers:
+        port = free_port()
+        server = start_server(database, port, workers)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            headers = login(base_url)
+            user_id = httpx.get(f"{base_url}/auth/me", headers=headers).json()["id"]
+            summary = run_load(
+                f"{base_url}/users/{user_id}",
+                headers,
+                args.duration,
+                args.concurrency,
+                args.client_processes,
+            )
+            results.append({"workers": workers, **summary})
+        finally:
+            stop_server(server)
+
+    print_table(results)
+    save_results(args.output, "workers", results)
+
+
+if __name__ == "__main__":
+    main()
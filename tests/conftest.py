@@ -0,0 +1,85 @@
+import atexit
+import itertools
+import os
+import shutil
+import tempfile
+import time
+
+import pytest
+
+# Settings are read at import time: point them at a scratch database
+# before anything from the application is imported
+DATABASE_DIR = tempfile.mkdtemp(prefix="api-tests-")
+atexit.register(shutil.rmtree, DATABASE_DIR, ignore_errors=True)
+os.environ.update(
+    DATABASE_URL=f"sqlite+aiosqlite:///{DATABASE_DIR}/test.db",
+    SECRET_KEY="test-secret-key",
+    BCRYPT_ROUNDS="4",
+    # One process, no other workers' revocations to pick up
+    TOKEN_EPOCH_REFRESH_INTERVAL="0",
+    # Tests sign up and log in far more often than the limits allow;
+    # rate limit tests turn limiting back on
+    RATE_LIMIT_ENABLED="false",
+)
+
+PASSWORD = "test-password"
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client of the application, started once per session."""
+    from litestar.testing import TestClient
+
+    from app.core.bloom import user_filter
+    from app.main import app
+
+    with TestClient(app) as client:
+        # Startup scan for the existence filter runs in the background
+        deadline = time.monotonic() + 10
+        while not user_filter.ready and time.monotonic() < deadline:
+            time.sleep(0.01)
+        yield client
+
+
+@pytest.fixture(scope="session")
+def user_factory(client):
+    """Register users with unique usernames and emails."""
+    numbers = itertools.count(1)
+
+    def register(**fields) -> dict:
+        username = f"user{next(numbers)}-{os.getpid()}"
+        body = {
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": PASSWORD,
+            **fields,
+        }
+        response = client.post("/auth/register", json=body)
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return register
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client, user_factory) -> dict[str, str]:
+    """Authorization header of a user of its own."""
+    return bearer(login(client, user_factory()["username"])["access_token"])
+
+
+def login(client, username: str, password: str = PASSWORD) -> dict:
+    """Log in, return the token pair."""
+    response = client.post(
+        "/auth/login", json={"username": username, "password": password}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def bearer(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
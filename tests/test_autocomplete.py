@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import insert
+
+from app.core.autocomplete import UserAutocomplete
+from app.core.database import DatabaseManager
+from app.models.entities.user import User
+
+
+@pytest.fixture
+async def autocomplete():
+    manager = DatabaseManager("sqlite+aiosqlite:///:memory:")
+    await manager.create_all()
+    async with manager.async_session_maker() as session:
+        await session.execute(
+            insert(User),
+            [
+                {"username": name, "email": f"{name}@example.com", "password_hash": "!"}
+                for name in ("alice", "albert", "bob")
+            ],
+        )
+        await session.commit()
+
+    autocomplete = UserAutocomplete()
+    await autocomplete.rebuild(manager.async_session_maker)
+    yield autocomplete
+    await manager.close()
+
+
+def usernames(autocomplete: UserAutocomplete, text: str) -> list[str]:
+    return [entry[2] for entry in autocomplete.suggest(text, 10)]
+
+
+@pytest.mark.anyio
+async def test_suggests_by_username_and_email_prefix(autocomplete):
+    assert usernames(autocomplete, "al") == ["albert", "alice"]
+    assert usernames(autocomplete, "BOB@ex") == ["bob"]
+
+
+@pytest.mark.anyio
+async def test_renamed_user_is_suggested_by_new_name_only(autocomplete):
+    autocomplete.update(1, "carol", "carol@example.com")
+
+    assert usernames(autocomplete, "al") == ["albert"]
+    assert usernames(autocomplete, "alice@") == []
+    assert usernames(autocomplete, "car") == ["carol"]
+
+    autocomplete.update(1, "dave", "dave@example.com")
+    assert usernames(autocomplete, "car") == []
+    assert usernames(autocomplete, "d") == ["dave"]
+
+
+@pytest.mark.anyio
+async def test_deleted_user_is_not_suggested(autocomplete):
+    autocomplete.remove(2)
+
+    assert usernames(autocomplete, "al") == ["alice"]
+    assert usernames(autocomplete, "albert@") == []
+
+
+@pytest.mark.anyio
+async def test_reused_id_shows_new_user_only(autocomplete):
+    autocomplete.remove(3)
+    autocomplete.add(3, "bella", "bella@example.com")
+
+    assert usernames(autocomplete, "b") == ["bella"]
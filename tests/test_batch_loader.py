@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.database import DatabaseManager
+from app.models.entities.user import User
+from app.repositories.user.implementation import UserRepository
+from app.repositories.user.loader import BatchLoader
+from benchmarks.statements import StatementCounter
+
+
+class Fetches:
+    """Fetch function recording the keys of every call."""
+
+    def __init__(self, values: dict[int, str]):
+        self.values = values
+        self.calls: list[list[int]] = []
+
+    async def __call__(self, keys: list[int]) -> list[tuple[int, str]]:
+        self.calls.append(keys)
+        return [(key, self.values[key]) for key in keys if key in self.values]
+
+
+@pytest.mark.anyio
+async def test_concurrent_loads_share_one_fetch():
+    fetches = Fetches({1: "one", 2: "two", 3: "three"})
+    loader = BatchLoader(fetches)
+
+    values = await asyncio.gather(*(loader.load(key) for key in (3, 1, 3, 4, 2)))
+
+    assert values == ["three", "one", "three", None, "two"]
+    assert fetches.calls == [[3, 1, 4, 2]]
+
+
+@pytest.mark.anyio
+async def test_sequential_loads_fetch_separately():
+    fetches = Fetches({1: "one"})
+    loader = BatchLoader(fetches)
+
+    assert await loader.load(1) == "one"
+    assert await loader.load(1) == "one"
+    assert fetches.calls == [[1], [1]]
+
+
+@pytest.mark.anyio
+async def test_fetch_error_reaches_every_caller():
+    async def fail(keys: list[int]) -> list[tuple[int, str]]:
+        raise RuntimeError("fetch failed")
+
+    loader = BatchLoader(fail)
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), return_exceptions=True
+    )
+
+    assert [str(result) for result in results] == ["fetch failed"] * 2
+
+
+@pytest.fixture
+async def session():
+    manager = DatabaseManager("sqlite+aiosqlite:///:memory:")
+    await manager.create_all()
+    async with manager.async_session_maker() as session:
+        await session.execute(
+            insert(User),
+            [
+                {"username": name, "email": f"{name}@example.com", "password_hash": "!"}
+                for name in ("alice", "bob", "carol")
+            ],
+        )
+        await session.commit()
+        yield session
+    await manager.close()
+
+
+@pytest.mark.anyio
+async def test_concurrent_get_by_id_runs_one_in_query(session):
+    repository = UserRepository(session)
+
+    with StatementCounter() as counter:
+        users = await asyncio.gather(
+            *(repository.get_by_id(user_id) for user_id in (2, 1, 99, 2))
+        )
+
+    assert [user and user.username for user in users] == ["bob", "alice", None, "bob"]
+    assert len(counter.statements) == 1
+    assert " IN " in counter.statements[0]
+
+
+def batch(client, headers, **params) -> list[tuple[str, bool, str]]:
+    response = client.get("/users/batch", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return [
+        (item["key"], item["found"], item["user"] and item["user"]["username"])
+        for item in response.json()
+    ]
+
+
+def test_batch_follows_input_order_with_duplicates_and_misses(
+    client, user_factory, auth_headers
+):
+    first, second = user_factory(), user_factory()
+    ids = [str(second["id"]), "0", str(first["id"]), str(second["id"])]
+
+    assert batch(client, auth_headers, ids=",".join(ids)) == [
+        (ids[0], True, second["username"]),
+        ("0", False, None),
+        (ids[2], True, first["username"]),
+        (ids[3], True, second["username"]),
+    ]
+    # Repeated parameters and comma-separated values mix
+    assert batch(
+        client,
+        auth_headers,
+        usernames=[second["username"], f"missing,{first['username']}"],
+    ) == [
+        (second["username"], True, second["username"]),
+        ("missing", False, None),
+        (first["username"], True, first["username"]),
+    ]
+    assert batch(client, auth_headers, uuids=[first["uuid"], "missing"]) == [
+        (first["uuid"], True, first["username"]),
+        ("missing", False, None),
+    ]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{}, {"ids": "1", "usernames": "alice"}, {"ids": "1,two"}],
+    ids=["no-keys", "two-kinds", "non-integer-id"],
+)
+def test_batch_rejects_bad_keys(client, auth_headers, params):
+    response = client.get("/users/batch", params=params, headers=auth_headers)
+
+    assert response.status_code == 400
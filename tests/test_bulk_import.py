@@ -0,0 +1,87 @@
+import itertools
+import json
+
+import pytest
+
+numbers = itertools.count(1)
+
+
+def new_row(**fields) -> dict:
+    username = f"bulk{next(numbers)}"
+    return {"username": username, "email": f"{username}@example.com", **fields}
+
+
+def statuses(report: dict) -> list[tuple[int, str]]:
+    return [(result["index"], result["status"]) for result in report["results"]]
+
+
+def test_report_has_one_result_per_row_in_order(client, user_factory, auth_headers):
+    existing = user_factory()
+    first = new_row()
+    rows = [
+        first,
+        new_row(username=existing["username"]),
+        new_row(email=existing["email"]),
+        new_row(username=first["username"]),
+        {"username": "no-email"},
+        new_row(username=""),
+        new_row(full_name="Bulk User"),
+    ]
+
+    response = client.post("/users/bulk", json=rows, headers=auth_headers)
+
+    assert response.status_code == 200
+    report = response.json()
+    assert statuses(report) == [
+        (0, "created"),
+        (1, "conflict"),
+        (2, "conflict"),
+        (3, "conflict"),
+        (4, "invalid"),
+        (5, "invalid"),
+        (6, "created"),
+    ]
+    assert (report["created"], report["failed"]) == (2, 5)
+    results = report["results"]
+    assert existing["username"] in results[1]["detail"]
+    assert existing["email"] in results[2]["detail"]
+    # Conflicts with a row earlier in the same upload
+    assert first["username"] in results[3]["detail"]
+    assert "required" in results[5]["detail"]
+
+    created = client.get(f"/users/{results[6]['id']}", headers=auth_headers).json()
+    assert created["username"] == rows[6]["username"]
+    assert created["full_name"] == "Bulk User"
+
+
+def test_ndjson_upload_reports_undecodable_lines(client, auth_headers):
+    rows = [new_row(), new_row()]
+    body = "\n".join(
+        [json.dumps(rows[0]), "{not json", "", json.dumps(rows[1]), json.dumps(rows[0])]
+    )
+
+    response = client.post(
+        "/users/bulk",
+        content=body,
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    # Blank lines are skipped and do not take an index
+    assert statuses(response.json()) == [
+        (0, "created"),
+        (1, "invalid"),
+        (2, "created"),
+        (3, "conflict"),
+    ]
+
+
+@pytest.mark.parametrize("body", [b'{"username": "single"}', b"[{"])
+def test_malformed_json_upload_is_rejected(client, auth_headers, body):
+    response = client.post(
+        "/users/bulk",
+        content=body,
+        headers={**auth_headers, "Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 400
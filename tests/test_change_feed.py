@@ -0,0 +1,138 @@
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+from conftest import bearer, login
+from sqlalchemy import insert, select
+
+from app.config.settings import settings
+from app.core.database import DatabaseManager
+from app.core.pagination import encode_change_cursor
+from app.models.entities.base import utcnow
+from app.models.entities.user_tombstone import UserTombstone
+
+RETENTION = timedelta(seconds=settings.change_feed_tombstone_retention)
+SETTLE = timedelta(seconds=settings.change_feed_settle)
+
+
+@pytest.fixture
+def start():
+    """Feed position just before the test's writes."""
+    return encode_change_cursor(utcnow() - timedelta(microseconds=1), 0)
+
+
+@pytest.fixture
+def settled(monkeypatch):
+    """Let the feed serve changes as if the settle delay had passed."""
+    monkeypatch.setattr(
+        "app.services.user.implementation.utcnow", lambda: utcnow() + SETTLE
+    )
+
+
+def changes(client, headers, since: str, **params):
+    response = client.get(
+        "/users/changes", params={"since": since, **params}, headers=headers
+    )
+    assert response.status_code == 200
+    return response.json(), response.headers.get("x-next-cursor")
+
+
+@pytest.mark.anyio
+async def test_prune_drops_tombstones_past_retention():
+    manager = DatabaseManager("sqlite+aiosqlite:///:memory:", tombstone_retention=60)
+    await manager.create_all()
+    now = utcnow()
+    async with manager.engine.begin() as conn:
+        await conn.execute(
+            insert(UserTombstone),
+            [
+                {"user_id": 1, "uuid": "old", "deleted_at": now - timedelta(hours=1)},
+                {"user_id": 2, "uuid": "new", "deleted_at": now},
+            ],
+        )
+
+    assert await manager.prune_tombstones() == 1
+    async with manager.engine.connect() as conn:
+        assert list(await conn.scalars(select(UserTombstone.uuid))) == ["new"]
+    await manager.close()
+
+
+@pytest.mark.parametrize("url", ["/users/changes", "/users/changes/stream"])
+def test_cursor_past_retention_requires_resync(client, auth_headers, url):
+    expired = encode_change_cursor(utcnow() - RETENTION - timedelta(minutes=1), 0)
+
+    response = client.get(url, params={"since": expired}, headers=auth_headers)
+
+    assert response.status_code == 410
+    assert "full resync" in response.json()["detail"]
+
+
+def test_cursor_within_retention_is_served(client, auth_headers):
+    recent = encode_change_cursor(utcnow() - RETENTION + timedelta(minutes=1), 0)
+
+    response = client.get(
+        "/users/changes", params={"since": recent}, headers=auth_headers
+    )
+
+    assert response.status_code == 200
+
+
+def test_changes_are_held_back_until_settled(
+    client, user_factory, auth_headers, start, monkeypatch
+):
+    user = user_factory()
+
+    assert changes(client, auth_headers, start)[0] == []
+
+    monkeypatch.setattr(
+        "app.services.user.implementation.utcnow", lambda: utcnow() + SETTLE
+    )
+    found, _ = changes(client, auth_headers, start)
+    assert [(change["op"], change["id"]) for change in found] == [
+        ("created", user["id"])
+    ]
+
+
+def test_deleted_user_is_reported_by_its_tombstone(
+    client, user_factory, auth_headers, start, settled
+):
+    user = user_factory()
+    headers = bearer(login(client, user["username"])["access_token"])
+    assert client.delete(f"/users/{user['id']}", headers=headers).is_success
+
+    found, _ = changes(client, auth_headers, start)
+
+    assert [(change["op"], change["id"], change["uuid"]) for change in found] == [
+        ("deleted", user["id"], user["uuid"])
+    ]
+    assert found[0]["user"] is None
+
+
+def test_cursor_resumes_after_the_last_change(
+    client, user_factory, auth_headers, start, settled
+):
+    ids = [user_factory()["id"] for _ in range(3)]
+
+    first, cursor = changes(client, auth_headers, start, limit=2)
+    second, last = changes(client, auth_headers, cursor, limit=2)
+    third, unchanged = changes(client, auth_headers, last, limit=2)
+
+    assert [change["id"] for change in first + second] == ids
+    assert third == []
+    # Nothing new: poll again from the same position
+    assert unchanged == last
+
+
+def test_settle_below_commit_time_is_rejected():
+    with pytest.raises(ValueError, match="CHANGE_FEED_SETTLE"):
+        replace(settings, change_feed_settle=settings.change_feed_min_settle - 0.5)
+
+    minimal = replace(settings, change_feed_settle=settings.change_feed_min_settle)
+    assert minimal.change_feed_settle == settings.change_feed_min_settle
+
+
+def test_retention_within_settle_is_rejected():
+    with pytest.raises(ValueError, match="CHANGE_FEED_TOMBSTONE_RETENTION"):
+        replace(settings, change_feed_tombstone_retention=settings.change_feed_settle)
+
+    assert replace(settings, change_feed_tombstone_retention=0)
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+import pytest
+from conftest import bearer, login
+
+from app.core.pagination import encode_cursor
+
+
+@pytest.fixture
+def user(user_factory) -> dict:
+    return user_factory()
+
+
+def get_user(client, headers, user, **validators):
+    return client.get(f"/users/{user['id']}", headers={**headers, **validators})
+
+
+def rename(client, user, full_name: str) -> None:
+    """Update user's full name as the user, the only one allowed to."""
+    headers = bearer(login(client, user["username"])["access_token"])
+    response = client.put(
+        f"/users/{user['id']}", json={"full_name": full_name}, headers=headers
+    )
+    assert response.status_code == 200
+
+
+def test_if_none_match_answers_304(client, auth_headers, user):
+    response = get_user(client, auth_headers, user)
+    etag = response.headers["etag"]
+    assert not etag.startswith("W/")
+
+    for validator in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        not_modified = get_user(
+            client, auth_headers, user, **{"If-None-Match": validator}
+        )
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+
+    other = get_user(client, auth_headers, user, **{"If-None-Match": '"other"'})
+    assert other.status_code == 200
+    assert other.json()["id"] == user["id"]
+
+
+def test_if_modified_since_answers_304(client, auth_headers, user):
+    last_modified = get_user(client, auth_headers, user).headers["last-modified"]
+    earlier = format_datetime(
+        parsedate_to_datetime(last_modified) - timedelta(seconds=1), usegmt=True
+    )
+
+    response = get_user(
+        client, auth_headers, user, **{"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 304
+    response = get_user(client, auth_headers, user, **{"If-Modified-Since": earlier})
+    assert response.status_code == 200
+
+
+def test_update_in_the_same_second_changes_etag(client, auth_headers, user):
+    before = get_user(client, auth_headers, user).headers
+
+    rename(client, user, "Renamed At Once")
+
+    # Last-Modified may not move, the ETag has microseconds
+    validators = {
+        "If-None-Match": before["etag"],
+        "If-Modified-Since": format_datetime(
+            datetime.now(timezone.utc) + timedelta(minutes=1), usegmt=True
+        ),
+    }
+    response = get_user(client, auth_headers, user, **validators)
+    assert response.status_code == 200
+    assert response.headers["etag"] != before["etag"]
+    assert response.json()["full_name"] == "Renamed At Once"
+
+
+def test_list_has_weak_etag_following_its_users(client, user_factory, auth_headers):
+    first, second = user_factory(), user_factory()
+    params = {"cursor": encode_cursor(first["id"] - 1), "limit": 2}
+
+    def page(**validators):
+        return client.get(
+            "/users/", params=params, headers={**auth_headers, **validators}
+        )
+
+    response = page()
+    etag = response.headers["etag"]
+    assert etag.startswith("W/")
+    assert [item["id"] for item in response.json()] == [first["id"], second["id"]]
+    assert page(**{"If-None-Match": etag}).status_code == 304
+
+    rename(client, second, "Renamed On Page")
+
+    response = page(**{"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
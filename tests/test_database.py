@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from sqlalchemy import insert, select, update
+
+from app.config.settings import settings
+from app.core.database import DatabaseManager
+from app.models.entities.user import User
+
+
+@pytest.fixture
+async def workers(tmp_path):
+    """Two workers' database managers on one file."""
+    url = f"sqlite+aiosqlite:///{tmp_path}/workers.db"
+    managers = [DatabaseManager(url, pragmas=settings.sqlite_pragmas) for _ in range(2)]
+    await managers[0].create_all()
+    async with managers[0].async_session_maker() as session:
+        await session.execute(
+            insert(User).values(
+                username="alice", email="a@example.com", password_hash="!"
+            )
+        )
+        await session.commit()
+    yield managers
+    for manager in managers:
+        await manager.close()
+
+
+@pytest.mark.anyio
+async def test_read_then_write_waits_for_other_writer(workers):
+    first, second = workers
+    holding = asyncio.Event()
+
+    async def write_and_hold():
+        async with first.async_session_maker() as session:
+            await session.execute(update(User).values(full_name="First"))
+            holding.set()
+            await asyncio.sleep(0.2)
+            await session.commit()
+
+    async def read_then_write():
+        await holding.wait()
+        async with second.async_session_maker() as session:
+            # Reads on the writer before writing, as read-modify-write does
+            name = await session.scalar(select(User.full_name))
+            await session.execute(update(User).values(full_name=f"{name} Second"))
+            await session.commit()
+
+    await asyncio.gather(write_and_hold(), read_then_write())
+
+    async with first.async_session_maker() as session:
+        assert await session.scalar(select(User.full_name)) == "First Second"
@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+
+def test_export_streams_every_user_in_small_batches(client, user_factory, auth_headers):
+    usernames = {user_factory()["username"] for _ in range(3)}
+
+    response = client.get(
+        "/users/export", params={"batch_size": 1}, headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert usernames <= {row["username"] for row in rows}
+    assert "password_hash" not in rows[0]
+
+
+@pytest.mark.parametrize("batch_size", [0, -1, 10_001])
+def test_export_rejects_batch_size_out_of_bounds(client, auth_headers, batch_size):
+    response = client.get(
+        "/users/export", params={"batch_size": batch_size}, headers=auth_headers
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+import pytest
+from conftest import PASSWORD
+
+from app.core.hashing import PasswordHasher, PasswordHasherBusyError, password_hasher
+
+
+@pytest.fixture
+def release():
+    """Event the slow jobs wait on, set on teardown whatever happens."""
+    release = threading.Event()
+    yield release
+    release.set()
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, max_queue=1, retry_after=3)
+    yield hasher
+    hasher.shutdown()
+
+
+async def wait_idle(hasher: PasswordHasher) -> None:
+    while hasher.stats().in_flight:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.anyio
+async def test_rejects_beyond_workers_and_queue(hasher, release):
+    jobs = [asyncio.create_task(hasher.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert (hasher.stats().in_flight, hasher.stats().queue_depth) == (1, 1)
+
+    with pytest.raises(PasswordHasherBusyError) as exc_info:
+        await hasher.run(release.wait)
+    assert exc_info.value.retry_after == 3
+    assert hasher.stats().rejected == 1
+
+    release.set()
+    assert await asyncio.gather(*jobs) == [True, True]
+    await wait_idle(hasher)
+    assert await hasher.run(release.wait)
+
+
+@pytest.mark.anyio
+async def test_cancelled_request_keeps_its_slot(hasher, release):
+    started = threading.Event()
+
+    def hold() -> bool:
+        started.set()
+        return release.wait()
+
+    running = asyncio.create_task(hasher.run(hold))
+    assert await asyncio.to_thread(started.wait, 5)
+    queued = asyncio.create_task(hasher.run(release.wait))
+    await asyncio.sleep(0)
+
+    running.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await running
+
+    # The job goes on in its thread and still counts
+    assert hasher.stats().in_flight == 1
+    with pytest.raises(PasswordHasherBusyError):
+        await hasher.run(release.wait)
+
+    # An unstarted job is dropped with its request and frees the slot
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    await asyncio.sleep(0)
+    assert hasher.stats().queue_depth == 0
+
+    release.set()
+    await wait_idle(hasher)
+    assert await hasher.run(release.wait)
+
+
+def test_login_busy_answers_503_with_retry_after(
+    client, user_factory, release, monkeypatch
+):
+    user = user_factory()
+    monkeypatch.setattr(password_hasher, "workers", 1)
+    monkeypatch.setattr(password_hasher, "max_queue", 0)
+    # Hold the only slot from the application's event loop
+    job = client.blocking_portal.start_task_soon(password_hasher.run, release.wait)
+    try:
+        response = client.post(
+            "/auth/login", json={"username": user["username"], "password": PASSWORD}
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(password_hasher.retry_after)
+    finally:
+        release.set()
+        job.result(timeout=5)
+        client.blocking_portal.call(wait_idle, password_hasher)
@@ -0,0 +1,195 @@
+import pytest
+from litestar.stores.memory import MemoryStore
+
+from app.core.hashing import password_hasher
+from app.core.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimit,
+    RateLimiter,
+    RateLimitExceededError,
+    StoreRateLimitBackend,
+    advance,
+    rate_limiter,
+)
+from benchmarks.statements import StatementCounter
+
+# Three attempts per minute, one refills every 20 seconds
+LIMIT = RateLimit(attempts=3, period=60)
+
+
+class Clock:
+    """Manually advanced time source."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def attempts(tat, now: float, count: int) -> tuple[float, list[float]]:
+    waits = []
+    for _ in range(count):
+        tat, wait = advance(tat, now, LIMIT)
+        waits.append(wait)
+    return tat, waits
+
+
+def test_advance_allows_burst_then_waits():
+    tat, waits = attempts(None, 0.0, 4)
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(20.0)
+    # A rejected attempt does not move the bucket
+    assert tat == pytest.approx(60.0)
+
+
+def test_advance_refills_one_attempt_per_interval():
+    tat, _ = attempts(None, 0.0, 3)
+
+    assert advance(tat, 19.0, LIMIT)[1] == pytest.approx(1.0)
+    tat, wait = advance(tat, 20.0, LIMIT)
+    assert wait == 0.0
+    assert advance(tat, 20.0, LIMIT)[1] == pytest.approx(20.0)
+
+
+def test_advance_full_bucket_after_period():
+    tat, _ = attempts(None, 0.0, 3)
+
+    _, waits = attempts(tat, 60.0, 4)
+    assert waits == [0.0, 0.0, 0.0, pytest.approx(20.0)]
+
+
+@pytest.fixture(params=["memory", "store"])
+def clock_and_backend(request):
+    clock = Clock()
+    if request.param == "memory":
+        return clock, MemoryRateLimitBackend(clock=clock)
+    return clock, StoreRateLimitBackend(MemoryStore(), clock=clock)
+
+
+@pytest.mark.anyio
+async def test_limiter_rejects_with_retry_after(clock_and_backend):
+    clock, backend = clock_and_backend
+    limiter = RateLimiter(backend, {"login_ip": LIMIT})
+    for _ in range(3):
+        await limiter.hit("login_ip", "10.0.0.1")
+
+    clock.now += 5
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        await limiter.hit("login_ip", "10.0.0.1")
+    assert exc_info.value.rule == "login_ip"
+    assert exc_info.value.retry_after == 15
+
+    # Other keys have their own bucket
+    await limiter.hit("login_ip", "10.0.0.2")
+    assert limiter.stats().rejected == {"login_ip": 1}
+    assert limiter.allowed == 4
+
+
+@pytest.mark.anyio
+async def test_limiter_allows_again_after_refill(clock_and_backend):
+    clock, backend = clock_and_backend
+    limiter = RateLimiter(backend, {"login_ip": LIMIT})
+    for _ in range(3):
+        await limiter.hit("login_ip", "10.0.0.1")
+
+    clock.now += 20
+    await limiter.hit("login_ip", "10.0.0.1")
+    with pytest.raises(RateLimitExceededError):
+        await limiter.hit("login_ip", "10.0.0.1")
+
+
+@pytest.mark.anyio
+async def test_retry_after_rounds_up():
+    clock = Clock()
+    limiter = RateLimiter(
+        MemoryRateLimitBackend(clock=clock), {"login_ip": RateLimit(1, 2.5)}
+    )
+    await limiter.hit("login_ip", "10.0.0.1")
+
+    clock.now += 0.1
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        await limiter.hit("login_ip", "10.0.0.1")
+    assert exc_info.value.retry_after == 3
+
+
+@pytest.mark.anyio
+async def test_rules_without_attempts_and_disabled_limiter_allow():
+    backend = MemoryRateLimitBackend(clock=Clock())
+    limiter = RateLimiter(backend, {"register_ip": RateLimit(0, 60)})
+    for _ in range(10):
+        await limiter.hit("register_ip", "10.0.0.1")
+        await limiter.hit("unknown_rule", "10.0.0.1")
+
+    disabled = RateLimiter(backend, {"login_ip": LIMIT}, enabled=False)
+    for _ in range(10):
+        await disabled.hit("login_ip", "10.0.0.1")
+    assert backend.size() == 0
+
+
+@pytest.mark.anyio
+async def test_sweep_drops_full_buckets_first():
+    clock = Clock()
+    backend = MemoryRateLimitBackend(max_keys=10, clock=clock)
+    for index in range(5):
+        await backend.hit(f"idle-{index}", LIMIT)
+    # Idle buckets are full again once their interval has passed
+    clock.now += LIMIT.interval
+    for index in range(6):
+        await backend.hit(f"active-{index}", LIMIT)
+
+    assert backend.size() == 6
+    assert backend.evictions == 0
+
+
+@pytest.mark.anyio
+async def test_sweep_evicts_least_recently_used():
+    clock = Clock()
+    backend = MemoryRateLimitBackend(max_keys=10, clock=clock)
+    for index in range(11):
+        await backend.hit(f"key-{index}", LIMIT)
+    # Still limited buckets, the oldest ones are dropped down to 90%
+    assert backend.size() == 9
+    assert backend.evictions == 2
+
+    # key-0 was evicted and starts over with a full bucket
+    for _ in range(3):
+        assert await backend.hit("key-0", LIMIT) == 0.0
+
+
+@pytest.fixture
+def strict_limits(monkeypatch):
+    """One attempt per minute on every rule, in fresh buckets."""
+    monkeypatch.setattr(rate_limiter, "backend", MemoryRateLimitBackend())
+    monkeypatch.setattr(rate_limiter, "enabled", True)
+    for rule in ("login_ip", "login_username", "register_ip"):
+        monkeypatch.setitem(rate_limiter.rules, rule, RateLimit(1, 60))
+        monkeypatch.setitem(rate_limiter.rejected, rule, 0)
+
+
+@pytest.mark.parametrize(
+    "url, body",
+    [
+        ("/auth/login", {"username": "limited", "password": "wrong-password"}),
+        (
+            "/auth/register",
+            {
+                "username": "limited",
+                "email": "limited@example.com",
+                "password": "limited-password",
+            },
+        ),
+    ],
+)
+def test_rejected_before_queries_and_hashing(client, strict_limits, url, body):
+    client.post(url, json=body)
+
+    submitted = password_hasher.stats().submitted
+    with StatementCounter() as counter:
+        response = client.post(url, json=body)
+
+    assert response.status_code == 429
+    assert 0 < int(response.headers["Retry-After"]) <= 60
+    assert counter.statements == []
+    assert password_hasher.stats().submitted == submitted
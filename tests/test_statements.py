@@ -0,0 +1,14 @@
+import pytest
+
+from benchmarks.statements import BUDGETS, measure
+
+
+@pytest.fixture(scope="module")
+def statements(client) -> dict[str, dict]:
+    return {row["endpoint"]: row for row in measure(client)}
+
+
+@pytest.mark.parametrize("endpoint", list(BUDGETS))
+def test_statement_budget(statements: dict[str, dict], endpoint: str):
+    row = statements[endpoint]
+    assert row["statements"] <= row["budget"], row
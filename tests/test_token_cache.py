@@ -0,0 +1,97 @@
+import hashlib
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.auth import AuthManager
+from app.core.token_epochs import token_epochs
+
+CLAIMS = {"sub": "alice", "user_id": 1}
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(
+        "app.core.cache.time", SimpleNamespace(monotonic=clock.monotonic)
+    )
+    return clock
+
+
+@pytest.fixture
+def manager() -> AuthManager:
+    return AuthManager()
+
+
+@pytest.fixture(autouse=True)
+def epochs(monkeypatch):
+    """Fresh epoch map, bumps stay inside the test."""
+    monkeypatch.setattr(token_epochs, "_epochs", {})
+
+
+def cached(manager: AuthManager, token: str):
+    return manager.token_cache.get(hashlib.sha256(token.encode()).digest())
+
+
+def test_entry_expires_with_the_token(manager, clock):
+    token = manager.create_access_token(CLAIMS, expires_delta=timedelta(minutes=5))
+    assert manager.verify_token(token).user_id == 1
+
+    # exp has whole seconds: the entry lives at most the token's lifetime
+    clock.now += 299
+    assert cached(manager, token) is not None
+    clock.now += 1
+    assert cached(manager, token) is None
+
+
+@pytest.mark.parametrize(
+    "make_token",
+    [
+        pytest.param(
+            lambda manager: manager.create_access_token(CLAIMS)[:-2] + "xx",
+            id="bad-signature",
+        ),
+        pytest.param(
+            lambda manager: manager.create_access_token(
+                CLAIMS, expires_delta=timedelta(seconds=-1)
+            ),
+            id="expired",
+        ),
+        pytest.param(
+            lambda manager: manager.create_refresh_token(CLAIMS), id="refresh-token"
+        ),
+        pytest.param(
+            lambda manager: manager.create_access_token({"sub": "alice"}),
+            id="no-user-id",
+        ),
+    ],
+)
+def test_invalid_tokens_are_not_cached(manager, clock, make_token):
+    token = make_token(manager)
+
+    assert manager.verify_token(token) is None
+    assert manager.verify_token(token) is None
+    assert len(manager.token_cache) == 0
+
+
+def test_cached_token_rejected_after_epoch_bump(manager, clock):
+    token = manager.create_access_token(CLAIMS)
+    assert manager.verify_token(token) is not None
+    assert cached(manager, token) is not None
+
+    token_epochs.advance(1, 1)
+
+    assert manager.verify_token(token) is None
+    # Tokens issued after the bump carry the new epoch
+    assert manager.verify_token(manager.create_access_token(CLAIMS)).epoch == 1
@@ -0,0 +1,84 @@
+import pytest
+from conftest import bearer, login
+
+from app.core.auth import auth_manager
+from app.core.database import database_manager
+from app.core.token_epochs import token_epochs
+from app.repositories.user.implementation import UserRepository
+
+
+async def revoke(action: str, user_id: int) -> None:
+    """Change the user in a way that revokes their tokens."""
+    async with database_manager.async_session_maker() as session:
+        repository = UserRepository(session)
+        if action == "deactivate":
+            await repository.update(user_id, is_active=False)
+        elif action == "password":
+            password_hash = auth_manager.get_password_hash("changed-password")
+            await repository.update(user_id, password_hash=password_hash)
+        else:
+            assert await repository.delete(user_id)
+
+
+def refresh(client, refresh_token: str):
+    return client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+@pytest.mark.parametrize("action", ["deactivate", "password", "delete"])
+def test_revocation_bumps_epoch_and_rejects_tokens(client, user_factory, action):
+    user = user_factory()
+    tokens = login(client, user["username"])
+    assert client.get("/auth/me", headers=bearer(tokens["access_token"])).is_success
+    epoch = token_epochs.current(user["id"])
+
+    client.blocking_portal.call(revoke, action, user["id"])
+
+    assert token_epochs.current(user["id"]) == epoch + 1
+    # Cached by the request above, rejected all the same
+    assert auth_manager.verify_token(tokens["access_token"]) is None
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+
+
+def test_update_without_revocation_keeps_tokens(client, user_factory):
+    user = user_factory()
+    tokens = login(client, user["username"])
+    epoch = token_epochs.current(user["id"])
+
+    response = client.put(
+        f"/users/{user['id']}",
+        json={"full_name": "Still Signed In"},
+        headers=bearer(tokens["access_token"]),
+    )
+
+    assert response.status_code == 200
+    assert token_epochs.current(user["id"]) == epoch
+    assert auth_manager.verify_token(tokens["access_token"]) is not None
+
+
+def test_refresh_issues_working_pair(client, user_factory):
+    user = user_factory()
+    tokens = refresh(client, login(client, user["username"])["refresh_token"]).json()
+
+    me = client.get("/auth/me", headers=bearer(tokens["access_token"]))
+    assert me.json()["username"] == user["username"]
+    assert refresh(client, tokens["refresh_token"]).status_code == 200
+
+
+def test_refresh_keeps_the_refresh_token_epoch(client, user_factory):
+    user = user_factory()
+    # Issued by a worker that has seen a bump this one has not
+    epoch = token_epochs.current(user["id"]) + 1
+    claims = {"sub": user["username"], "user_id": user["id"], "ep": epoch}
+
+    tokens = refresh(client, auth_manager.create_refresh_token(claims)).json()
+
+    assert auth_manager.verify_token(tokens["access_token"]).epoch == epoch
+    assert auth_manager.verify_refresh_token(tokens["refresh_token"]).epoch == epoch
+
+
+def test_token_types_are_not_interchangeable(client, user_factory):
+    tokens = login(client, user_factory()["username"])
+
+    assert refresh(client, tokens["access_token"]).status_code == 401
+    response = client.get("/auth/me", headers=bearer(tokens["refresh_token"]))
+    assert response.status_code == 401
@@ -0,0 +1,209 @@
+import asyncio
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Optional
+
+import pytest
+from conftest import PASSWORD
+from litestar.stores.memory import MemoryStore
+
+from app.core.cache import MemoryCacheBackend, StoreCacheBackend
+from app.core.database import database_manager
+from app.models.entities.user import User
+from app.repositories.user.cached import (
+    CachedUserRepository,
+    UserCache,
+    UserCacheEntry,
+    cache_key,
+    user_cache,
+)
+from app.repositories.user.implementation import UserRepository
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def make_user(user_id: int, username: str) -> User:
+    return User(
+        id=user_id,
+        uuid=f"uuid-{user_id}",
+        username=username,
+        email=f"{username}@example.com",
+        password_hash="!",
+        full_name=None,
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+class UsersInMemory:
+    """Wrapped repository: users by id, lookups on every column.
+
+    ``loading`` pauses reads after they took their snapshot, to let a
+    write land between a cache miss and the fill.
+    """
+
+    def __init__(self, *users: User):
+        self.users = {user.id: UserCacheEntry.from_entity(user) for user in users}
+        self.loading: Optional[asyncio.Event] = None
+        self.loads = 0
+
+    async def _find(self, field: str, value: object) -> Optional[User]:
+        self.loads += 1
+        found = next(
+            (entry for entry in self.users.values() if getattr(entry, field) == value),
+            None,
+        )
+        if self.loading is not None:
+            await self.loading.wait()
+        return found and found.to_entity()
+
+    async def get_by_id(self, entity_id: int) -> Optional[User]:
+        return await self._find("id", entity_id)
+
+    async def get_by_uuid(self, entity_uuid: str) -> Optional[User]:
+        return await self._find("uuid", entity_uuid)
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        return await self._find("username", username)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._find("email", email)
+
+    async def update(self, entity_id: int, **kwargs) -> Optional[User]:
+        self.users[entity_id] = replace(self.users[entity_id], **kwargs)
+        return self.users[entity_id].to_entity()
+
+    async def delete(self, entity_id: int) -> bool:
+        return self.users.pop(entity_id, None) is not None
+
+
+@pytest.fixture(params=["memory", "store"])
+def cache(request) -> UserCache:
+    if request.param == "memory":
+        return UserCache(MemoryCacheBackend(maxsize=100))
+    return UserCache(StoreCacheBackend(MemoryStore()))
+
+
+@pytest.fixture
+def users() -> UsersInMemory:
+    return UsersInMemory(make_user(1, "alice"), make_user(2, "bob"))
+
+
+@pytest.fixture
+def repository(cache: UserCache, users: UsersInMemory) -> CachedUserRepository:
+    return CachedUserRepository(users, cache)
+
+
+async def fill(repository: CachedUserRepository, user_id: int) -> None:
+    """Cache user under every key."""
+    await repository.get_by_id(user_id)
+    assert await repository.cache.get("id", user_id) is not None
+
+
+async def cached_keys(cache: UserCache, *keys: str) -> list[str]:
+    return [key for key in keys if await cache.backend.get(key) is not None]
+
+
+@pytest.mark.anyio
+async def test_lookups_by_any_key_hit_one_entry(repository, users):
+    await fill(repository, 1)
+    loads = users.loads
+
+    assert (await repository.get_by_uuid("uuid-1")).username == "alice"
+    assert (await repository.get_by_username("alice")).id == 1
+    assert (await repository.get_by_email("alice@example.com")).id == 1
+    assert users.loads == loads
+
+
+@pytest.mark.anyio
+async def test_update_drops_old_and_new_aliases(repository, users, cache):
+    await fill(repository, 1)
+
+    await repository.update(1, username="carol", email="carol@example.com")
+
+    assert not await cached_keys(
+        cache,
+        cache_key("id", 1),
+        cache_key("username", "alice"),
+        cache_key("email", "alice@example.com"),
+        cache_key("uuid", "uuid-1"),
+    )
+    assert await repository.get_by_username("alice") is None
+    assert (await repository.get_by_username("carol")).id == 1
+    assert (await repository.get_by_email("carol@example.com")).username == "carol"
+
+
+@pytest.mark.anyio
+async def test_stale_alias_is_a_miss(repository, users, cache):
+    await fill(repository, 1)
+    # Alias left behind, e.g. written by another worker before a rename
+    await cache.backend.set(cache_key("username", "mallory"), b"1")
+
+    assert await cache.get("username", "mallory") is None
+    assert await cached_keys(cache, cache_key("username", "mallory")) == []
+
+
+@pytest.mark.anyio
+async def test_delete_drops_entry_and_aliases(repository, users, cache):
+    await fill(repository, 1)
+
+    assert await repository.delete(1)
+
+    assert not await cached_keys(
+        cache,
+        cache_key("id", 1),
+        cache_key("uuid", "uuid-1"),
+        cache_key("username", "alice"),
+        cache_key("email", "alice@example.com"),
+    )
+    assert await repository.get_by_id(1) is None
+    assert await repository.get_by_email("alice@example.com") is None
+
+
+@pytest.mark.anyio
+async def test_fill_started_before_update_is_dropped(repository, users, cache):
+    gate = users.loading = asyncio.Event()
+    # Misses, reads the old row and waits before filling the cache
+    read = asyncio.create_task(repository.get_by_username("alice"))
+    while not users.loads:
+        await asyncio.sleep(0)
+    users.loading = None
+
+    await repository.update(1, full_name="Alice Updated")
+    gate.set()
+    assert (await read).full_name is None
+
+    assert await cache.get("id", 1) is None
+    assert (await repository.get_by_username("alice")).full_name == "Alice Updated"
+
+
+@pytest.mark.anyio
+async def test_fill_after_update_is_kept(repository, users, cache):
+    await repository.update(1, full_name="Alice Updated")
+    await repository.get_by_id(1)
+
+    assert (await cache.get("id", 1)).full_name == "Alice Updated"
+
+
+async def deactivate(user_id: int) -> None:
+    """Deactivate as another worker would, leaving this worker's cache alone."""
+    async with database_manager.async_session_maker() as session:
+        await UserRepository(session).update(user_id, is_active=False)
+
+
+def test_login_ignores_cached_credentials(client, user_factory, auth_headers):
+    user = user_factory()
+    client.get(f"/users/username/{user['username']}", headers=auth_headers)
+    cached = client.blocking_portal.call(user_cache.get, "username", user["username"])
+    assert cached.is_active
+
+    client.blocking_portal.call(deactivate, user["id"])
+
+    # Still active in the cache until it expires
+    cached = client.blocking_portal.call(user_cache.get, "username", user["username"])
+    assert cached.is_active
+    response = client.post(
+        "/auth/login", json={"username": user["username"], "password": PASSWORD}
+    )
+    assert response.status_code == 401